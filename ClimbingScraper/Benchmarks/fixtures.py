@@ -0,0 +1,179 @@
+import html
+import io
+import json
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+
+# ——— Module-level configuration ———
+ORIGIN = (37.74, -119.60)      # synthetic areas are scattered around this point
+SPREAD_DEGREES = 1.5           # ... within this many degrees of latitude and longitude
+ROPE_GRADES = ["5.6", "5.7", "5.8", "5.9", "5.10a", "5.10b", "5.10c", "5.10d", "5.11a", "5.11c", "5.12a", "5.12d"]
+BOULDER_GRADES = ["V0", "V1", "V2", "V3", "V4", "V5", "V6", "V7", "V8", "V10"]
+ROUTE_TYPES = ["Trad", "Sport", "Boulder", "TR"]
+WORDS = (
+    "granite crack corner slab arete roof overhang dihedral flake chimney jug crimp sloper "
+    "pocket traverse mantle approach descent belay anchor bolt pitch ledge summit gully"
+).split()
+IMAGE_SIZE = (640, 480)        # pixels of each synthetic photo
+
+# Links the scrapers follow as absolute URLs carry a {mp} or {images} placeholder that
+# the stand-in servers replace with their base URL. Pages only contain the markup the
+# scrapers' selectors look for.
+
+
+class Dataset:
+    """
+    Deterministic synthetic dataset: the same arguments always produce the same
+    areas, routes, texts and numbers, so benchmark results are comparable between commits.
+    """
+
+    def __init__(self, areas: int = 50, routes_per_area: int = 20, comments: int = 5,
+                 photos_per_climb: int = 2, seed: int = 1) -> None:
+        self.params = {"areas": areas, "routes_per_area": routes_per_area, "comments": comments,
+                       "photos_per_climb": photos_per_climb, "seed": seed}
+        self.comments = comments
+        self.photos_per_climb = photos_per_climb
+        rng = random.Random(seed)
+        self.rng_seed = seed
+        self.areas: List[Dict] = []
+        for aid in range(areas):
+            area = {
+                "aid": aid,
+                "name": f"Area {aid} {rng.choice(WORDS).title()}",
+                "lat": round(ORIGIN[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES), 5),
+                "lon": round(ORIGIN[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES), 5),
+                "routes": [],
+            }
+            for rid in range(routes_per_area):
+                route_type = rng.choice(ROUTE_TYPES)
+                grades = BOULDER_GRADES if route_type == "Boulder" else ROPE_GRADES
+                area["routes"].append({
+                    "rid": aid * 10000 + rid,
+                    "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {aid}-{rid}",
+                    "type": route_type,
+                    "grade": rng.choice(grades),
+                    "stars": rng.randint(0, 4),
+                    "votes": rng.randint(0, 300),
+                    "style": {key: rng.randint(0, 200) for key in
+                              ("totalRedpoint", "totalFlash", "totalGo", "totalTopRope", "totalOnsight")},
+                })
+            self.areas.append(area)
+        self.routes: Dict[int, Dict] = {r["rid"]: r for a in self.areas for r in a["routes"]}
+        self._by_name = {r["name"].casefold(): r for r in self.routes.values()}
+
+    def text(self, key: str, words: int = 40) -> str:
+        """Filler text that depends only on the seed and `key`."""
+        rng = random.Random(f"{self.rng_seed}:{key}")
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def route_by_name(self, name: str) -> Optional[Dict]:
+        return self._by_name.get(name.casefold())
+
+
+# ——— Mountain Project ———
+def mp_area_page(ds: Dataset, aid: int) -> str:
+    """Main area page: rich-text descriptions."""
+    descriptions = "".join(
+        f'<div class="fr-view">{html.escape(ds.text(f"area-desc-{aid}-{i}", 120))}</div>' for i in range(3)
+    )
+    return f"<html><body><h1>{html.escape(ds.areas[aid]['name'])}</h1>{descriptions}</body></html>"
+
+
+def mp_area_print_page(ds: Dataset, aid: int) -> str:
+    """Printable area page: comments and the route table."""
+    comments = "".join(
+        f'<div class="comment-body">{"x" * 55}{html.escape(ds.text(f"area-comment-{aid}-{i}", 30))}{"y" * 55}</div>'
+        for i in range(ds.comments)
+    )
+    rows = []
+    for route in ds.areas[aid]["routes"]:
+        stars = "<img src='/star.svg'>" * route["stars"]
+        rows.append(
+            '<tr class="route-row">'
+            f'<td><a href="{{mp}}/route/{route["rid"]}/{slug(route["name"])}"><strong>{html.escape(route["name"])}</strong></a></td>'
+            f'<td class="p-0">{stars}<span class="text-muted small">·{route["votes"]}</span></td>'
+            f'<td><span class="rateYDS">{route["grade"]}</span>'
+            f'<span class="small text-warm pl-half"><span>·</span><span>{route["type"]}</span></span></td>'
+            '</tr>'
+        )
+    table = f'<table class="table route-table hidden-xs-down">{"".join(rows)}</table>'
+    return f"<html><body>{comments}{table}</body></html>"
+
+
+def mp_route_print_page(ds: Dataset, rid: int) -> str:
+    """Printable climb page: descriptions, comments and lazily loaded photos."""
+    descriptions = "".join(
+        f'<div class="fr-view">{html.escape(ds.text(f"route-desc-{rid}-{i}", 80))}</div>' for i in range(2)
+    )
+    comments = "".join(
+        f'<div class="comment-body"><a href="/user/{i}">User {i}</a>{html.escape(ds.text(f"route-comment-{rid}-{i}"))}'
+        f'<span>Jan 1, 2024</span></div>'
+        for i in range(ds.comments)
+    )
+    photos = "".join(
+        f'<img class="lazy img-fluid" data-src="{{images}}/img/{rid}-{i}.jpg">' for i in range(ds.photos_per_climb)
+    )
+    return f"<html><body>{descriptions}{comments}{photos}</body></html>"
+
+
+# ——— Vertical-Life ———
+def vl_search_page(ds: Dataset, query: str) -> str:
+    """Search results: one name link if the climb exists."""
+    route = ds.route_by_name(query)
+    results = f'<p class="name-link"><a href="/routes/{route["rid"]}">{html.escape(route["name"])}</a></p>' if route else ""
+    return f"<html><body>{results}</body></html>"
+
+
+def vl_route_page(ds: Dataset, rid: int) -> str:
+    """Route page with the __NUXT__ state the style breakdown is read from."""
+    route = ds.routes[rid]
+    comments = "".join(
+        f'<div class="ascent-body">{html.escape(ds.text(f"vl-comment-{rid}-{i}", 25))}</div>' for i in range(ds.comments)
+    )
+    stats = "".join(f'<div class="statistics-value">{value}</div>' for value in (12, 34, route["votes"]))
+    nuxt = json.dumps({"data": {"routeHeader": {"zlaggable": route["style"]}}})
+    return (
+        "<html><body>"
+        f'<div class="route-avatar-container size-xl">{route["grade"]}</div>'
+        f'<div class="rating-number">{route["stars"]}.0</div>{stats}{comments}'
+        f'<div class="tab-container"><a href="/routes/{rid}">Overview</a>'
+        f'<a href="/routes/{rid}/gallery">Gallery ({ds.photos_per_climb})</a></div>'
+        f"<script>window.__NUXT__ = {nuxt};</script>"
+        "</body></html>"
+    )
+
+
+def vl_gallery_page(ds: Dataset, rid: int) -> str:
+    images = "".join(
+        f'<div class="img-wrapper"><img src="{{images}}/img/vl-{rid}-{i}.jpg"></div>' for i in range(ds.photos_per_climb)
+    )
+    return f"<html><body>{images}</body></html>"
+
+
+# ——— OpenWeather and images ———
+def weather_json(lat: float, lon: float, days: int = 10) -> str:
+    rng = random.Random(f"{lat:.1f},{lon:.1f}")
+    daily = [
+        {"dt": 1_700_000_000 + day * 86400, "temp": {"day": round(rng.uniform(-5, 30), 1)},
+         "weather": [{"description": rng.choice(["clear sky", "light rain", "few clouds", "snow"])}]}
+        for day in range(days)
+    ]
+    return json.dumps({"lat": lat, "lon": lon, "daily": daily})
+
+
+def jpeg_bytes(key: str, size: Tuple[int, int] = IMAGE_SIZE) -> bytes:
+    """A photo-like JPEG (noise over a gradient, so it doesn't compress to nothing)."""
+    from PIL import Image
+
+    rng = random.Random(key)
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    noise = Image.effect_noise(size, rng.uniform(20, 60)).convert("RGB")
+    img = Image.blend(img, noise, 0.5)
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
@@ -0,0 +1,433 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# ——— Module-level configuration ———
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+# The benchmark imports the app's modules the same way main.py does
+sys.path.insert(0, str(PROJECT_DIR))
+
+from fixtures import Dataset, ORIGIN  # noqa: E402
+from stand_ins import StandIns  # noqa: E402
+from Controller.instrumentation import METRICS  # noqa: E402
+
+BENCH_DB_NAME = "climbing_bench"   # scratch database, dropped and recreated on every run
+BENCH_IMG_FOLDER = "bench_images"  # View/images/<folder> used by the load_images benchmark
+SAVED_PER_AREA = 2                 # saved climbs per area for gather_climb_info
+SEARCH_RADII = (10, 30, 60)        # miles, cycled through by the search benchmark
+REGRESSION_THRESHOLD = 0.10        # --compare flags p50/p95 changes beyond 10%
+BENCHMARKS = ("mp_scrape", "mp_route_table", "vl_extract", "vl_browser", "weather",
+              "db_search", "db_gather", "load_images", "pie_chart")
+
+
+class Skip(Exception):
+    """A benchmark that can't run here (missing dependency or service)."""
+
+
+# ——— Measuring ———
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+def measure(name: str, fn: Callable[[Any], int], args: Sequence[Any], workers: int = 1,
+            warmup: int = 1) -> Dict[str, Any]:
+    """
+    Call fn(arg) for every arg, on `workers` threads, after `warmup` untimed calls.
+    fn returns the number of items it processed (climbs, rows, images...).
+
+    Returns:
+        ops, items, wall seconds, ops/s, items/s, latency percentiles in ms, and the
+        instrumented stages seen while it ran.
+    """
+    for arg in list(args)[:warmup]:
+        fn(arg)
+    latencies: List[float] = []
+
+    def timed_call(arg) -> int:
+        start = time.perf_counter()
+        items = fn(arg)
+        latencies.append(time.perf_counter() - start)
+        return items
+
+    report = METRICS.start_report(name)
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            items = sum(pool.map(timed_call, args))
+    else:
+        items = sum(timed_call(arg) for arg in args)
+    wall = time.perf_counter() - start
+    report.finish()
+    ordered = sorted(latencies)
+    return {
+        "ops": len(latencies), "items": items, "wall_s": wall,
+        "ops_per_s": len(latencies) / wall if wall else 0.0,
+        "items_per_s": items / wall if wall else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000, "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000, "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        "stages": {stage: {"count": s["count"], "total_s": s["total"]} for stage, s in report.to_dict()["stages"].items()},
+    }
+
+
+# ——— Benchmarks ———
+class Bench:
+    """Shared state of one run: dataset, stand-ins and options."""
+
+    def __init__(self, ds: Dataset, sites: StandIns, args) -> None:
+        self.ds = ds
+        self.sites = sites
+        self.args = args
+        self.rng = random.Random(args.seed)
+
+    def areas(self):
+        from Model.climbing_area import ClimbingArea
+
+        return [
+            ClimbingArea(a["aid"], "California", a["name"], a["lat"], a["lon"], self.sites.area_url(a["aid"]))
+            for a in self.ds.areas
+        ]
+
+    def mp_scrape(self) -> Dict[str, Any]:
+        """scrape_mt_proj with every climb's detail page and photos, one op per area."""
+        from Controller.Scrapers.mt_proj_scraper import scrape_mt_proj
+
+        written: List[str] = []
+
+        def scrape(area) -> int:
+            scrape_mt_proj(area)
+            written.extend(p.path("search_images") for c in area.climbs for p in c.mp_photos)
+            return len(area.climbs)
+
+        try:
+            return measure("mp_scrape", scrape, self.areas(), self.args.workers, warmup=0)
+        finally:
+            for path in set(written):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def mp_route_table(self) -> Dict[str, Any]:
+        """scrape_mt_proj without details (the lazy search path), one op per area."""
+        from Controller.Scrapers.mt_proj_scraper import scrape_mt_proj
+
+        def scrape(area) -> int:
+            scrape_mt_proj(area, details=False)
+            return len(area.climbs)
+
+        return measure("mp_route_table", scrape, self.areas(), self.args.workers, warmup=0)
+
+    def vl_extract(self) -> Dict[str, Any]:
+        """
+        Vertical-Life page parsing (search result link, grade, stars, recommends,
+        comments, gallery links) on served route pages, without a browser.
+        """
+        try:
+            import requests
+            from bs4 import BeautifulSoup
+            from Controller.Scrapers import v_life_scraper as vl
+        except ImportError as e:
+            raise Skip(f"{e.name} not installed")
+
+        session = requests.Session()
+        vl_url = self.sites.vl.url
+        pages = {
+            rid: session.get(f"{vl_url}/routes/{rid}").text
+            for rid in list(self.ds.routes)[:self.args.vl_climbs]
+        }
+        search_pages = {
+            rid: session.get(f"{vl_url}/search/zlaggables", params={"query": self.ds.routes[rid]["name"]}).text
+            for rid in pages
+        }
+
+        def extract(rid) -> int:
+            link = BeautifulSoup(search_pages[rid], "lxml").select_one("p.name-link > a[href]")
+            page = BeautifulSoup(pages[rid], "lxml")
+            fields = (vl._get_grade(page), vl._get_stars(page), vl._get_recommends(page), vl._get_comments(page))
+            gallery = page.select_one(".tab-container a:last-of-type")
+            return int(bool(link and gallery and all(f is not None for f in fields)))
+
+        return measure("vl_extract", extract, list(pages))
+
+    def vl_browser(self) -> Dict[str, Any]:
+        """Full per-climb VL lookup (_scrape_climb) in headless Chrome against the VL stand-in."""
+        if not self.args.browser:
+            raise Skip("needs --browser (headless Chrome)")
+        try:
+            from selenium import webdriver
+            from Controller.Scrapers import v_life_scraper as vl
+        except ImportError as e:
+            raise Skip(f"{e.name} not installed")
+        from Model.climb import Climb
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        vl.SITE_URL = self.sites.vl.url
+        driver = webdriver.Chrome(options=options)
+        climbs = []
+        for rid in list(self.ds.routes)[:self.args.vl_climbs]:
+            climb = Climb()
+            climb.name = self.ds.routes[rid]["name"]
+            climbs.append(climb)
+        written: List[str] = []
+
+        def lookup(climb) -> int:
+            found = vl._scrape_climb(driver, climb)
+            written.extend(p.path("search_images") for p in climb.mp_photos + climb.vl_photos)
+            return int(found)
+
+        try:
+            return measure("vl_browser", lookup, climbs, warmup=0)
+        finally:
+            driver.quit()
+            for path in set(written):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def weather(self) -> Dict[str, Any]:
+        """get_weather_forecast against the OpenWeather stand-in, one op per area (no cache)."""
+        from Controller.Caculations import weather
+
+        weather.API_URL = f"{self.sites.weather.url}/data/3.0/onecall"
+        points = [(a["lat"], a["lon"]) for a in self.ds.areas]
+        return measure("weather", lambda p: int(not weather.get_weather_forecast(*p).startswith(weather.ERROR_PREFIX)),
+                       points, self.args.workers)
+
+    def _database(self):
+        """Seed the scratch database once per run; returns a connected Database."""
+        if getattr(self, "_db", None) is not None:
+            return self._db
+        if self.args.no_db:
+            raise Skip("--no-db")
+        try:
+            import create_database
+            from Model.database import Database
+        except ImportError as e:
+            raise Skip(f"{e.name} not installed")
+        try:
+            conn = create_database.get_connection()
+            create_database.create_schema(conn, BENCH_DB_NAME, verbose=False)
+            conn.close()
+            db = Database(BENCH_DB_NAME)
+            db.connect_to_database()
+        except Exception as e:
+            raise Skip(f"MySQL not reachable: {e}")
+        self._seed(db)
+        self._db = db
+        return db
+
+    def _seed(self, db) -> None:
+        from Controller.Caculations.area_stats import AreaStats
+        from Model.climb import Climb
+
+        self.cids: List[int] = []
+        cid = 1
+        for a in self.ds.areas:
+            db.insert_climb_area(a["aid"], a["name"], a["lat"], a["lon"], self.sites.area_url(a["aid"]), "California")
+            db.insert_area_stats(a["aid"], AreaStats.from_routes((r["grade"], r["type"], r["stars"]) for r in a["routes"]))
+            for i in range(self.ds.comments):
+                db.insert_area_description(a["aid"], self.ds.text(f"area-desc-{a['aid']}-{i}", 120))
+                db.insert_area_comment(a["aid"], self.ds.text(f"area-comment-{a['aid']}-{i}", 30))
+            for route in a["routes"][:SAVED_PER_AREA]:
+                climb = Climb()
+                climb.name, climb.type, climb.mp_grade = route["name"], route["type"], route["grade"]
+                climb.mp_stars, climb.num_mp_stars = route["stars"], route["votes"]
+                climb.vl_ascents, climb.vl_recommends, climb.vl_onsite_rate, climb.vl_grade = 10, 5, 40.0, "6a"
+                climb.vl_style = {"redpoint": 1, "flash": 2, "go": 3, "topRope": 4, "onsight": 5}
+                db.insert_climb_basic_info(cid, a["aid"], climb)
+                for i in range(self.ds.comments):
+                    db.insert_climb_description(cid, self.ds.text(f"route-desc-{route['rid']}-{i}", 80))
+                    db.insert_climb_comment(cid, self.ds.text(f"route-comment-{route['rid']}-{i}"), "mp")
+                for i in range(self.ds.photos_per_climb):
+                    db.insert_photo(cid, f"{self.sites.images.url}/img/{route['rid']}-{i}.jpg")
+                self.cids.append(cid)
+                cid += 1
+
+    def db_search(self) -> Dict[str, Any]:
+        """search_db_for_areas around random points, cycling through SEARCH_RADII, with a grade filter."""
+        from Controller.Caculations.climb_filter import ClimbFilter
+
+        db = self._database()
+        climb_filter = ClimbFilter("All", ("5.8", "5.11d"), ("V2", "V6"))
+        queries = [
+            (ORIGIN[0] + self.rng.uniform(-1, 1), ORIGIN[1] + self.rng.uniform(-1, 1), SEARCH_RADII[i % len(SEARCH_RADII)])
+            for i in range(self.args.queries)
+        ]
+        return measure("db_search", lambda q: len(db.search_db_for_areas(*q, climb_filter)), queries)
+
+    def db_gather(self) -> Dict[str, Any]:
+        """gather_climb_info for random saved climbs."""
+        db = self._database()
+        cids = [self.rng.choice(self.cids) for _ in range(self.args.queries)]
+        return measure("db_gather", lambda cid: len(db.gather_climb_info(cid)[1].mp_comments), cids)
+
+    def load_images(self) -> Dict[str, Any]:
+        """Tab.load_images plus decoding every listed photo (current_image), cold cache."""
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            raise Skip("Pillow not installed")
+        import fixtures
+        from Controller import tab
+
+        class BenchTab(tab.Tab):
+            TAB_NUM = "B"
+            IMG_FOLDER = BENCH_IMG_FOLDER
+
+            def handle_event(self, event, values, db):
+                return False
+
+        folder = PROJECT_DIR / "View" / "images" / BENCH_IMG_FOLDER
+        folder.mkdir(parents=True, exist_ok=True)
+        climbs = []
+        for route in list(self.ds.routes.values())[:self.args.image_climbs]:
+            climb = type("ClimbName", (), {"name": route["name"]})()
+            climbs.append(climb)
+            for i in range(self.ds.photos_per_climb):
+                (folder / f"{route['name']}{route['rid']}-{i}.jpg").write_bytes(fixtures.jpeg_bytes(f"{route['rid']}-{i}"))
+        bench_tab = BenchTab(view=None, db=None)
+
+        def show(climb) -> int:
+            tab._png_bytes.cache_clear()
+            bench_tab.load_images(climb)
+            shown = 0
+            for bench_tab.image_ind in range(len(bench_tab.images)):
+                shown += bench_tab.current_image() is not None
+            return shown
+
+        try:
+            return measure("load_images", show, climbs)
+        finally:
+            bench_tab.weather.shutdown()
+            bench_tab.clear_images()
+            folder.rmdir()
+
+    def pie_chart(self) -> Dict[str, Any]:
+        """Style pie charts with distinct values, bypassing the chart cache (matplotlib if installed, else Pillow)."""
+        charts = [[r["style"][k] + 1 for k in sorted(r["style"])] for r in list(self.ds.routes.values())[:self.args.charts]]
+        try:
+            from Controller.Caculations.pie_chart import create_pie_chart
+            create_pie_chart([1, 1, 1, 1, 1])
+            backend = "matplotlib"
+        except ImportError:
+            try:
+                from Controller.Caculations.pillow_pie_chart import create_pie_chart_pillow as create_pie_chart
+            except ImportError as e:
+                raise Skip(f"{e.name} not installed")
+            backend = "pillow"
+        result = measure("pie_chart", lambda values: int(bool(create_pie_chart(values))), charts)
+        result["backend"] = backend
+        return result
+
+    def close(self) -> None:
+        if getattr(self, "_db", None) is not None:
+            self._db.close()
+
+
+# ——— Reporting ———
+def git_revision() -> Dict[str, Any]:
+    def git(*cmd) -> str:
+        proc = subprocess.run(["git", *cmd], cwd=PROJECT_DIR, capture_output=True, text=True)
+        return proc.stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "."))}
+
+
+def print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<16}{'ops':>6}{'items/s':>11}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        if "skipped" in r:
+            print(f"{name:<16}  skipped: {r['skipped']}")
+            continue
+        print(f"{name:<16}{r['ops']:>6}{r['items_per_s']:>11.1f}{r['ops_per_s']:>10.2f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> int:
+    """Print changes against an earlier JSON result; returns 1 if any p50/p95 regressed past the threshold."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    if baseline["meta"]["dataset"] != current["meta"]["dataset"] or \
+            baseline["meta"]["latency_ms"] != current["meta"]["latency_ms"]:
+        print("Warning: dataset or latency differs from the baseline; results aren't directly comparable")
+    print(f"\nAgainst {baseline['meta']['git']['commit']} ({baseline_path}):")
+    regressed = 0
+    for name, r in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or "skipped" in r or "skipped" in old:
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "items_per_s"):
+            if not old[key]:
+                continue
+            change = (r[key] - old[key]) / old[key]
+            flag = ""
+            if key != "items_per_s" and change > REGRESSION_THRESHOLD:
+                flag, regressed = " (regressed)", 1
+            changes.append(f"{key} {change:+.1%}{flag}")
+        print(f"  {name:<16}" + ", ".join(changes))
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scrapers, database, photo loading and charts offline, against local "
+                    "stand-ins for Mountain Project, Vertical-Life, OpenWeather and the image hosts."
+    )
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="benchmarks to run (default all)")
+    data = parser.add_argument_group("synthetic dataset")
+    data.add_argument("--areas", type=int, default=20)
+    data.add_argument("--routes", type=int, default=15, help="routes per area")
+    data.add_argument("--comments", type=int, default=5, help="comments and descriptions per page")
+    data.add_argument("--photos", type=int, default=2, help="photos per climb")
+    data.add_argument("--seed", type=int, default=1)
+    run = parser.add_argument_group("run")
+    run.add_argument("--latency", type=float, default=0.0, help="ms added to every stand-in response")
+    run.add_argument("--workers", type=int, default=1, help="threads for the scrape and weather benchmarks")
+    run.add_argument("--queries", type=int, default=200, help="database queries per DB benchmark")
+    run.add_argument("--vl-climbs", type=int, default=100, help="climbs looked up by the VL benchmarks")
+    run.add_argument("--image-climbs", type=int, default=20, help="climbs whose photos are loaded")
+    run.add_argument("--charts", type=int, default=50, help="pie charts rendered")
+    run.add_argument("--browser", action="store_true", help="also run vl_browser (needs Chrome)")
+    run.add_argument("--no-db", action="store_true", help="skip the MySQL benchmarks")
+    out = parser.add_argument_group("output")
+    out.add_argument("--json", help="write results to this file")
+    out.add_argument("--compare", help="earlier --json result to compare against")
+    args = parser.parse_args()
+
+    ds = Dataset(args.areas, args.routes, args.comments, args.photos, args.seed)
+    results: Dict[str, Dict[str, Any]] = {}
+    with StandIns(ds, args.latency / 1000) as sites:
+        bench = Bench(ds, sites, args)
+        try:
+            for name in args.only or BENCHMARKS:
+                print(f"Running {name}…", file=sys.stderr)
+                try:
+                    results[name] = getattr(bench, name)()
+                except Skip as e:
+                    results[name] = {"skipped": str(e)}
+        finally:
+            bench.close()
+        requests_served = {s.name: s.requests for s in sites.all}
+
+    output = {
+        "meta": {
+            "git": git_revision(), "python": platform.python_version(), "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "dataset": ds.params, "latency_ms": args.latency,
+            "workers": args.workers, "requests_served": requests_served,
+        },
+        "results": results,
+    }
+    print_results(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(output, indent=2))
+    return compare(output, args.compare) if args.compare else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import fixtures
+from fixtures import Dataset
+
+# A route answers (path, query) with (content type, body), or None for 404
+Route = Tuple[re.Pattern, Callable[..., Optional[Tuple[str, bytes]]]]
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json"
+
+
+class StandIn:
+    """
+    Local HTTP server standing in for one site. Every response can be delayed by
+    `latency` seconds to model the network; bodies have their {mp}/{images}
+    placeholders replaced with the stand-ins' base URLs.
+    """
+
+    def __init__(self, name: str, routes: List[Route], latency: float = 0.0) -> None:
+        self.name = name
+        self.routes = routes
+        self.latency = latency
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stand_in.requests += 1
+                url = urlsplit(self.path)
+                response = stand_in.respond(unquote(url.path), parse_qs(url.query))
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                if response is None:
+                    self.send_error(404)
+                    return
+                content_type, body = response
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, name=f"stand-in-{name}", daemon=True)
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> Optional[Tuple[str, bytes]]:
+        for pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                return handler(query, *match.groups())
+        return None
+
+    def start(self) -> "StandIn":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StandIns:
+    """
+    The four stand-ins a search talks to (Mountain Project, Vertical-Life, OpenWeather
+    and an image host), all serving one synthetic Dataset. Pages are rendered once and
+    cached, so the servers cost little next to the code being measured.
+    """
+
+    def __init__(self, ds: Dataset, latency: float = 0.0) -> None:
+        self.ds = ds
+        html = lambda text: (HTML, self._links(text).encode())
+
+        @lru_cache(maxsize=None)
+        def page(kind: str, key) -> Optional[Tuple[str, bytes]]:
+            render = {
+                "mp_area": fixtures.mp_area_page,
+                "mp_print": fixtures.mp_area_print_page,
+                "mp_route": fixtures.mp_route_print_page,
+                "vl_route": fixtures.vl_route_page,
+                "vl_gallery": fixtures.vl_gallery_page,
+            }[kind]
+            return html(render(ds, key))
+
+        def mp_area(query, aid):
+            aid = int(aid)
+            if aid >= len(ds.areas):
+                return None
+            return page("mp_print" if "print" in query else "mp_area", aid)
+
+        def mp_route(query, rid):
+            return page("mp_route", int(rid)) if int(rid) in ds.routes else None
+
+        def vl_route(query, rid):
+            return page("vl_route", int(rid)) if int(rid) in ds.routes else None
+
+        def vl_gallery(query, rid):
+            return page("vl_gallery", int(rid)) if int(rid) in ds.routes else None
+
+        def vl_search(query):
+            return html(fixtures.vl_search_page(ds, query.get("query", [""])[0]))
+
+        def weather(query):
+            return JSON, fixtures.weather_json(float(query["lat"][0]), float(query["lon"][0])).encode()
+
+        @lru_cache(maxsize=None)
+        def jpeg(key):
+            return "image/jpeg", fixtures.jpeg_bytes(key)
+
+        def image(query, key):
+            return jpeg(key)
+
+        self.mp = StandIn("mp", [
+            (re.compile(r"/area/(\d+)/[\w-]*"), mp_area),
+            (re.compile(r"/route/(\d+)/[\w-]*"), mp_route),
+        ], latency)
+        self.vl = StandIn("vl", [
+            (re.compile(r"/search/zlaggables"), vl_search),
+            (re.compile(r"/routes/(\d+)"), vl_route),
+            (re.compile(r"/routes/(\d+)/gallery"), vl_gallery),
+        ], latency)
+        self.weather = StandIn("weather", [(re.compile(r"/data/3\.0/onecall"), weather)], latency)
+        self.images = StandIn("images", [(re.compile(r"/img/([\w-]+)\.jpg"), image)], latency)
+        self.all = (self.mp, self.vl, self.weather, self.images)
+
+    def _links(self, text: str) -> str:
+        return text.replace("{mp}", self.mp.url).replace("{images}", self.images.url)
+
+    def area_url(self, aid: int) -> str:
+        return f"{self.mp.url}/area/{aid}/{fixtures.slug(self.ds.areas[aid]['name'])}"
+
+    def start(self) -> "StandIns":
+        for stand_in in self.all:
+            stand_in.start()
+        return self
+
+    def close(self) -> None:
+        for stand_in in self.all:
+            stand_in.close()
+
+    def __enter__(self) -> "StandIns":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,133 @@
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# ——— Module-level configuration ———
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_SECONDS = 1.0   # time from process start to a visible main window
+TOP_IMPORTS = 15               # how many of the slowest imports to list
+# Modules that must not be imported before the first window appears
+HEAVY_MODULES = [
+    "selenium", "bs4", "lxml", "matplotlib", "PIL", "mysql.connector", "haversine", "requests"
+]
+
+# Line format of `python -X importtime`: "import time:  self | cumulative | name"
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Runs inside a fresh interpreter: import main, build the window, report timings as JSON
+_WINDOW_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter()
+from View.app_gui import View
+view = View()
+view.window.refresh()
+t_window = time.perf_counter()
+loaded = [m for m in {heavy!r} if m in sys.modules]
+view.window.close()
+print(json.dumps({{"import_s": t_import - t0, "window_s": t_window - t0, "heavy_loaded": loaded}}))
+"""
+
+
+def measure_imports() -> List[Dict[str, float]]:
+    """
+    Import `main` under `-X importtime` in a fresh interpreter.
+
+    Returns:
+        One dict per top-level-or-nested module: name, self_ms, cumulative_ms, depth.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append({
+            "name": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": len(indent) // 2,
+        })
+    if proc.returncode != 0:
+        print(proc.stderr.strip().splitlines()[-1], file=sys.stderr)
+    return modules
+
+
+def measure_first_window() -> Optional[Dict]:
+    """
+    Start a fresh interpreter, build the main window and time it.
+    Wall time is taken from before the interpreter is launched, so it includes Python's own startup.
+
+    Returns:
+        Dict with import_s, window_s, wall_s and heavy_loaded, or None if no window could be created
+        (for example on a machine without a display).
+    """
+    code = _WINDOW_PROBE.format(heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0 or not proc.stdout.strip():
+        print(f"Window probe failed: {proc.stderr.strip()[-500:]}", file=sys.stderr)
+        return None
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    # Also covers interpreter shutdown and closing the window, so it is an upper bound
+    result["wall_s"] = wall
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import and first-window time.")
+    parser.add_argument("--runs", type=int, default=5, help="window probes to run (median reported)")
+    parser.add_argument("--json", help="write the full results to this file")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="seconds allowed from process start to first window")
+    args = parser.parse_args()
+
+    modules = measure_imports()
+    top_level = sorted(
+        (m for m in modules if m["depth"] == 0),
+        key=lambda m: m["cumulative_ms"], reverse=True
+    )
+    total_ms = sum(m["cumulative_ms"] for m in top_level)
+    print(f"Import of main: {total_ms:.1f} ms total, slowest top-level modules:")
+    for m in top_level[:TOP_IMPORTS]:
+        print(f"  {m['cumulative_ms']:8.1f} ms  {m['name']}")
+    imported = {m["name"] for m in modules}
+    eager_heavy = [h for h in HEAVY_MODULES if h in imported]
+    print(f"Heavy modules imported at startup: {', '.join(eager_heavy) or 'none'}")
+
+    probes = [p for p in (measure_first_window() for _ in range(args.runs)) if p]
+    result = {"import_ms": total_ms, "modules": modules, "eager_heavy": eager_heavy, "window_runs": probes}
+    status = 0
+    if probes:
+        wall = statistics.median(p["wall_s"] for p in probes)
+        window = statistics.median(p["window_s"] for p in probes)
+        result.update({"window_wall_s": wall, "window_in_process_s": window, "budget_s": args.budget})
+        print(f"First window: {wall * 1000:.0f} ms wall ({window * 1000:.0f} ms after interpreter start), "
+              f"budget {args.budget * 1000:.0f} ms")
+        if wall > args.budget:
+            print("Startup budget exceeded")
+            status = 1
+    else:
+        print("First window: not measured")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
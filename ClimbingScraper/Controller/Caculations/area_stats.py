@@ -0,0 +1,114 @@
+import json
+from typing import Dict, Iterable, Optional, Tuple
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.Caculations.grades import ROUTE, BOULDER, scale_for_type, to_ordinal
+
+
+class AreaStats:
+    """
+    Route aggregates for one climbing area, recorded when the area catalog is built:
+    route count by type, a grade histogram per scale and the mean MP star rating.
+    Lets a search drop areas that can't produce a single matching climb before scraping them.
+    """
+
+    def __init__(self) -> None:
+        self.route_count = 0
+        self.rope_count = 0
+        self.boulder_count = 0
+        self.other_count = 0           # ice, aid, snow...
+        self.mean_stars: Optional[float] = None
+        # scale -> {ordinal: count}; grades that can't be parsed are counted separately
+        self.histogram: Dict[str, Dict[float, int]] = {ROUTE: {}, BOULDER: {}}
+        self.unknown: Dict[str, int] = {ROUTE: 0, BOULDER: 0}
+        self._star_total = 0.0
+        self._star_count = 0
+
+    @classmethod
+    def from_routes(cls, routes: Iterable[Tuple[Optional[str], Optional[str], Optional[float]]]) -> "AreaStats":
+        """
+        Build stats from (grade, climb_type, stars) tuples, one per route.
+        """
+        stats = cls()
+        for grade, climb_type, stars in routes:
+            stats.add(grade, climb_type, stars)
+        return stats
+
+    def add(self, grade: Optional[str], climb_type: Optional[str], stars: Optional[float] = None) -> None:
+        """Count one route."""
+        self.route_count += 1
+        if stars is not None:
+            self._star_total += stars
+            self._star_count += 1
+            self.mean_stars = round(self._star_total / self._star_count, 2)
+
+        scale = scale_for_type(climb_type)
+        if scale is None:
+            self.other_count += 1
+            return
+        if scale == BOULDER:
+            self.boulder_count += 1
+        else:
+            self.rope_count += 1
+
+        value = to_ordinal(grade, climb_type)
+        if value is None:
+            self.unknown[scale] += 1
+        else:
+            bucket = self.histogram[scale]
+            bucket[value] = bucket.get(value, 0) + 1
+
+    def grade_bounds(self, scale: str) -> Tuple[Optional[float], Optional[float]]:
+        """(lowest, highest) parsed ordinal on a scale, or (None, None) if there are none."""
+        values = self.histogram[scale]
+        return (min(values), max(values)) if values else (None, None)
+
+    def could_match(self, climb_filter: ClimbFilter) -> bool:
+        """
+        True if at least one route here would pass `climb_filter`.
+        Mirrors ClimbFilter.accepts, including keeping routes whose grade can't be parsed.
+        """
+        if climb_filter.climbing_type == "All" and self.other_count:
+            return True
+        checks = []
+        if climb_filter.wants_rope():
+            checks.append((ROUTE, climb_filter.rope_range))
+        if climb_filter.wants_boulder():
+            checks.append((BOULDER, climb_filter.boulder_range))
+        for scale, (low, high) in checks:
+            if self.unknown[scale]:
+                return True
+            for value in self.histogram[scale]:
+                if (low is None or value >= low) and (high is None or value <= high):
+                    return True
+        return False
+
+    # ——— Database row conversion ———
+    def to_row(self) -> Tuple:
+        """
+        Values for the area_stats columns after AID, in schema order:
+        route_count, rope_count, boulder_count, other_count, mean_stars,
+        rope_min, rope_max, rope_unknown, boulder_min, boulder_max, boulder_unknown, grade_histogram.
+        """
+        histogram = {
+            scale: {str(value): count for value, count in sorted(bucket.items())}
+            for scale, bucket in self.histogram.items()
+        }
+        return (
+            self.route_count, self.rope_count, self.boulder_count, self.other_count, self.mean_stars,
+            *self.grade_bounds(ROUTE), self.unknown[ROUTE],
+            *self.grade_bounds(BOULDER), self.unknown[BOULDER],
+            json.dumps(histogram),
+        )
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> "AreaStats":
+        """Inverse of to_row."""
+        stats = cls()
+        (
+            stats.route_count, stats.rope_count, stats.boulder_count, stats.other_count, stats.mean_stars,
+            _, _, stats.unknown[ROUTE], _, _, stats.unknown[BOULDER], histogram
+        ) = row
+        for scale, bucket in json.loads(histogram or "{}").items():
+            stats.histogram[scale] = {float(value): count for value, count in bucket.items()}
+        return stats
@@ -0,0 +1,57 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Sequence, Optional, Tuple
+
+# ——— Module-level configuration ———
+# "pillow" (fast, default) or "matplotlib" (original look, slower and a heavy import)
+CHART_BACKEND = os.getenv("CLIMBING_CHART_BACKEND", "pillow")
+CACHE_SIZE = 256           # rendered charts kept in memory
+
+logger = logging.getLogger(__name__)
+
+
+def get_pie_chart(
+    values: Sequence[float],
+    title: str = "Source: VL",
+    labels: Optional[Sequence[str]] = None
+) -> bytes:
+    """
+    Return PNG bytes for a style pie chart, rendering it only the first time
+    a given combination of values, title and labels is seen.
+    Used by the GUI for every climb it displays, so navigating back and forth
+    (or between climbs with the same style breakdown) costs a dict lookup.
+
+    Args:
+        values: Numeric slices for the pie.
+        title:  Chart title.
+        labels: Optional slice names; the renderer's defaults are used when None.
+
+    Returns: bytes: Raw PNG image data.
+    """
+    # Round so tiny float differences from percentage math still hit the cache
+    key = tuple(round(float(v), 4) for v in values)
+    return _render_cached(key, title, tuple(labels) if labels else None)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _render_cached(
+    values: Tuple[float, ...],
+    title: str,
+    labels: Optional[Tuple[str, ...]]
+) -> bytes:
+    """Render through the configured backend; results are memoized by lru_cache."""
+    if CHART_BACKEND == "matplotlib":
+        try:
+            from Controller.Caculations.pie_chart import create_pie_chart
+            return create_pie_chart(values, title, labels)
+        except ImportError:
+            logger.warning("matplotlib not available, falling back to Pillow charts")
+
+    from Controller.Caculations.pillow_pie_chart import create_pie_chart_pillow
+    return create_pie_chart_pillow(values, title, labels)
+
+
+def clear_chart_cache() -> None:
+    """Drop every memoized chart."""
+    _render_cached.cache_clear()
@@ -0,0 +1,81 @@
+from typing import Dict, Optional, Tuple
+
+from Controller.Caculations.grades import ROUTE, BOULDER, scale_for_type, to_ordinal
+
+# ——— Module-level configuration ———
+# Easiest and hardest selectable grade of each scale. A range ending on one of them is
+# open on that side, so the widest selection keeps every climb, whatever its grade.
+ROPE_LIMITS = ("5.0", "5.15d")
+BOULDER_LIMITS = ("VB", "V17")
+
+
+def _bounds(grades: Tuple[str, str], limits: Tuple[str, str]) -> Tuple[Optional[float], Optional[float]]:
+    """(low, high) ordinals of a selected range; None where it ends on a limit of the scale."""
+    low, high = grades
+    return (None if low == limits[0] else to_ordinal(low),
+            None if high == limits[1] else to_ordinal(high))
+
+
+class ClimbFilter:
+    """
+    Grade and type filter applied while parsing an area's route table,
+    so climbs outside the search never cost a detail fetch, VL lookup or photo download.
+    """
+
+    def __init__(
+        self,
+        climbing_type: str = "All",
+        rope_range: Tuple[str, str] = ROPE_LIMITS,
+        boulder_range: Tuple[str, str] = BOULDER_LIMITS
+    ) -> None:
+        """
+        Args:
+            climbing_type: "Top Rope", "Bouldering" or "All" (values of the 1:CLIMBING_TYPE combo).
+            rope_range:    (min, max) YDS grades for roped climbs, inclusive; open at ROPE_LIMITS.
+            boulder_range: (min, max) V grades for boulders, inclusive; open at BOULDER_LIMITS.
+        """
+        self.climbing_type = climbing_type
+        self.rope_range = _bounds(rope_range, ROPE_LIMITS)
+        self.boulder_range = _bounds(boulder_range, BOULDER_LIMITS)
+
+    @classmethod
+    def from_search_values(cls, values: Dict[str, str]) -> "ClimbFilter":
+        """Build a filter from the Search tab's type and MIN/MAX grade selectors."""
+        return cls(
+            values["1:CLIMBING_TYPE"],
+            (values["1:MIN_TOP_ROPE"], values["1:MAX_TOP_ROPE"]),
+            (values["1:MIN_BOULDERING"], values["1:MAX_BOULDERING"]),
+        )
+
+    def wants_rope(self) -> bool:
+        return self.climbing_type in ("Top Rope", "All")
+
+    def wants_boulder(self) -> bool:
+        return self.climbing_type in ("Bouldering", "All")
+
+    def accepts(self, grade: Optional[str], climb_type: Optional[str]) -> bool:
+        """
+        Decide from a route-table row whether a climb is worth scraping.
+        Climbs whose grade can't be parsed are kept rather than silently dropped.
+
+        Args:
+            grade:      Grade text as shown by Mountain Project (e.g. "5.10b/c", "V4-5").
+            climb_type: Type text (e.g. "Trad, Sport", "Boulder").
+        """
+        scale = scale_for_type(climb_type)
+        if scale == BOULDER:
+            if not self.wants_boulder():
+                return False
+            low, high = self.boulder_range
+        elif scale == ROUTE:
+            if not self.wants_rope():
+                return False
+            low, high = self.rope_range
+        else:
+            # Ice, aid, snow... only shown when no type is selected
+            return self.climbing_type == "All"
+
+        value = to_ordinal(grade, climb_type)
+        if value is None:
+            return True
+        return (low is None or value >= low) and (high is None or value <= high)
@@ -1,4 +1,3 @@
-from haversine import haversine, Unit
 import math
 from typing import Tuple, Dict
 
@@ -6,6 +5,16 @@ from typing import Tuple, Dict
 EARTH_RADIUS_MI = 3958.8
 RAD_TO_DEG = 180.0 / math.pi
 
+def distance_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points in miles.
+    Used by the scrape scheduler to work through the nearest areas first.
+    """
+    # haversine is imported on first use to keep application startup light
+    from haversine import haversine, Unit
+    return haversine((float(lat1), float(lon1)), (float(lat2), float(lon2)), unit=Unit.MILES)
+
+
 def get_coordinate_range(
     latitude: float,
     longitude: float,
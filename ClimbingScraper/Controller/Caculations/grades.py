@@ -0,0 +1,265 @@
+import bisect
+import math
+import re
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from Controller.Caculations.us_to_euro_grading import ROUTE_MAP, BOULDER_MAP
+
+# ——— Scales ———
+# Every grade is turned into a float "ordinal" on one of two scales:
+#   ROUTE   - YDS and French sport grades. 5.9 → 9.0, 5.10a → 10.0, 5.10b → 10.25 ... 5.15d → 15.75
+#   BOULDER - V-scale and Font grades. VB → -1.0, V0 → 0.0, V3 → 3.0 ... V17 → 17.0
+# Ordinals are only comparable within the same scale.
+ROUTE = "route"
+BOULDER = "boulder"
+
+# Climb types (as stored on Climb.type) that belong to each scale
+ROPE_TYPES = ("Trad", "Sport", "TR")
+BOULDER_TYPES = ("Boulder",)
+
+# Returned by the batch API where a grade can't be parsed; sorts last, fails every range check
+UNKNOWN = math.nan
+
+LETTER_STEP = 0.25         # a → b → c → d
+# 5.10- / 5.10 / 5.10+ sit between the letter grades: a/b, b/c, c/d
+_LETTERLESS = {"-": 0.125, "": 0.375, "+": 0.625}
+PLUS_MINUS = 0.25          # 5.9+ / V3+ are a quarter grade up, 5.9- / V3- a quarter down
+
+_YDS_RE = re.compile(r"^5\.(\d{1,2})([abcd])?([+-])?$")
+_V_RE = re.compile(r"^v(b|\d{1,2})([+-])?$")
+_EU_RE = re.compile(r"^(\d)([abc])?(\+)?$")
+# French grades missing from ROUTE_MAP, placed between their neighbours
+_FRENCH_EXTRA = {"5b": "5.9+", "4": "5.5"}
+
+
+def scale_for_type(climb_type: Optional[str]) -> Optional[str]:
+    """Map a Mountain Project / VL climb type ("Trad, Sport", "Boulder", ...) to its scale."""
+    if not climb_type:
+        return None
+    if any(t in climb_type for t in BOULDER_TYPES):
+        return BOULDER
+    if any(t in climb_type for t in ROPE_TYPES):
+        return ROUTE
+    return None
+
+
+def _parse_yds(text: str) -> Optional[float]:
+    match = _YDS_RE.match(text)
+    if not match:
+        return None
+    minor, letter, sign = match.groups()
+    minor = int(minor)
+    if minor < 10:
+        # 5.0 – 5.9 have no letters; +/- are quarter steps
+        if letter:
+            return None
+        return minor + {"+": PLUS_MINUS, "-": -PLUS_MINUS}.get(sign, 0.0)
+    if letter:
+        return minor + "abcd".index(letter) * LETTER_STEP
+    return minor + _LETTERLESS[sign or ""]
+
+
+def _parse_v(text: str) -> Optional[float]:
+    match = _V_RE.match(text)
+    if not match:
+        return None
+    number, sign = match.groups()
+    value = -1.0 if number == "b" else float(number)
+    return value + {"+": PLUS_MINUS, "-": -PLUS_MINUS}.get(sign, 0.0)
+
+
+def _parse_eu(text: str, scale: str) -> Optional[float]:
+    if not _EU_RE.match(text):
+        return None
+    if scale == BOULDER:
+        us = BOULDER_MAP.get(text)
+        return _parse_v(us.lower()) if us else None
+    us = _FRENCH_EXTRA.get(text) or ROUTE_MAP.get(text)
+    return _parse_yds(us) if us else None
+
+
+@lru_cache(maxsize=8192)
+def _parse_single(text: str, scale: Optional[str]) -> Optional[Tuple[str, float]]:
+    """Parse one grade without slashes. Returns (scale, ordinal) or None."""
+    if text.startswith("5."):
+        value = _parse_yds(text)
+        return (ROUTE, value) if value is not None else None
+    if text.startswith("v"):
+        value = _parse_v(text)
+        return (BOULDER, value) if value is not None else None
+    # French and Font look alike ("6a+"); the climb type decides, routes by default
+    eu_scale = scale or ROUTE
+    value = _parse_eu(text, eu_scale)
+    return (eu_scale, value) if value is not None else None
+
+
+@lru_cache(maxsize=65536)
+def parse_grade(grade: Optional[str], climb_type: Optional[str] = None) -> Optional[Tuple[str, float]]:
+    """
+    Parse any supported grade into (scale, ordinal).
+
+    Handles YDS ("5.9", "5.10b", "5.11-", "5.10a/b", "5.10d/5.11a"), V-scale ("VB", "V4",
+    "V4+", "V4-5") and French/Font ("6a", "6a+", "7A", "6a/6a+"). Slash grades land halfway
+    between both sides. Mountain Project extras such as safety ratings ("5.10a PG13") are ignored.
+
+    Args:
+        grade:      Grade text in any of the systems above.
+        climb_type: Optional climb type; needed to tell French route grades from Font boulder grades.
+
+    Returns:
+        (ROUTE or BOULDER, ordinal) or None if the grade can't be parsed.
+    """
+    parts = grade.split() if grade else []
+    if not parts:
+        return None
+    text = parts[0].lower()
+    scale = scale_for_type(climb_type)
+
+    if "/" in text:
+        left, right = text.split("/", 1)
+        first = _parse_single(left, scale)
+        if first is None:
+            return None
+        # Expand shorthand right-hand sides: 5.10a/b, 5.9/10a, V3/4, 6a/+
+        if first[0] == ROUTE and left.startswith("5."):
+            right = right if right.startswith("5.") else (
+                "5." + right if right[:1].isdigit() else re.sub(r"[abcd+-]*$", "", left) + right
+            )
+        elif left.startswith("v") and not right.startswith("v"):
+            right = "v" + right
+        elif right in ("+", "-"):
+            right = left.rstrip("+-") + right
+        second = _parse_single(right, scale)
+        return first if second is None or second[0] != first[0] else (first[0], (first[1] + second[1]) / 2)
+
+    # V-scale ranges such as "V4-5"
+    if text.startswith("v") and "-" in text[2:]:
+        low, high = text.split("-", 1)
+        a, b = _parse_single(low, scale), _parse_single("v" + high, scale)
+        if a and b:
+            return BOULDER, (a[1] + b[1]) / 2
+
+    return _parse_single(text, scale)
+
+
+def to_ordinal(grade: Optional[str], climb_type: Optional[str] = None) -> Optional[float]:
+    """Ordinal of one grade, or None if it can't be parsed. See parse_grade."""
+    parsed = parse_grade(grade, climb_type)
+    return parsed[1] if parsed else None
+
+
+# ——— Batch API ———
+def to_ordinals(
+    grades: Sequence[Optional[str]],
+    climb_types: Optional[Sequence[Optional[str]]] = None
+) -> array:
+    """
+    Convert a whole result set of grades in one pass.
+    Distinct (grade, type) pairs are parsed once, so tens of thousands of climbs
+    with a few hundred distinct grades convert in milliseconds.
+
+    Args:
+        grades:      Grade strings.
+        climb_types: Optional climb types, same length as `grades`.
+
+    Returns:
+        array('d') of ordinals, UNKNOWN (NaN) where a grade couldn't be parsed.
+    """
+    memo: Dict[Tuple[Optional[str], Optional[str]], float] = {}
+    types = climb_types if climb_types is not None else [None] * len(grades)
+    out = array("d", bytes(8 * len(grades)))
+    for i, key in enumerate(zip(grades, types)):
+        value = memo.get(key)
+        if value is None:
+            value = to_ordinal(*key)
+            value = UNKNOWN if value is None else value
+            memo[key] = value
+        out[i] = value
+    return out
+
+
+def in_range(
+    ordinals: Sequence[float],
+    low: Optional[float] = None,
+    high: Optional[float] = None
+) -> List[int]:
+    """
+    Indices whose ordinal lies within [low, high]; a None bound is open.
+    Unknown (NaN) ordinals never match.
+    """
+    low = -math.inf if low is None else low
+    high = math.inf if high is None else high
+    return [i for i, v in enumerate(ordinals) if low <= v <= high]
+
+
+def sort_indices(ordinals: Sequence[float], reverse: bool = False) -> List[int]:
+    """Indices ordering `ordinals` by difficulty; unknown grades always come last."""
+    known = [i for i, v in enumerate(ordinals) if v == v]
+    unknown = [i for i, v in enumerate(ordinals) if v != v]
+    known.sort(key=ordinals.__getitem__, reverse=reverse)
+    return known + unknown
+
+
+# ——— Reverse mapping for display ———
+def _yds_table() -> List[Tuple[float, str]]:
+    table = [(float(i), f"5.{i}") for i in range(0, 10)]
+    table += [(i + j * LETTER_STEP, f"5.{i}{l}") for i in range(10, 16) for j, l in enumerate("abcd")]
+    return table
+
+
+def _v_table() -> List[Tuple[float, str]]:
+    return [(-1.0, "VB")] + [(float(i), f"V{i}") for i in range(0, 18)]
+
+
+def _eu_table(mapping: Dict[str, str], scale: str) -> List[Tuple[float, str]]:
+    # Several EU grades can map to one US grade; keep the first (lowest) for each ordinal
+    seen: Dict[float, str] = {}
+    for eu in mapping:
+        value = _parse_eu(eu, scale)
+        if value is not None and value not in seen:
+            seen[value] = eu
+    return sorted(seen.items())
+
+
+_DISPLAY_TABLES = {
+    "yds": _yds_table(),
+    "v": _v_table(),
+    "french": _eu_table({**ROUTE_MAP, **_FRENCH_EXTRA}, ROUTE),
+    "font": [(v, g.upper()) for v, g in _eu_table(BOULDER_MAP, BOULDER)],
+}
+_DISPLAY_KEYS = {name: [v for v, _ in table] for name, table in _DISPLAY_TABLES.items()}
+# Which systems belong to which scale
+SYSTEM_SCALES = {"yds": ROUTE, "french": ROUTE, "v": BOULDER, "font": BOULDER}
+
+
+def ordinal_to_grade(ordinal: Optional[float], system: str = "yds") -> str:
+    """
+    Display an ordinal in a grading system, rounding to the nearest grade that system has.
+
+    Args:
+        ordinal: Value from to_ordinal / to_ordinals.
+        system:  "yds" or "french" for route ordinals, "v" or "font" for boulder ordinals.
+
+    Returns:
+        str: The grade, or "unknown" for a missing ordinal.
+    """
+    if ordinal is None or ordinal != ordinal:
+        return "unknown"
+    keys, table = _DISPLAY_KEYS[system], _DISPLAY_TABLES[system]
+    i = bisect.bisect_left(keys, ordinal)
+    if i == 0:
+        return table[0][1]
+    if i == len(keys):
+        return table[-1][1]
+    before, after = table[i - 1], table[i]
+    return before[1] if ordinal - before[0] < after[0] - ordinal else after[1]
+
+
+def convert_grade(grade: Optional[str], climb_type: Optional[str], system: str) -> str:
+    """Convert a grade into another system of the same scale, e.g. "6a+" → "5.10c"."""
+    parsed = parse_grade(grade, climb_type)
+    if parsed is None or parsed[0] != SYSTEM_SCALES[system]:
+        return "unknown"
+    return ordinal_to_grade(parsed[1], system)
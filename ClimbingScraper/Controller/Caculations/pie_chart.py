@@ -1,6 +1,5 @@
 import io
 from typing import Sequence, Optional
-import matplotlib.pyplot as plt
 
 # Module-level constants, tinkered to fit my display
 # adjustments might be necessary to fit in other users screens
@@ -47,6 +46,11 @@ def create_pie_chart(
             f"Data length ({len(values)}) does not match number of labels ({len(labels)})."
         )
 
+    # Imported here so matplotlib only loads when this renderer is actually used
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     # Create figure & axes
     fig, ax = plt.subplots(figsize=FIG_SIZE, dpi=DPI)
 
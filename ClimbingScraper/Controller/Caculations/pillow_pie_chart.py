@@ -0,0 +1,105 @@
+import io
+import math
+from functools import lru_cache
+from typing import Sequence, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+from Controller.Caculations.pie_chart import (
+    LABELS, DPI, FIG_SIZE, START_ANGLE, LABEL_DISTANCE, SUBPLOT_MARGINS
+)
+
+# Module-level constants, sized to match the matplotlib chart so the layout doesn't shift
+WIDTH = round(FIG_SIZE[0] * DPI)
+HEIGHT = round(FIG_SIZE[1] * DPI)
+SUPERSAMPLE = 2            # draw at 2x and downscale for smooth edges
+# matplotlib's default color cycle, so both renderers look alike
+COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+          "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
+PCT_DISTANCE = 0.6         # where the percentage text sits, as a fraction of the radius
+TEXT_SIZE = 14 * DPI // 72  # points → pixels
+TITLE_SIZE = 16 * DPI // 72
+
+
+@lru_cache(maxsize=None)
+def _load_font(size: int) -> ImageFont.ImageFont:
+    """Return a scalable font, falling back to Pillow's bitmap font on old versions."""
+    for name in ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def create_pie_chart_pillow(
+    values: Sequence[float],
+    title: str = "Source: VL",
+    labels: Optional[Sequence[str]] = None
+) -> bytes:
+    """
+    Pure-Pillow version of pie_chart.create_pie_chart.
+    Draws the same labelled, percentage-annotated pie without importing matplotlib,
+    in a few milliseconds instead of tens.
+
+    Args:
+        values (Sequence[float]): Numeric slices for the pie; length must match `labels` length.
+        title (str, optional):    Chart title. Defaults to "Source: VL".
+        labels (Sequence[str], optional): Names for each slice; defaults to `LABELS`.
+
+    Returns: bytes: Raw PNG image data of the rendered pie chart.
+
+    Raises: ValueError: If `len(values)` does not match `len(labels)`
+    """
+    labels = labels or LABELS
+    if len(values) != len(labels):
+        raise ValueError(
+            f"Data length ({len(values)}) does not match number of labels ({len(labels)})."
+        )
+
+    scale = SUPERSAMPLE
+    width, height = WIDTH * scale, HEIGHT * scale
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    text_font = _load_font(TEXT_SIZE * scale)
+    title_font = _load_font(TITLE_SIZE * scale)
+
+    # Plot area inside the same margins as the matplotlib figure
+    left = SUBPLOT_MARGINS["left"] * width
+    right = SUBPLOT_MARGINS["right"] * width
+    top = (1 - SUBPLOT_MARGINS["top"]) * height
+    bottom = (1 - SUBPLOT_MARGINS["bottom"]) * height
+    cx, cy = (left + right) / 2, (top + bottom) / 2
+    # Leave room for the labels drawn outside the pie
+    radius = min(right - left, bottom - top) / 2 / (LABEL_DISTANCE + 0.15)
+    box = [cx - radius, cy - radius, cx + radius, cy + radius]
+
+    draw.text((width / 2, top / 2 + 10 * scale), title, fill="black", font=title_font, anchor="mm")
+
+    total = float(sum(values))
+    if total <= 0:
+        draw.ellipse(box, outline="black", width=scale)
+    else:
+        # matplotlib goes counter-clockwise from START_ANGLE; Pillow measures clockwise
+        angle = float(START_ANGLE)
+        for i, (value, label) in enumerate(zip(values, labels)):
+            sweep = 360.0 * value / total
+            if sweep > 0:
+                draw.pieslice(box, -(angle + sweep), -angle, fill=COLORS[i % len(COLORS)])
+
+            mid = math.radians(angle + sweep / 2)
+            dx, dy = math.cos(mid), -math.sin(mid)
+            draw.text((cx + dx * radius * LABEL_DISTANCE, cy + dy * radius * LABEL_DISTANCE),
+                      label, fill="black", font=text_font, anchor="mm")
+            if sweep > 0:
+                draw.text((cx + dx * radius * PCT_DISTANCE, cy + dy * radius * PCT_DISTANCE),
+                          f"{100.0 * value / total:.1f}%", fill="black", font=text_font, anchor="mm")
+            angle += sweep
+
+    img = img.resize((WIDTH, HEIGHT), Image.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -46,14 +46,21 @@ def convert_eu_to_us(
     if grade_code is None:
         return "unknown"
 
-    # Normalize to lowercase for lookup
-    code = grade_code[:2].lower() if len(grade_code) >= 2 else grade_code.lower()
-
-    # Select the correct map and return, defaulting to "unknown"
+    # Select the correct map, unrecognized climb types have none
     if climb_type in ("Trad", "Sport", "TR"):
-        return ROUTE_MAP.get(code, "unknown")
-    if climb_type == "Boulder":
-        return BOULDER_MAP.get(code, "unknown")
+        mapping = ROUTE_MAP
+    elif climb_type == "Boulder":
+        mapping = BOULDER_MAP
+    else:
+        return "unknown"
 
-    # Unrecognized climb type
-    return "unknown"
+    # Normalize to lowercase and try the full code first, so "6a+" and "6a" stay distinct
+    code = grade_code.strip().lower()
+    if code in mapping:
+        return mapping[code]
+    # Slash grades ("6a/6a+") use their lower side
+    lower = code.split("/")[0]
+    if lower in mapping:
+        return mapping[lower]
+    # Fall back to the first two characters for decorated codes such as "7a (rp)"
+    return mapping.get(code[:2], "unknown")
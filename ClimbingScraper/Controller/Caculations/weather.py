@@ -1,8 +1,9 @@
 import os
-import requests
 from datetime import datetime, timezone
 from typing import List
 
+from Controller.instrumentation import count, timed
+
 # ——— Module-level configuration ———
 # Feel free to use my API key!
 API_URL = "https://api.openweathermap.org/data/3.0/onecall"
@@ -11,6 +12,7 @@ EXCLUDE_PARTS = "current,minutely,hourly,alerts"
 UNITS = "metric"           # °C; use "imperial" for °F
 FORECAST_DAYS = 10         # number of days to include in the forecast
 TIMEOUT_SECONDS = 10       # for the HTTP request
+ERROR_PREFIX = "Error fetching weather data"
 
 
 def get_weather_forecast(lat: float, lon: float) -> str:
@@ -24,6 +26,10 @@ def get_weather_forecast(lat: float, lon: float) -> str:
     Returns:
         str: A multi-line forecast string, or an error message if the request fails.
     """
+    # Imported on first use to keep application startup light
+    import requests
+    from Controller.Scrapers import http_archive
+
     params = {
         "lat": lat,
         "lon": lon,
@@ -34,13 +40,15 @@ def get_weather_forecast(lat: float, lon: float) -> str:
 
     # Network or timeout errors
     try:
-        response = requests.get(API_URL, params=params, timeout=TIMEOUT_SECONDS)
+        with timed("weather", API_URL):
+            response = http_archive.get(API_URL, params=params, timeout=TIMEOUT_SECONDS)
     except requests.RequestException as e:
-        return f"Error fetching weather data: {e}"
+        return f"{ERROR_PREFIX}: {e}"
+    count("responses", url=API_URL, status=response.status_code)
 
     # Non-200 HTTP status
     if response.status_code != 200:
-        return f"Error fetching weather data: {response.status_code} - {response.text}"
+        return f"{ERROR_PREFIX}: {response.status_code} - {response.text}"
 
     payload = response.json()
     daily = payload.get("daily", [])[:FORECAST_DAYS]
@@ -0,0 +1,147 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from Controller.Caculations.weather import get_weather_forecast, ERROR_PREFIX
+from Controller.instrumentation import count
+
+# ——— Module-level configuration ———
+# Forecasts are shared by every area inside the same grid cell.
+# 0.1° is roughly 7 miles of latitude, close enough for a 10-day forecast.
+GRID_DEGREES = 0.1
+TTL_SECONDS = 60 * 60      # forecasts are considered fresh for one hour
+# Set OPENWEATHER_CACHE_FILE to persist forecasts between runs, leave unset to keep them in memory only
+CACHE_FILE = os.getenv("OPENWEATHER_CACHE_FILE")
+
+logger = logging.getLogger(__name__)
+
+# (lat bucket, lon bucket) -> (fetch time, forecast text)
+BucketKey = Tuple[int, int]
+
+
+class WeatherCache:
+    """
+    Thread-safe cache of formatted weather forecasts.
+    Coordinates are snapped to a grid so that nearby climbing areas share one forecast,
+    and entries expire after `ttl` seconds. Optionally persisted to a JSON file.
+    """
+
+    def __init__(
+        self,
+        grid_degrees: float = GRID_DEGREES,
+        ttl: float = TTL_SECONDS,
+        path: Optional[str] = CACHE_FILE
+    ) -> None:
+        """
+        Args:
+            grid_degrees: Size of one grid cell in decimal degrees.
+            ttl:          Seconds a forecast stays valid.
+            path:         Optional JSON file used to load/save the cache.
+        """
+        self.grid_degrees = grid_degrees
+        self.ttl = ttl
+        self.path = path
+        self._entries: Dict[BucketKey, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        if self.path:
+            self.load()
+
+    def bucket(self, lat: float, lon: float) -> BucketKey:
+        """Snap a coordinate to its grid cell."""
+        return (
+            math.floor(float(lat) / self.grid_degrees),
+            math.floor(float(lon) / self.grid_degrees),
+        )
+
+    def peek(self, lat: float, lon: float) -> Optional[str]:
+        """
+        Return the cached forecast for a coordinate without touching the network.
+
+        Returns:
+            The forecast string, or None if missing or expired.
+        """
+        key = self.bucket(lat, lon)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        fetched_at, text = entry
+        if time.time() - fetched_at > self.ttl:
+            return None
+        return text
+
+    def get(self, lat: float, lon: float) -> str:
+        """
+        Return the forecast for a coordinate, fetching it only on a cache miss.
+        Errors are returned to the caller but never cached, so the next call retries.
+        """
+        text = self.peek(lat, lon)
+        count("weather_cache", result="miss" if text is None else "hit")
+        if text is not None:
+            return text
+
+        # Fetch the forecast for the center of the cell so every area in it gets the same answer
+        lat_b, lon_b = self.bucket(lat, lon)
+        center_lat = (lat_b + 0.5) * self.grid_degrees
+        center_lon = (lon_b + 0.5) * self.grid_degrees
+        text = get_weather_forecast(center_lat, center_lon)
+        if not text.startswith(ERROR_PREFIX):
+            self.put(lat, lon, text)
+        return text
+
+    def put(self, lat: float, lon: float, text: str) -> None:
+        """Store a forecast for the cell containing (lat, lon)."""
+        with self._lock:
+            self._entries[self.bucket(lat, lon)] = (time.time(), text)
+        if self.path:
+            self.save()
+
+    def clear(self) -> None:
+        """Drop every cached forecast."""
+        with self._lock:
+            self._entries.clear()
+
+    def load(self) -> None:
+        """Load non-expired entries from `self.path`, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug("Weather cache not loaded from %s: %s", self.path, e)
+            return
+
+        # Buckets from a different grid size would map to the wrong areas
+        if raw.get("grid_degrees") != self.grid_degrees:
+            return
+
+        now = time.time()
+        with self._lock:
+            for entry in raw.get("entries", []):
+                lat_b, lon_b, fetched_at, text = entry
+                if now - fetched_at <= self.ttl:
+                    self._entries[(lat_b, lon_b)] = (fetched_at, text)
+
+    def save(self) -> None:
+        """Write the cache to `self.path` atomically."""
+        tmp_path = f"{self.path}.tmp"
+        # Held for the write as well so two threads never share the temp file
+        with self._lock:
+            entries = [
+                [lat_b, lon_b, fetched_at, text]
+                for (lat_b, lon_b), (fetched_at, text) in self._entries.items()
+            ]
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"grid_degrees": self.grid_degrees, "entries": entries}, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning("Couldn't save weather cache to %s: %s", self.path, e)
+
+
+# Shared cache used by the models and tabs
+FORECAST_CACHE = WeatherCache()
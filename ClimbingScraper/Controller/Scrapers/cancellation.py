@@ -0,0 +1,83 @@
+import logging
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCancelled(Exception):
+    """Raised inside a scrape once its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation shared by every stage of one search.
+    Scrapers poll `raise_if_cancelled()` between requests and register cleanup
+    callbacks (closing HTTP sessions, quitting Chrome) that run the moment the
+    search is cancelled, so blocked calls fail fast instead of finishing their page.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Mark as cancelled and run every registered cleanup callback once."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug("Cancel callback failed: %s", e)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise ScrapeCancelled if the search was cancelled."""
+        if self._event.is_set():
+            raise ScrapeCancelled()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register cleanup to run on cancel; runs immediately if already cancelled.
+
+        Returns:
+            The callback, for passing to `remove_callback` once the resource is released normally.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return callback
+        callback()
+        return callback
+
+    def remove_callback(self, callback: Callable[[], None]) -> bool:
+        """
+        Forget a callback before releasing its resource normally.
+
+        Returns:
+            bool: True if it was removed, False if cancel() already ran (or is running) it.
+        """
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+                return True
+            return False
+
+    def wait(self, seconds: float) -> None:
+        """Sleep for `seconds`, waking early and raising ScrapeCancelled if cancelled."""
+        if self._event.wait(seconds):
+            raise ScrapeCancelled()
+
+
+def check(cancel: Optional[CancelToken]) -> None:
+    """Shorthand for scrapers whose token is optional."""
+    if cancel is not None:
+        cancel.raise_if_cancelled()
@@ -1,16 +1,18 @@
 import logging
 import re
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List
 
-import requests
 from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from Controller.Caculations.area_stats import AreaStats
+from Controller.Scrapers import http_archive
+from Controller.Scrapers.mt_proj_scraper import route_rows, parse_route_row
+from Model.climb import Climb
 from Model.database import Database
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlencode, urlparse, parse_qs
 
 # ——— Module-level constants ———
 BASE_SEARCH_URL = "https://www.mountainproject.com/search"
@@ -38,8 +40,14 @@ class DatabaseInitializationScraper:
     to allow search to run.
     """
 
-    def __init__(self) -> None:
-        self.driver = webdriver.Chrome()
+    def __init__(self, catalog: bool = False) -> None:
+        """
+        Args:
+            catalog: Also store every route row of each area (name, grade, type, stars,
+                     vote count, MP link) so searches can list climbs straight from the database.
+        """
+        self.catalog = catalog
+        self.driver = http_archive.browser()
         self.db = Database()
         self.db.connect_to_database()
         #Used for primary key in database
@@ -77,7 +85,7 @@ class DatabaseInitializationScraper:
             Parsed BeautifulSoup of the loaded page.
         """
         params = {"q": state, "type": SEARCH_TYPE}
-        self.driver.get(BASE_SEARCH_URL, params=params)
+        self.driver.get(f"{BASE_SEARCH_URL}?{urlencode(params)}")
         # Wait until at least one area result appears
         WebDriverWait(self.driver, PAGE_LOAD_TIMEOUT).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/area/']"))
@@ -89,6 +97,9 @@ class DatabaseInitializationScraper:
         """
         Scroll to bottom and click “Load More” until no more results or MAX_SCROLLS reached.
         """
+        # A replayed page is the recorded one, with every result already loaded
+        if http_archive.replaying():
+            return
         for _ in range(MAX_SCROLLS):
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             try:
@@ -104,6 +115,17 @@ class DatabaseInitializationScraper:
                 break
             time.sleep(SCROLL_PAUSE)
 
+    def state_area_links(self, state: str) -> List[str]:
+        """
+        Area links (URL paths) found by the search results of one state, without
+        visiting them; the distributed crawl hands them to queue workers.
+
+        Args:
+            state: State name (e.g. 'california' or 'new+york').
+        """
+        logging.info("Listing areas of %s …", state)
+        return list(area_links(self._fetch_page(state), state))
+
     def _parse_areas(self, soup: BeautifulSoup, state: str) -> None:
         """
         This function is done after the site is fully loaded and html is recived.
@@ -114,48 +136,108 @@ class DatabaseInitializationScraper:
             soup: Parsed search-results HTML.
             state: State filter string.
         """
-        area_links = soup.find_all("a", href=lambda h: h and "/area/" in h)
-        for link_tag in area_links:
-            # Verify the area’s state label matches
-            state_label = link_tag.find("div", class_="sc-pyfCe hMSYUk")
-            if not state_label or state_label.text.lower().strip() != state:
-                continue
-
-            parsed = self._parse_area(link_tag["href"])
+        for href in area_links(soup, state):
+            parsed = parse_area(href)
             if parsed:
-                name, lat, lng, url = parsed
-                self.db.insert_climb_area(
-                    self._aid_counter, name, lat, lng, url, state
-                )
+                store_area(self.db, self._aid_counter, state, parsed, self.catalog)
                 self._aid_counter += 1
 
-    def _parse_area(self, area_url: str) -> Optional[tuple[str, str, str, str]]:
-        """
-        Fetch the individual climbing area page, validate, and extract details.
-        These details are basic details that allow for a more in depth search later on.
-        Some climbing areas in Mountain Project are simply composed of many climbing areas.
-        To avoid repreat entries, this only stores climbing areas that actually have routes.
-        Args:
-            area_url: URL path to the area page.
-        Returns:
-            Tuple of (name, latitude, longitude, full_url) or None if not a valid area.
 
-        """
-        full_url = f"https://www.mountainproject.com{area_url}"
-        resp = requests.get(full_url)
-        soup = BeautifulSoup(resp.text, "lxml")
+def area_links(soup: BeautifulSoup, state: str) -> Iterator[str]:
+    """
+    Area links of a search-results soup whose state label matches `state`.
+
+    Args:
+        soup: Parsed search-results HTML.
+        state: State filter string.
+    """
+    for link_tag in soup.find_all("a", href=lambda h: h and "/area/" in h):
+        # Verify the area’s state label matches
+        state_label = link_tag.find("div", class_="sc-pyfCe hMSYUk")
+        if state_label and state_label.text.lower().strip() == state:
+            yield link_tag["href"]
 
-        # Only process pages that list “Routes”
-        sidebar = soup.find("div", class_="mp-sidebar")
-        if not sidebar or not sidebar.find("h3", text=re.compile("^Routes")):
-            return None
 
-        name = soup.find("h3").text.strip()
+def store_area(db: Database, aid: int, state: str,
+               parsed: tuple[str, str, str, str, Optional[List[Climb]]], catalog: bool) -> None:
+    """
+    Insert one parsed area, its route stats and (in catalog mode) its routes.
+
+    Args:
+        db: Connected Database instance.
+        aid: Primary key for the area.
+        state: State filter string.
+        parsed: Result of parse_area.
+        catalog: Also store every route row.
+    """
+    name, lat, lng, url, routes = parsed
+    db.insert_climb_area(aid, name, lat, lng, url, state)
+    if routes is not None:
+        db.insert_area_stats(
+            aid, AreaStats.from_routes((c.mp_grade, c.type, c.mp_stars) for c in routes)
+        )
+        if catalog:
+            db.insert_area_routes(aid, routes)
+
+
+def area_url(area_path: str) -> str:
+    """Full URL of an area link from the search results."""
+    return area_path if area_path.startswith("http") else f"https://www.mountainproject.com{area_path}"
+
+
+def parse_area(area_path: str) -> Optional[tuple[str, str, str, str, Optional[List[Climb]]]]:
+    """
+    Fetch the individual climbing area page, validate, and extract details.
+    These details are basic details that allow for a more in depth search later on.
+    Some climbing areas in Mountain Project are simply composed of many climbing areas.
+    To avoid repreat entries, this only stores climbing areas that actually have routes.
+    The area's route table is read too: it is summarized into AreaStats so searches
+    can skip areas with nothing in the requested grade or type range, and stored
+    as-is in catalog mode.
+    Only uses requests, so it runs in any process (see the distributed crawl).
+    Args:
+        area_path: URL path (or full URL) of the area page.
+    Returns:
+        Tuple of (name, latitude, longitude, full_url, routes) or None if not a valid area.
+        routes is None if the printable page couldn't be read.
+
+    """
+    full_url = area_url(area_path)
+    resp = http_archive.get(full_url)
+    soup = BeautifulSoup(resp.text, "lxml")
+
+    # Only process pages that list “Routes”
+    sidebar = soup.find("div", class_="mp-sidebar")
+    if not sidebar or not sidebar.find("h3", text=re.compile("^Routes")):
+        return None
+
+    name = soup.find("h3").text.strip()
+
+    # Extract lat/lng from the map link
+    map_link = soup.find("table", class_="description-details")\
+                   .find("a", href=True)["href"]
+    qs = parse_qs(urlparse(map_link).query)
+    lat, lng = qs.get("q", ["", ""])[0].split(",", 1)
+
+    return name, lat, lng, full_url, parse_route_table(full_url)
 
-        # Extract lat/lng from the map link
-        map_link = soup.find("table", class_="description-details")\
-                       .find("a", href=True)["href"]
-        qs = parse_qs(urlparse(map_link).query)
-        lat, lng = qs.get("q", ["", ""])[0].split(",", 1)
 
-        return name, lat, lng, full_url
+def parse_route_table(full_url: str) -> Optional[List[Climb]]:
+    """
+    Read the route table of an area's printable page.
+
+    Args:
+        full_url: Full URL of the area page.
+    Returns:
+        One Climb per route with only the route-table fields set,
+        or None if the page couldn't be fetched or parsed.
+    """
+    try:
+        resp = http_archive.get(f"{full_url}?print=1", timeout=PAGE_LOAD_TIMEOUT)
+        resp.raise_for_status()
+        soup = BeautifulSoup(resp.text, "lxml")
+        return [parse_route_row(row) for row in route_rows(soup)]
+    except Exception as e:
+        # Areas without stats are never filtered out, so a failure here only costs speed
+        logging.warning("Couldn't read the route table of %s: %s", full_url, e)
+        return None
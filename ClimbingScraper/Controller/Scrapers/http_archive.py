@@ -0,0 +1,328 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from Controller.instrumentation import count
+
+# ——— Module-level configuration ———
+OFF, RECORD, REPLAY = "off", "record", "replay"
+MODES = (OFF, RECORD, REPLAY)
+ARCHIVE_PATH = Path(os.environ.get(
+    "CLIMBING_HTTP_ARCHIVE", Path(__file__).resolve().parent.parent.parent / "http_archive.sqlite"
+))
+ARCHIVE_MODE = os.environ.get("CLIMBING_HTTP_ARCHIVE_MODE", OFF)
+# Query parameters left out of archive keys and stored URLs (API keys)
+SECRET_PARAMS = {"appid"}
+COMPRESS_LEVEL = 6
+
+# Kinds of archive entries
+HTTP, PAGE, SCRIPT = "http", "page", "script"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind     TEXT NOT NULL,     -- http, page (rendered page source) or script (execute_script result)
+    key      TEXT NOT NULL,
+    status   INTEGER,
+    headers  TEXT,              -- JSON, http entries only
+    body     BLOB NOT NULL,     -- zlib-compressed
+    recorded REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+
+class HttpArchive:
+    """
+    Compressed SQLite archive of HTTP responses, rendered browser page sources and
+    browser script results, keyed by URL. Safe to share between scraping threads;
+    several processes can record into the same file.
+    """
+
+    def __init__(self, path: Path = ARCHIVE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def put(self, kind: str, key: str, body: bytes, status: Optional[int] = None,
+            headers: Optional[Dict[str, str]] = None) -> None:
+        """Store one entry, replacing an earlier recording of the same key."""
+        data = zlib.compress(body, COMPRESS_LEVEL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, status, headers, body, recorded)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, status, json.dumps(headers) if headers is not None else None, data, time.time())
+            )
+
+    def get(self, kind: str, key: str) -> Optional[Tuple[Optional[int], Optional[Dict[str, str]], bytes]]:
+        """(status, headers, body) of a recorded entry, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        count("archive", kind=kind, result="miss" if row is None else "hit")
+        if row is None:
+            return None
+        status, headers, data = row
+        return status, json.loads(headers) if headers else None, zlib.decompress(data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ——— Mode ———
+_mode = ARCHIVE_MODE if ARCHIVE_MODE in MODES else OFF
+_path = ARCHIVE_PATH
+_archive: Optional[HttpArchive] = None
+_archive_lock = threading.Lock()
+
+
+def configure(mode: str, path: Optional[str] = None) -> None:
+    """
+    Switch the process to recording into, or replaying from, the archive at `path`
+    (default ARCHIVE_PATH), or back to the live sites with mode OFF.
+    Call before scraping starts.
+    """
+    global _mode, _path, _archive
+    if mode not in MODES:
+        raise ValueError(f"Unknown archive mode {mode!r}; expected one of {MODES}")
+    with _archive_lock:
+        if _archive is not None:
+            _archive.close()
+            _archive = None
+        _mode = mode
+        _path = Path(path) if path else ARCHIVE_PATH
+    if mode != OFF:
+        logging.info("HTTP archive: %s %s", "recording into" if mode == RECORD else "replaying from", _path)
+
+
+def mode() -> str:
+    return _mode
+
+
+def replaying() -> bool:
+    """True when pages come from the archive; politeness delays and page interactions can be skipped."""
+    return _mode == REPLAY
+
+
+def archive() -> HttpArchive:
+    """The archive of the current mode, opened on first use."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = HttpArchive(_path)
+        return _archive
+
+
+def url_key(url: str) -> str:
+    """URL with its query sorted and SECRET_PARAMS removed, so equal requests share a key."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+# ——— HTTP ———
+class ArchiveAdapter(HTTPAdapter):
+    """
+    Transport adapter that records every response it receives into the archive,
+    or answers from the archive without touching the network.
+    A request missing from the archive fails like an unreachable host.
+    """
+
+    def __init__(self, replay: bool) -> None:
+        super().__init__()
+        self.replay = replay
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = f"{request.method} {url_key(request.url)}"
+        if self.replay:
+            entry = archive().get(HTTP, key)
+            if entry is None:
+                raise requests.ConnectionError(f"{url_key(request.url)} is not in the HTTP archive", request=request)
+            return _response(request, *entry)
+        response = super().send(request, **kwargs)
+        # Reading the body here also serves streamed downloads: iter_content yields the read content
+        archive().put(HTTP, key, response.content, response.status_code, dict(response.headers))
+        return response
+
+
+def _response(request: requests.PreparedRequest, status: int, headers: Dict[str, str], body: bytes) -> requests.Response:
+    """Rebuild a Response from an archive entry."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "Replayed"
+    # The stored body is already decoded
+    headers = {k: v for k, v in headers.items() if k.lower() not in ("content-encoding", "transfer-encoding")}
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def session() -> requests.Session:
+    """A requests Session that records or replays according to the current mode."""
+    s = requests.Session()
+    if _mode != OFF:
+        adapter = ArchiveAdapter(replay=_mode == REPLAY)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+    return s
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """requests.get that records or replays according to the current mode."""
+    if _mode == OFF:
+        return requests.get(url, **kwargs)
+    with session() as s:
+        return s.get(url, **kwargs)
+
+
+# ——— Browser ———
+def browser():
+    """
+    A Chrome WebDriver for the scrapers: a plain one, one that records the page
+    sources and script results it returns, or a ReplayDriver that starts no browser.
+    """
+    if _mode == REPLAY:
+        return ReplayDriver()
+    from selenium import webdriver
+
+    driver = webdriver.Chrome()
+    return RecordingDriver(driver) if _mode == RECORD else driver
+
+
+class RecordingDriver:
+    """
+    WebDriver wrapper that stores each page's source when it loads and again every
+    time the scraper reads it (so the archive keeps the rendered version), plus the
+    result of every script run on it. Everything else goes straight to the driver.
+    """
+
+    def __init__(self, driver) -> None:
+        self._driver = driver
+        self._url = ""
+
+    def get(self, url: str) -> None:
+        self._driver.get(url)
+        self._url = url
+        archive().put(PAGE, url_key(url), self._driver.page_source.encode())
+
+    @property
+    def page_source(self) -> str:
+        source = self._driver.page_source
+        archive().put(PAGE, url_key(self._url), source.encode())
+        return source
+
+    def execute_script(self, script: str, *args) -> Any:
+        result = self._driver.execute_script(script, *args)
+        try:
+            body = json.dumps(result).encode()
+        except TypeError:
+            # Elements and other live objects can't be replayed
+            return result
+        archive().put(SCRIPT, f"{url_key(self._url)}\n{script}", body)
+        return result
+
+    def __getattr__(self, name: str):
+        return getattr(self._driver, name)
+
+
+class ReplayDriver:
+    """
+    Stand-in for a WebDriver that serves recorded page sources and script results.
+    Elements are looked up in the recorded source (by id, name, class, tag or CSS
+    selector); typing and clicking do nothing. A recorded page never changes, so an
+    element missing from it fails the surrounding wait at once instead of at its timeout.
+    Pages that weren't recorded load as empty pages.
+    """
+
+    def __init__(self) -> None:
+        self._url = ""
+        self._source = ""
+        self._soup = None
+
+    def get(self, url: str) -> None:
+        self._url = url
+        entry = archive().get(PAGE, url_key(url))
+        if entry is None:
+            logging.debug("Page not in the HTTP archive: %s", url)
+        self._source = entry[2].decode() if entry else "<html><head></head><body></body></html>"
+        self._soup = None
+
+    @property
+    def current_url(self) -> str:
+        return self._url
+
+    @property
+    def page_source(self) -> str:
+        return self._source
+
+    def execute_script(self, script: str, *args) -> Any:
+        entry = archive().get(SCRIPT, f"{url_key(self._url)}\n{script}")
+        return json.loads(entry[2]) if entry else None
+
+    def find_element(self, by: str, value: str) -> "_ReplayElement":
+        from bs4 import BeautifulSoup
+        from selenium.common import TimeoutException
+
+        if self._soup is None:
+            self._soup = BeautifulSoup(self._source, "lxml")
+        find = {
+            "id": lambda: self._soup.find(id=value),
+            "name": lambda: self._soup.find(attrs={"name": value}),
+            "class name": lambda: self._soup.find(class_=value),
+            "tag name": lambda: self._soup.find(value),
+            "css selector": lambda: self._soup.select_one(value),
+        }.get(by)
+        tag = find() if find else None
+        if tag is None:
+            raise TimeoutException(f"{by} {value!r} is not in the recorded page {self._url}")
+        return _ReplayElement(tag)
+
+    def quit(self) -> None:
+        pass
+
+
+class _ReplayElement:
+    """Element of a recorded page: readable, and inert when typed into or clicked."""
+
+    def __init__(self, tag) -> None:
+        self._tag = tag
+
+    @property
+    def text(self) -> str:
+        return self._tag.get_text(strip=True)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._tag.get(name)
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def send_keys(self, *keys) -> None:
+        pass
+
+    def click(self) -> None:
+        pass
@@ -1,26 +1,95 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import List
+import sys
 
+import requests
+from bs4 import BeautifulSoup, Tag
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.instrumentation import count, timed
+from Controller.Scrapers import http_archive
+from Controller.Scrapers.cancellation import CancelToken, check
+from Controller.Scrapers.rate_limits import throttle
+from Controller.Scrapers.stage_limits import stage
 from Model.climb import Climb
 from Model.climbing_area import ClimbingArea
 
+# ——— Module-level constants ———
+REQUEST_TIMEOUT = 15  # seconds, bounds how long a cancelled search can stay blocked on a request
+
 
-def scrape_mt_proj(area: ClimbingArea) -> None:
+def scrape_mt_proj(
+    area: ClimbingArea,
+    cancel: Optional[CancelToken] = None,
+    climb_filter: Optional[ClimbFilter] = None,
+    details: bool = True
+) -> None:
     """
     Populate `area` with descriptions, comments, climbs, and photos
     scraped from MountainProject.
     This is the core function that uses the other fuctions in the module as helpers
 
     Args:
-        area: A ClimbingArea instance with `mt_proj_link` set.
+        area:   A ClimbingArea instance with `mt_proj_link` set.
+        cancel: Optional token; the scrape stops with ScrapeCancelled once it is cancelled.
+        climb_filter: Optional grade/type filter; climbs it rejects are skipped before
+                      their detail page is fetched.
+        details: Fetch every climb's detail page and photos. Without it only the two
+                 area pages are requested; climbs keep `mp_link` for load_climb_details.
+    """
+    with _session(cancel) as session:
+        print_soup = _scrape_area_pages(area, session, cancel)
+        area.climbs.extend(_parse_climbs(print_soup, session, cancel, climb_filter, details))
+
+
+def load_area_details(area: ClimbingArea, cancel: Optional[CancelToken] = None) -> None:
     """
-    session = requests.Session()
+    Fetch only the area's descriptions and comments, for areas whose climbs
+    were listed from the route catalog instead of scraped.
+    """
+    with _session(cancel) as session:
+        _scrape_area_pages(area, session, cancel)
+
+
+def load_climb_details(climb: Climb, cancel: Optional[CancelToken] = None) -> None:
+    """
+    Fetch one climb's detail page (descriptions, comments, photos) on demand.
+    The climb must have `mp_link` set, as climbs from the route catalog do.
+    """
+    with _session(cancel) as session:
+        _parse_climb_details(climb, session, cancel)
+
 
+@contextmanager
+def _session(cancel: Optional[CancelToken]) -> Iterator[requests.Session]:
+    """
+    HTTP session that is closed when done, or as soon as `cancel` is cancelled.
+    Records or replays through the HTTP archive when it is enabled.
+    """
+    session = http_archive.session()
+    # Closing the session on cancel drops its pooled connections
+    close_cb = cancel.on_cancel(session.close) if cancel else None
+    try:
+        yield session
+    finally:
+        if close_cb:
+            cancel.remove_callback(close_cb)
+        session.close()
+
+
+def _scrape_area_pages(
+    area: ClimbingArea,
+    session: requests.Session,
+    cancel: Optional[CancelToken]
+) -> BeautifulSoup:
+    """
+    Fill the area's descriptions and comments.
+
+    Returns:
+        The parsed printable page, whose route table lists the area's climbs.
+    """
     # 1) Main area info page
-    resp = session.get(area.mt_proj_link)
-    resp.raise_for_status()
-    main_soup = BeautifulSoup(resp.text, "lxml")
+    main_soup = _soup(_get(session, area.mt_proj_link, cancel), area.mt_proj_link)
 
     # Extract all rich-text descriptions
     desc_divs = main_soup.find_all("div", class_="fr-view")
@@ -30,16 +99,39 @@ def scrape_mt_proj(area: ClimbingArea) -> None:
     # The printable page is the easiest way to view the compiled information of the
     # area and it's climbs
     print_url = f"{area.mt_proj_link}?print=1"
-    resp = session.get(print_url)
-    resp.raise_for_status()
-    print_soup = BeautifulSoup(resp.text, "lxml")
+    print_soup = _soup(_get(session, print_url, cancel), print_url)
 
-    # Append reviews and climb objects
+    # Append reviews
     area.mp_area_comments.extend(_parse_reviews(print_soup))
-    area.climbs.extend(_parse_climbs(print_soup))
+    area.details_loaded = True
+    return print_soup
 
 
 # ——— Helpers ———
+def _get(session: requests.Session, url: str, cancel: Optional[CancelToken]) -> str:
+    """
+    Fetch one Mountain Project page while holding an "mp" stage slot.
+    Checks for cancellation before the request goes out.
+
+    Returns:
+        The response body.
+    """
+    check(cancel)
+    throttle(url, cancel)
+    with stage("mp"), timed("mp_fetch", url):
+        resp = session.get(url, timeout=REQUEST_TIMEOUT)
+    count("responses", url=url, status=resp.status_code)
+    count("bytes", len(resp.content), url=url)
+    resp.raise_for_status()
+    return resp.text
+
+
+def _soup(html: str, url: str) -> BeautifulSoup:
+    """Parse a fetched page, timed as the "mp_parse" stage."""
+    with timed("mp_parse", url):
+        return BeautifulSoup(html, "lxml")
+
+
 def _parse_reviews(soup: BeautifulSoup) -> List[str]:
     """
     Grab all user reviews from a printable area page.
@@ -61,56 +153,101 @@ def _parse_reviews(soup: BeautifulSoup) -> List[str]:
     return reviews
 
 
-def _parse_climbs(soup: BeautifulSoup) -> List[Climb]:
+def route_rows(soup: BeautifulSoup) -> List[Tag]:
+    """
+    Rows of the route table on a printable (`?print=1`) area page.
+    Also used by the catalog builder to compute per-area route statistics.
+    """
+    table = soup.find("table", class_="table route-table hidden-xs-down")
+    # original selector: ".route-row bg-gray-background, .route-row"
+    return table.select(".route-row") if table else []
+
+
+def parse_route_row(row: Tag) -> Climb:
+    """
+    Build a Climb from the fields shown in one route-table row:
+    name, MP stars and rating count, grade and type. No requests are made.
+    """
+    climb = Climb()
+    climb.name = row.find("strong").get_text(strip=True)
+
+    # Star rating
+    star_cell = row.find("td", class_="p-0")
+    climb.mp_stars = len(star_cell.find_all("img"))
+    climb.num_mp_stars = star_cell.find("span", class_="text-muted small")\
+                             .get_text(strip=True)[1:]
+
+    # Grades and types repeat across thousands of climbs; intern them so they're stored once
+    climb.mp_grade = sys.intern(row.find("span", class_="rateYDS").get_text(strip=True))
+    climb.type     = sys.intern(row.find("span", class_="small text-warm pl-half")
+                                   .find_all("span")[1].get_text(strip=True))
+    climb.mp_link  = row.find("a", href=True)["href"]
+    return climb
+
+
+def _parse_climbs(
+    soup: BeautifulSoup,
+    session: requests.Session,
+    cancel: Optional[CancelToken] = None,
+    climb_filter: Optional[ClimbFilter] = None,
+    details: bool = True
+) -> List[Climb]:
     """
     Extract all Climb objects (with descriptions, comments, photos)
     from the printable-area page.
 
     Args:
-        soup: Parsed BeautifulSoup of the `?print=1` page.
+        soup:    Parsed BeautifulSoup of the `?print=1` page.
+        session: HTTP session reused for each climb's detail page.
+        cancel:  Optional token checked before every request and download.
+        climb_filter: Optional filter checked against the row's grade and type.
+        details: Fetch each climb's detail page; otherwise only route-table fields are set.
 
     Returns:
-        A list of Climb instances, fully populated.
+        A list of Climb instances, fully populated (only those the filter accepts).
     """
     climbs: List[Climb] = []
-    table = soup.find("table", class_="table route-table hidden-xs-down")
-    # original selector: ".route-row bg-gray-background, .route-row"
-    rows = table.select(".route-row") if table else []
-
-    for row in rows:
-        climb = Climb()
-        climb.name = row.find("strong").get_text(strip=True)
-
-        # Star rating
-        star_cell = row.find("td", class_="p-0")
-        climb.mp_stars = len(star_cell.find_all("img"))
-        climb.num_mp_stars = star_cell.find("span", class_="text-muted small")\
-                                 .get_text(strip=True)[1:]
-
-        climb.mp_grade = row.find("span", class_="rateYDS").get_text(strip=True)
-        climb.type     = row.find("span", class_="small text-warm pl-half")\
-                               .find_all("span")[1].get_text(strip=True)
-
-        # Fetch climb’s own printable page for extra data
-        detail_link = row.find("a", href=True)["href"] + "?print=1"
-        detail_soup = BeautifulSoup(requests.get(detail_link).text, "lxml")
-
-        # Descriptions
-        descs = [d.get_text(strip=True)
-                 for d in detail_soup.find_all("div", class_="fr-view")]
-        climb.mp_descriptions.extend(descs)
-
-        # Comments (strip out <a> and <span>)
-        for com in detail_soup.find_all("div", class_="comment-body"):
-            for tag in com.find_all(["a", "span"]):
-                tag.extract()
-            climb.mp_comments.append(com.get_text(strip=True))
-
-        # Photos
-        for img in detail_soup.find_all("img", class_="lazy img-fluid"):
-            #add_photo downloads the image into a file for furthur viewing
-            climb.add_photo(img["data-src"], "search_images")
 
+    for row in route_rows(soup):
+        climb = parse_route_row(row)
+
+        # Grade and type come from the row itself, so filtered climbs cost no requests
+        if climb_filter and not climb_filter.accepts(climb.mp_grade, climb.type):
+            continue
+
+        if details:
+            _parse_climb_details(climb, session, cancel)
         climbs.append(climb)
 
     return climbs
+
+
+def _parse_climb_details(
+    climb: Climb,
+    session: requests.Session,
+    cancel: Optional[CancelToken] = None
+) -> None:
+    """
+    Fetch the climb's own printable page and add its descriptions, comments and photos.
+    """
+    # Fetch climb’s own printable page for extra data
+    detail_link = climb.mp_link + "?print=1"
+    detail_soup = _soup(_get(session, detail_link, cancel), detail_link)
+
+    # Descriptions
+    descs = [d.get_text(strip=True)
+             for d in detail_soup.find_all("div", class_="fr-view")]
+    climb.mp_descriptions.extend(descs)
+
+    # Comments (strip out <a> and <span>)
+    for com in detail_soup.find_all("div", class_="comment-body"):
+        for tag in com.find_all(["a", "span"]):
+            tag.extract()
+        climb.mp_comments.append(com.get_text(strip=True))
+
+    # Photos
+    for img in detail_soup.find_all("img", class_="lazy img-fluid"):
+        #add_photo downloads the image into a file for furthur viewing
+        climb.add_photo(img["data-src"], "search_images", cancel)
+
+    climb.details_loaded = True
@@ -0,0 +1,89 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from Controller.instrumentation import observe
+from Controller.Scrapers.cancellation import CancelToken
+
+# ——— Module-level configuration ———
+# Request budgets per host as (requests per second, burst), applied only to scrapes run
+# inside `budgeted()` (background refreshes), so interactive searches are never slowed:
+#   www.mountainproject.com - area, route and detail pages
+#   www.8a.nu               - Vertical-Life search, route and gallery pages
+HOST_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "www.mountainproject.com": (0.5, 3),
+    "www.8a.nu": (0.2, 2),
+}
+# Every other host (photo CDNs)
+DEFAULT_BUDGET: Tuple[float, float] = (2.0, 5)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, going into debt if needed; returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_local = threading.local()
+
+
+def _bucket(host: str) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(*HOST_BUDGETS.get(host, DEFAULT_BUDGET))
+        return bucket
+
+
+@contextmanager
+def budgeted() -> Iterator[None]:
+    """Apply the host budgets to every request made by the current thread inside the block."""
+    previous = getattr(_local, "active", False)
+    _local.active = True
+    try:
+        yield
+    finally:
+        _local.active = previous
+
+
+def throttle(url: str, cancel: Optional[CancelToken] = None) -> None:
+    """
+    Wait for the budget of `url`'s host if the current thread is inside `budgeted()`.
+    Raises ScrapeCancelled if `cancel` is cancelled while waiting.
+    """
+    if not getattr(_local, "active", False):
+        return
+    delay = _bucket(urlsplit(url).netloc).reserve()
+    if delay <= 0:
+        return
+    observe("throttle_wait", delay, url)
+    if cancel is not None:
+        cancel.wait(delay)
+    else:
+        time.sleep(delay)
+
+
+def configure(budgets: Dict[str, Tuple[float, float]]) -> None:
+    """Replace the budgets of the given hosts; their buckets start full."""
+    with _buckets_lock:
+        for host, budget in budgets.items():
+            HOST_BUDGETS[host] = budget
+            _buckets.pop(host, None)
@@ -0,0 +1,45 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from Controller.instrumentation import observe
+
+# ——— Module-level configuration ———
+# Maximum concurrent operations per scrape stage, shared by every search worker:
+#   mp    - HTTP requests to Mountain Project
+#   vl    - open Vertical-Life Chrome sessions (each one is a full browser)
+#   photo - image downloads
+STAGE_LIMITS: Dict[str, int] = {"mp": 4, "vl": 2, "photo": 6}
+
+_semaphores: Dict[str, threading.BoundedSemaphore] = {
+    name: threading.BoundedSemaphore(limit) for name, limit in STAGE_LIMITS.items()
+}
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Block until a slot for `name` is free and hold it for the duration of the block.
+
+    Args:
+        name: One of the keys of STAGE_LIMITS.
+    """
+    semaphore = _semaphores[name]
+    start = time.perf_counter()
+    semaphore.acquire()
+    observe("stage_wait", time.perf_counter() - start, slot=name)
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+def configure(limits: Dict[str, int]) -> None:
+    """
+    Replace the limits for the given stages.
+    Only call this while no scrape is running, blocks already inside a stage keep the old semaphore.
+    """
+    for name, limit in limits.items():
+        STAGE_LIMITS[name] = limit
+        _semaphores[name] = threading.BoundedSemaphore(limit)
@@ -3,6 +3,7 @@ import random
 import time
 import logging
 import re
+import threading
 
 from typing import Optional
 from bs4 import BeautifulSoup
@@ -12,6 +13,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from Controller.instrumentation import timed
+from Controller.Scrapers import http_archive
+from Controller.Scrapers.cancellation import CancelToken, ScrapeCancelled, check
+from Controller.Scrapers.rate_limits import throttle
+from Controller.Scrapers.stage_limits import stage
 from Model.climb import Climb
 from Model.climbing_area import ClimbingArea
 
@@ -26,8 +32,10 @@ LOGIN_URL = (
     "&code_challenge=s-qG020GHwaB_DLrhcF5AhsgCaenJPTT3remoPmpTaM"
     "&code_challenge_method=S256"
 )
-SEARCH_URL = "https://www.8a.nu/search/zlaggables?query={query}"
-GALLERY_URL = "https://www.8a.nu{path}"
+# Site the route, search and gallery pages are read from (the offline benchmark points it at a stand-in)
+SITE_URL = "https://www.8a.nu"
+SEARCH_URL = "{site}/search/zlaggables?query={query}"
+GALLERY_URL = "{site}{path}"
 PAGE_LOAD_TIMEOUT = 30  # seconds for WebDriverWait
 DELAY_RANGE = (1.0, 3.0)  # seconds, polite pause between climbs
 
@@ -39,7 +47,7 @@ VL_PASSWORD = "pC74DmXz5vJ7@Ep"
 logging.basicConfig(level=logging.INFO)
 
 
-def scrape_vertical_life(area: ClimbingArea) -> None:
+def scrape_vertical_life(area: ClimbingArea, cancel: Optional[CancelToken] = None) -> None:
     """
     Scrape Vertical-Life data for each climb in the given area.
     Uses the climbs from mountain project areas to attempt to find the same
@@ -52,49 +60,173 @@ def scrape_vertical_life(area: ClimbingArea) -> None:
       - photos via climb.add_photo(...)
 
     Ensures the WebDriver quits on error.
+    Holds a "vl" stage slot for the whole session, which caps how many Chromes run at once.
+    Cancelling `cancel` quits the driver immediately; the scrape then raises ScrapeCancelled.
     """
-    driver = webdriver.Chrome()
+    check(cancel)
+    with stage("vl"):
+        try:
+            _scrape_vertical_life(area, cancel)
+        except ScrapeCancelled:
+            raise
+        except Exception as e:
+            # Any WebDriver error after a cancel is the driver being quit underneath us
+            if cancel is not None and cancel.cancelled:
+                raise ScrapeCancelled() from e
+            raise
+
+
+def _scrape_vertical_life(area: ClimbingArea, cancel: Optional[CancelToken]) -> None:
+    """Body of scrape_vertical_life, run while holding a "vl" stage slot."""
+    driver = http_archive.browser()
+    quit_cb = cancel.on_cancel(driver.quit) if cancel else None
     try:
         _login(driver)
         for climb in area.climbs:
-            link = _find_climb_link(climb.name, driver)
-            if not link:
-                #This means the climb does not exist on vertical life
-                logging.warning("Skipped: no link for %r", climb.name)
+            check(cancel)
+            if not _scrape_climb(driver, climb, cancel):
                 continue
 
-            driver.get(link)
-            WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.route-avatar-container"))
-            )
-            page = BeautifulSoup(driver.page_source, "lxml")
-            # If does exist, parse all available information
-            # Basic route info
-            climb.vl_grade      = _get_grade(page)
-            climb.vl_stars      = _get_stars(page)
-            climb.vl_recommends = _get_recommends(page)
-            climb.vl_comments   = _get_comments(page)
-
-            # Style metrics
-            style = _get_style(driver)
-            #Rarely, a climb will have no style data on it's page
-            if style:
-                #Use previous gathered datas to generate more stastics
-                total = sum(style.values())
-                climb.vl_ascents     = total
-                climb.vl_onsite_rate = round((style.get("onsight", 0) / total) * 100)
+            # Polite delay, cut short by a cancel; replayed pages need none
+            delay = 0 if http_archive.replaying() else random.uniform(*DELAY_RANGE)
+            if cancel:
+                cancel.wait(delay)
             else:
-                logging.warning("No style data for: %r", climb.name)
-                climb.vl_ascents     = 0
-                climb.vl_onsite_rate = 0.0
+                time.sleep(delay)
+    finally:
+        # If the cancel callback already quit the driver, don't quit it twice
+        if quit_cb is None or cancel.remove_callback(quit_cb):
+            driver.quit()
 
-            # Photos
-            _get_photos(page, driver, climb)
 
-            # Polite delay
-            time.sleep(random.uniform(*DELAY_RANGE))
-    finally:
-        driver.quit()
+def _scrape_climb(driver: webdriver.Chrome, climb: Climb, cancel: Optional[CancelToken] = None) -> bool:
+    """
+    Look one climb up on Vertical-Life with a logged-in driver and fill its VL fields.
+
+    The climb is only marked VL-loaded once its page is fully parsed (or it has no page),
+    so a lookup that fails or is cancelled half way is retried later.
+
+    Returns:
+        bool: False if the climb doesn't exist on Vertical-Life.
+    """
+    link = _find_climb_link(climb.name, driver)
+    if not link:
+        #This means the climb does not exist on vertical life
+        logging.warning("Skipped: no link for %r", climb.name)
+        climb.vl_loaded = True
+        return False
+
+    throttle(link, cancel)
+    with timed("vl_page", link):
+        driver.get(link)
+        WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.route-avatar-container"))
+        )
+    with timed("vl_parse", link):
+        page = BeautifulSoup(driver.page_source, "lxml")
+        # If does exist, parse all available information
+        # Basic route info
+        climb.vl_grade      = _get_grade(page)
+        climb.vl_stars      = _get_stars(page)
+        climb.vl_recommends = _get_recommends(page)
+        climb.vl_comments   = _get_comments(page)
+
+    # Style metrics
+    with timed("vl_style", link):
+        # A replayed result is final, so there's nothing to wait for
+        style = _get_style(driver, 0 if http_archive.replaying() else PAGE_LOAD_TIMEOUT)
+    #Rarely, a climb will have no style data on it's page
+    if style:
+        #Use previous gathered datas to generate more stastics
+        total = sum(style.values())
+        climb.vl_ascents     = total
+        climb.vl_onsite_rate = round((style.get("onsight", 0) / total) * 100)
+    else:
+        logging.warning("No style data for: %r", climb.name)
+        climb.vl_ascents     = 0
+        climb.vl_onsite_rate = 0.0
+
+    # Photos
+    _get_photos(page, driver, climb, cancel)
+    climb.vl_loaded = True
+    return True
+
+
+class VerticalLifeSession:
+    """
+    One logged-in Chrome kept open for on-demand lookups of single climbs,
+    so browsing lazily loaded results doesn't start a browser and log in per climb.
+    Lookups are serialized and spaced at least DELAY_RANGE apart, like the batch
+    scrape; each one holds a "vl" stage slot while it runs. Cancelling a lookup
+    quits the browser at once, and the next lookup logs in again.
+    """
+
+    def __init__(self) -> None:
+        self._driver: Optional[webdriver.Chrome] = None
+        self._lock = threading.Lock()
+        self._next_lookup = 0.0   # monotonic time the next lookup may start
+
+    def scrape_climb(self, climb: Climb, cancel: Optional[CancelToken] = None) -> bool:
+        """
+        Fill one climb's VL fields, logging in on first use.
+
+        Returns:
+            bool: False if the climb doesn't exist on Vertical-Life.
+        """
+        check(cancel)
+        with self._lock:
+            # Polite pause since the previous lookup, cut short by a cancel; replayed pages need none
+            delay = 0 if http_archive.replaying() else self._next_lookup - time.monotonic()
+            if delay > 0:
+                if cancel:
+                    cancel.wait(delay)
+                else:
+                    time.sleep(delay)
+            with stage("vl"):
+                check(cancel)
+                try:
+                    return self._lookup(climb, cancel)
+                finally:
+                    self._next_lookup = time.monotonic() + random.uniform(*DELAY_RANGE)
+
+    def _lookup(self, climb: Climb, cancel: Optional[CancelToken]) -> bool:
+        """Body of scrape_climb, run under the lock and a "vl" stage slot."""
+        login = self._driver is None
+        if login:
+            self._driver = http_archive.browser()
+        driver = self._driver
+        # A new search cancels the token; quitting the browser ends a lookup stuck in a wait
+        quit_cb = cancel.on_cancel(driver.quit) if cancel else None
+        try:
+            if login:
+                _login(driver)
+            return _scrape_climb(driver, climb, cancel)
+        except ScrapeCancelled:
+            raise
+        except Exception as e:
+            # Any WebDriver error after a cancel is the driver being quit underneath us
+            if cancel is not None and cancel.cancelled:
+                raise ScrapeCancelled() from e
+            # The browser may be unusable now; log in again on the next lookup
+            self._quit()
+            raise
+        finally:
+            # The cancel quit the browser: drop it so the next lookup starts a new one
+            if quit_cb is not None and not cancel.remove_callback(quit_cb) and self._driver is driver:
+                self._driver = None
+
+    def _quit(self) -> None:
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logging.debug("Error quitting VL driver: %s", e)
+            self._driver = None
+
+    def close(self) -> None:
+        """Quit the browser; waits for a running lookup to finish."""
+        with self._lock:
+            self._quit()
 
 
 def _login(driver: webdriver.Chrome) -> None:
@@ -103,14 +235,15 @@ def _login(driver: webdriver.Chrome) -> None:
     Using a bot to login will likely trigger vertical life's anti bot system
     You'll have to quit the "I'm not a robot" button manually
     """
-    driver.get(LOGIN_URL)
-    wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
-    user_input = wait.until(EC.presence_of_element_located((By.ID, "username")))
-    user_input.send_keys(VL_USERNAME)
-    pwd_input = wait.until(EC.presence_of_element_located((By.ID, "password")))
-    pwd_input.send_keys(VL_PASSWORD)
-    login_btn = wait.until(EC.element_to_be_clickable((By.ID, "kc-login")))
-    login_btn.click()
+    with timed("vl_login", LOGIN_URL):
+        driver.get(LOGIN_URL)
+        wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
+        user_input = wait.until(EC.presence_of_element_located((By.ID, "username")))
+        user_input.send_keys(VL_USERNAME)
+        pwd_input = wait.until(EC.presence_of_element_located((By.ID, "password")))
+        pwd_input.send_keys(VL_PASSWORD)
+        login_btn = wait.until(EC.element_to_be_clickable((By.ID, "kc-login")))
+        login_btn.click()
 
 
 def _find_climb_link(name: str, driver: webdriver.Chrome) -> Optional[str]:
@@ -118,18 +251,21 @@ def _find_climb_link(name: str, driver: webdriver.Chrome) -> Optional[str]:
     Search Vertical-Life for a climb name and return its URL, or None if it does not exist.
     """
     query = name.replace(" ", "%20")
-    driver.get(SEARCH_URL.format(query=query))
+    url = SEARCH_URL.format(site=SITE_URL, query=query)
+    throttle(url)
     try:
-        WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "p.name-link > a"))
-        )
+        with timed("vl_search", url):
+            driver.get(url)
+            WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "p.name-link > a"))
+            )
     except TimeoutException:
         logging.warning("Timeout searching for %r", name)
         return None
 
     soup = BeautifulSoup(driver.page_source, "lxml")
     link_tag = soup.select_one("p.name-link > a[href]")
-    return f"https://www.8a.nu{link_tag['href']}" if link_tag else None
+    return f"{SITE_URL}{link_tag['href']}" if link_tag else None
 
 
 def _get_comments(page: BeautifulSoup) -> list[str]:
@@ -190,7 +326,12 @@ def _get_style(driver: webdriver.Chrome, timeout: int = PAGE_LOAD_TIMEOUT) -> Op
         return None
 
 
-def _get_photos(page: BeautifulSoup, driver: webdriver.Chrome, climb: Climb) -> None:
+def _get_photos(
+    page: BeautifulSoup,
+    driver: webdriver.Chrome,
+    climb: Climb,
+    cancel: Optional[CancelToken] = None
+) -> None:
     """
     Navigate to the photo gallery and add photos to the climb.
     """
@@ -201,12 +342,14 @@ def _get_photos(page: BeautifulSoup, driver: webdriver.Chrome, climb: Climb) ->
     if match and int(match.group(1)) == 0:
         return
 
-    gallery_url = GALLERY_URL.format(path=gallery_link_elem['href'])
-    driver.get(gallery_url)
+    gallery_url = GALLERY_URL.format(site=SITE_URL, path=gallery_link_elem['href'])
+    throttle(gallery_url, cancel)
     try:
-        WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "img-wrapper"))
-        )
+        with timed("vl_gallery", gallery_url):
+            driver.get(gallery_url)
+            WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "img-wrapper"))
+            )
     except TimeoutException:
         logging.warning("Timeout loading gallery page.")
         return
@@ -216,4 +359,4 @@ def _get_photos(page: BeautifulSoup, driver: webdriver.Chrome, climb: Climb) ->
         img = img_div.find('img')
         if img and img.get('src'):
             #Downloads the image
-            climb.add_photo(img['src'], "search_images")
+            climb.add_photo(img['src'], "search_images", cancel)
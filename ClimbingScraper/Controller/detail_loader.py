@@ -0,0 +1,139 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Set, Tuple
+
+from Controller.Scrapers.cancellation import CancelToken, ScrapeCancelled
+from Model.climb import Climb
+from Model.climbing_area import ClimbingArea
+from Model.rendered_text import PAGE_SIZE
+
+# ——— Module-level configuration ———
+MAX_WORKERS = 2            # climbs whose MP details load at the same time
+
+logger = logging.getLogger(__name__)
+
+
+class DetailLoader:
+    """
+    Fetches a climb's details in the background the first time the climb is displayed:
+    its Mountain Project detail page (descriptions, comments, photos), its area's
+    descriptions and comments if those weren't scraped, and its Vertical-Life stats.
+    Used for climbs listed from the route catalog or scraped in lazy mode, which
+    arrive with only their route-table fields.
+
+    MP pages load on a small thread pool. VL lookups share one logged-in browser,
+    so they run one at a time on their own thread and never hold up MP pages.
+    `on_ready` is called with (area, climb) after each part finishes.
+    """
+
+    def __init__(
+        self,
+        on_ready: Callable[[Tuple[ClimbingArea, Climb]], None],
+        max_workers: int = MAX_WORKERS,
+        vertical_life: bool = True
+    ) -> None:
+        """
+        Args:
+            on_ready:      Callback run on a worker thread with (area, climb) after a load.
+            max_workers:   Size of the MP loader thread pool.
+            vertical_life: Also look climbs up on Vertical-Life.
+        """
+        self.on_ready = on_ready
+        self.vertical_life = vertical_life
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="details")
+        self._vl_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="details-vl")
+        self._vl_session = None
+        self._in_flight: Set[int] = set()
+        self._vl_in_flight: Set[int] = set()
+        self._areas_loading: Set[int] = set()
+        self._lock = threading.Lock()
+        self.cancel_token = CancelToken()
+
+    def request(self, area: ClimbingArea, climb: Climb) -> bool:
+        """
+        Queue whatever parts of the climb aren't loaded or loading yet.
+
+        Returns:
+            bool: True if anything was queued.
+        """
+        queued = False
+        with self._lock:
+            if not climb.details_loaded and climb.mp_link is not None \
+                    and id(climb) not in self._in_flight:
+                self._in_flight.add(id(climb))
+                self._executor.submit(self._load_mp, area, climb, self.cancel_token)
+                queued = True
+            if self.vertical_life and not climb.vl_loaded and climb.name \
+                    and id(climb) not in self._vl_in_flight:
+                self._vl_in_flight.add(id(climb))
+                self._vl_executor.submit(self._load_vl, area, climb, self.cancel_token)
+                queued = True
+        return queued
+
+    def _load_mp(self, area: ClimbingArea, climb: Climb, cancel: CancelToken) -> None:
+        """Worker: scrape the MP details and notify the GUI."""
+        # Scrapers pull in BeautifulSoup, so they load on first use
+        from Controller.Scrapers.mt_proj_scraper import load_area_details, load_climb_details
+
+        load_area = False
+        with self._lock:
+            # Two climbs of one area can load together; only one of them fetches the area pages
+            if not area.details_loaded and id(area) not in self._areas_loading:
+                self._areas_loading.add(id(area))
+                load_area = True
+        try:
+            if load_area:
+                load_area_details(area, cancel)
+                area.area_descriptions_page(0, PAGE_SIZE)
+                area.area_comments_page(0, PAGE_SIZE)
+            load_climb_details(climb, cancel)
+            # Render on this thread so the GUI's refresh is a cache hit
+            climb.prerender()
+        except ScrapeCancelled:
+            return
+        except Exception:
+            if not cancel.cancelled:
+                # Left unloaded, so displaying the climb again retries
+                logger.exception("Loading details failed for %r", climb.name)
+            return
+        finally:
+            with self._lock:
+                self._in_flight.discard(id(climb))
+                if load_area:
+                    self._areas_loading.discard(id(area))
+        self.on_ready((area, climb))
+
+    def _load_vl(self, area: ClimbingArea, climb: Climb, cancel: CancelToken) -> None:
+        """Worker: look the climb up on Vertical-Life and notify the GUI."""
+        # Selenium is a slow import, so it loads with the first lookup
+        from Controller.Scrapers.v_life_scraper import VerticalLifeSession
+
+        try:
+            if self._vl_session is None:
+                self._vl_session = VerticalLifeSession()
+            self._vl_session.scrape_climb(climb, cancel)
+            climb.prerender()
+        except ScrapeCancelled:
+            return
+        except Exception:
+            if not cancel.cancelled:
+                logger.exception("Vertical-Life lookup failed for %r", climb.name)
+            return
+        finally:
+            with self._lock:
+                self._vl_in_flight.discard(id(climb))
+        self.on_ready((area, climb))
+
+    def reset(self) -> None:
+        """Cancel loads for the previous search; later requests use a fresh token."""
+        self.cancel_token.cancel()
+        self.cancel_token = CancelToken()
+
+    def shutdown(self) -> None:
+        """Cancel running loads, stop the pools and quit the VL browser."""
+        self.cancel_token.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._vl_executor.shutdown(wait=False, cancel_futures=True)
+        if self._vl_session is not None:
+            self._vl_session.close()
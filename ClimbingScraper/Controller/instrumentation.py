@@ -0,0 +1,332 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from Controller.Scrapers.cancellation import ScrapeCancelled
+
+# ——— Module-level configuration ———
+# Set CLIMBING_METRICS_FILE to write every metric as JSON when the app, CLI or API server exits
+METRICS_FILE = os.getenv("CLIMBING_METRICS_FILE")
+METRIC_PREFIX = "climbing_scraper"
+# Histogram bucket bounds in seconds, from a cached DB query up to a Selenium page timeout
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+REPORT_TOP_AREAS = 5       # slowest areas listed in a search summary
+
+# Stages timed across the pipeline:
+#   mp_fetch, mp_parse                           - Mountain Project requests and BeautifulSoup parsing
+#   vl_login, vl_search, vl_page, vl_parse,      - Vertical-Life browser steps; vl_style is the wait
+#   vl_style, vl_gallery                           for the __NUXT__ style data
+#   photo, weather, db                           - image downloads, OpenWeather requests, MySQL queries
+#   stage_wait, throttle_wait                    - time blocked on stage_limits slots and rate_limits budgets
+#   api                                          - API server requests, per route
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_local = threading.local()
+
+
+def host_of(url: Optional[str]) -> str:
+    """Host part of a URL, or "" if there is none."""
+    return urlsplit(url).netloc if url else ""
+
+
+@contextmanager
+def tagged(**tags: Any) -> Iterator[None]:
+    """
+    Tag every metric recorded by the current thread inside the block (e.g. area=name).
+    Context tags only reach per-search reports; exported metrics keep to their explicit
+    labels so the number of series stays bounded.
+    """
+    previous = getattr(_local, "tags", {})
+    _local.tags = {**previous, **{name: str(value) for name, value in tags.items()}}
+    try:
+        yield
+    finally:
+        _local.tags = previous
+
+
+def _labels(url: Optional[str], tags: Dict[str, Any]) -> Labels:
+    labels = {name: str(value) for name, value in tags.items()}
+    if url:
+        labels["host"] = host_of(url)
+    return tuple(sorted(labels.items()))
+
+
+class _Histogram:
+    """Count, sum, max and cumulative-ready bucket counts of one timed series."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # One slot per bound plus the overflow (+Inf) slot
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding quantile `q` (the max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """
+    Thread-safe registry of timers and counters, shared by every scrape thread.
+
+    Timers are histograms per stage and labels; counters are sums per name and labels.
+    Labels come from the call (`url` becomes host) and never from `tagged()` context,
+    which only goes to the SearchReports running at the time.
+    """
+
+    def __init__(self) -> None:
+        self._timers: Dict[Tuple[str, Labels], _Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._reports: List["SearchReport"] = []
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    # ——— Recording ———
+    def observe(self, stage: str, seconds: float, url: Optional[str] = None, **tags: Any) -> None:
+        """Record one timing of `stage`."""
+        key = (stage, _labels(url, tags))
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                timer = self._timers[key] = _Histogram()
+            timer.observe(seconds)
+            reports = list(self._reports)
+        if reports:
+            context = getattr(_local, "tags", {})
+            for report in reports:
+                report.observe(stage, seconds, key[1], context)
+
+    def count(self, name: str, n: float = 1, url: Optional[str] = None, **tags: Any) -> None:
+        """Add `n` to counter `name`."""
+        key = (name, _labels(url, tags))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+            reports = list(self._reports)
+        for report in reports:
+            report.count(name, n, key[1])
+
+    @contextmanager
+    def timed(self, stage: str, url: Optional[str] = None, **tags: Any) -> Iterator[None]:
+        """Time the block as `stage`; exceptions (but cancels) are counted under "errors" and re-raised."""
+        start = time.perf_counter()
+        try:
+            yield
+        except ScrapeCancelled:
+            raise
+        except Exception as e:
+            self.count("errors", url=url, stage=stage, error=type(e).__name__, **tags)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, url, **tags)
+
+    # ——— Reports ———
+    def start_report(self, label: str) -> "SearchReport":
+        """Collect everything recorded from now on (by any thread) until `finish()`."""
+        report = SearchReport(self, label)
+        with self._lock:
+            self._reports.append(report)
+        return report
+
+    def _end_report(self, report: "SearchReport") -> None:
+        with self._lock:
+            if report in self._reports:
+                self._reports.remove(report)
+
+    # ——— Export ———
+    def to_dict(self) -> Dict[str, Any]:
+        """Every timer and counter, JSON-ready."""
+        with self._lock:
+            timers = [
+                {"stage": stage, "labels": dict(labels), "count": t.count, "total": t.total, "max": t.max,
+                 "p50": t.quantile(0.5), "p95": t.quantile(0.95), "buckets": list(t.buckets)}
+                for (stage, labels), t in sorted(self._timers.items())
+            ]
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {"started": self.started, "written": time.time(), "bucket_bounds": list(BUCKETS),
+                "timers": timers, "counters": counters}
+
+    def write_json(self, path: str) -> None:
+        """Write `to_dict()` to `path` atomically."""
+        tmp_path = f"{path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(tmp_path, path)
+
+    def prometheus_text(self) -> str:
+        """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [f"# HELP {name} Time spent per scrape stage.", f"# TYPE {name} histogram"]
+        with self._lock:
+            timers = sorted(self._timers.items())
+            counters = sorted(self._counters.items())
+        for (stage, labels), timer in timers:
+            base = (("stage", stage),) + labels
+            cumulative = 0
+            for bound, n in zip(BUCKETS, timer.buckets):
+                cumulative += n
+                lines.append(f"{name}_bucket{_format_labels(base + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(base + (('le', '+Inf'),))} {timer.count}")
+            lines.append(f"{name}_sum{_format_labels(base)} {timer.total!r}")
+            lines.append(f"{name}_count{_format_labels(base)} {timer.count}")
+
+        declared = set()
+        for (counter, labels), value in counters:
+            metric = f"{METRIC_PREFIX}_{counter}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop every metric (reports keep what they already collected)."""
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class SearchReport:
+    """
+    Metrics of one search: every timing by stage (for exact percentiles), by stage
+    and host, and by area tag, plus the counters. Everything recorded while the
+    report is open counts, so a background refresh running at the same time would too.
+    """
+
+    def __init__(self, metrics: Metrics, label: str) -> None:
+        self.metrics = metrics
+        self.label = label
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.durations: Dict[str, List[float]] = {}
+        self.by_host: Dict[Tuple[str, str], List[float]] = {}    # (stage, host) -> [count, total]
+        self.by_area: Dict[str, float] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, labels: Labels, context: Dict[str, str]) -> None:
+        host = dict(labels).get("host", "")
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+            if host:
+                entry = self.by_host.setdefault((stage, host), [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+            area = context.get("area")
+            # Slot waits overlap the work they wait for, so they aren't charged to areas
+            if area and not stage.endswith("_wait"):
+                self.by_area[area] = self.by_area.get(area, 0.0) + seconds
+
+    def count(self, name: str, n: float, labels: Labels) -> None:
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + n
+
+    def finish(self) -> str:
+        """Stop collecting; returns the summary."""
+        if self.end is None:
+            self.end = time.perf_counter()
+            self.metrics._end_report(self)
+        return self.summary()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                stage: {"count": len(d), "total": sum(d), "p50": _percentile(d, 0.5),
+                        "p95": _percentile(d, 0.95), "max": max(d)}
+                for stage, d in self.durations.items()
+            }
+            hosts = [{"stage": s, "host": h, "count": c, "total": t} for (s, h), (c, t) in self.by_host.items()]
+            areas = dict(self.by_area)
+            counters = [{"name": n, "labels": dict(l), "value": v} for (n, l), v in self.counters.items()]
+        return {"label": self.label, "wall": self.wall(), "stages": stages, "hosts": hosts,
+                "areas": areas, "counters": counters}
+
+    def wall(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def summary(self) -> str:
+        """Plain-text table of the search's stages, hosts, slowest areas and counters."""
+        data = self.to_dict()
+        lines = [f"{self.label}: {data['wall']:.1f} s wall (stage totals add up across threads)"]
+        if data["stages"]:
+            lines.append(f"  {'stage':<14}{'calls':>7}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+            for stage, s in sorted(data["stages"].items(), key=lambda item: -item[1]["total"]):
+                lines.append(
+                    f"  {stage:<14}{s['count']:>7}{s['total']:>10.2f}"
+                    f"{s['p50'] * 1000:>10.0f}{s['p95'] * 1000:>10.0f}{s['max'] * 1000:>10.0f}"
+                )
+        for host in sorted({h["host"] for h in data["hosts"]}):
+            parts = [f"{h['stage']} {h['count']}x {h['total']:.1f} s" for h in data["hosts"] if h["host"] == host]
+            lines.append(f"  {host}: " + ", ".join(parts))
+        if data["areas"]:
+            slowest = sorted(data["areas"].items(), key=lambda item: -item[1])[:REPORT_TOP_AREAS]
+            lines.append("  slowest areas: " + ", ".join(f"{name} {seconds:.1f} s" for name, seconds in slowest))
+        if data["counters"]:
+            lines.append("  counters: " + ", ".join(
+                f"{c['name']}{_format_labels(tuple(sorted(c['labels'].items())))} {c['value']:g}"
+                for c in sorted(data["counters"], key=lambda c: (c["name"], sorted(c["labels"].items())))
+            ))
+        return "\n".join(lines)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+# Registry shared by the whole process, with module-level shortcuts for call sites
+METRICS = Metrics()
+timed = METRICS.timed
+observe = METRICS.observe
+count = METRICS.count
+
+
+def write_metrics_file(path: Optional[str] = METRICS_FILE) -> None:
+    """Write every metric to `path` (default $CLIMBING_METRICS_FILE), if one is set."""
+    if not path:
+        return
+    try:
+        METRICS.write_json(path)
+        logger.info("Metrics written to %s", path)
+    except OSError as e:
+        logger.warning("Couldn't write metrics to %s: %s", path, e)
@@ -3,6 +3,7 @@ import logging
 from typing import Optional
 import PySimpleGUI as sg
 
+from Controller.instrumentation import write_metrics_file
 from Controller.search_tab import SearchTab
 from Controller.save_tab import SaveTab
 from Model.database import Database
@@ -102,9 +103,21 @@ class Controller:
         """
         Perform final cleanup when exiting the application.
         """
+        # Snapshot the results first so the next start reopens them
+        self.search_tab.autosave()
+        for tab in (self.search_tab, self.save_tab):
+            tab.weather.shutdown()
+        self.search_tab.details.shutdown()
+        self.search_tab.refresher.stop()
+        self.search_tab.result_queue.close()
+        if self.search_tab.scheduler:
+            # Quit any open Chrome sessions before the process exits
+            self.search_tab.scheduler.cancel(timeout=5, wait=True)
         try:
             self.db.close()
         except Exception as e:
             logging.warning("Error closing database during cleanup: %s", e)
+        self.search_tab.warm.close()
+        write_metrics_file()
         logging.info("Cleanup complete. Application terminated.")
 
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.Caculations.distance_caculator import distance_miles
+from Controller.Caculations.weather_cache import FORECAST_CACHE, WeatherCache
+from Controller.scrape_scheduler import MAX_WORKERS
+from Controller.search_pipeline import scrape_area_worker
+from Model.climb import Climb
+from Model.climbing_area import ClimbingArea
+from Model.database import Database, RecordNotFound
+from Model.warm_store import WarmStore
+
+# ——— Module-level configuration ———
+AREA_CACHE_SIZE = 256      # scraped areas kept in memory, least recently used dropped first
+AREA_TTL_SECONDS = 6 * 60 * 60    # scraped areas are re-scraped after this long
+
+logger = logging.getLogger(__name__)
+
+
+def area_summary(area: ClimbingArea) -> Dict[str, Any]:
+    """Fields of an area listed by the search endpoints."""
+    return {
+        "aid": area.aid, "name": area.name, "state": area.state,
+        "lat": area.lat, "lon": area.long, "distance": area.distance, "link": area.mt_proj_link,
+    }
+
+
+def climb_summary(climb: Climb, index: int) -> Dict[str, Any]:
+    """Route-table fields of a climb, as listed with its area."""
+    return {
+        "index": index, "name": climb.name, "type": climb.type, "grade": climb.mp_grade,
+        "stars": climb.mp_stars, "num_stars": climb.num_mp_stars, "link": climb.mp_link,
+        "details_loaded": climb.details_loaded, "vl_loaded": climb.vl_loaded,
+    }
+
+
+def climb_details(climb: Climb) -> Dict[str, Any]:
+    """Every field of a climb; photos as their source links."""
+    data = climb.to_dict()
+    data["mp_photos"] = [link for link, _ in data["mp_photos"]]
+    data["vl_photos"] = [link for link, _ in data["vl_photos"]]
+    return data
+
+
+class QueryService:
+    """
+    Async front for the database, the scrapers and the weather cache, shared by every
+    client of one process (see api_server.py).
+
+    - The MySQL connection isn't thread-safe, so every query runs on one DB thread.
+    - Scrapes run on a thread pool. Areas are cached for AREA_TTL_SECONDS, and climb
+      details are filled into the cached Climb objects, so they load only once.
+    - Identical requests that arrive while one is running share its result instead
+      of scraping again.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        scrape_workers: int = MAX_WORKERS,
+        weather: WeatherCache = FORECAST_CACHE,
+        vertical_life: bool = False,
+        warm: Optional[WarmStore] = None
+    ) -> None:
+        """
+        Args:
+            db:             Connected Database instance.
+            scrape_workers: Threads scraping Mountain Project at the same time.
+            weather:        Forecast cache to read and fill.
+            vertical_life:  Also look climbs up on Vertical-Life when their details are requested.
+            warm:           Optional warm store: requested areas count toward its popularity,
+                            and its fresh copies are served instead of scraping.
+        """
+        self.db = db
+        self.forecasts = weather
+        self.vertical_life = vertical_life
+        self.warm = warm
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-db")
+        self._scrape_executor = ThreadPoolExecutor(max_workers=scrape_workers, thread_name_prefix="api-scrape")
+        # VL lookups share one logged-in browser, so they run one at a time
+        self._vl_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-vl")
+        self._vl_session = None
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        # AID -> (scraped at, area)
+        self._areas: "OrderedDict[int, Tuple[float, ClimbingArea]]" = OrderedDict()
+        self._areas_lock = threading.Lock()
+
+    # ——— Plumbing ———
+    async def _run(self, executor: Executor, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def _shared(self, key: Hashable, make: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `make()` once for concurrent callers with the same key; everyone gets its result
+        (or its exception).
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await make()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved for the case where no other caller was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def _db(self, fn: Callable, *args) -> Awaitable[Any]:
+        return self._run(self._db_executor, fn, *args)
+
+    # ——— Areas ———
+    async def search(
+        self, lat: float, lon: float, radius: float, climb_filter: Optional[ClimbFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """Areas within `radius` miles, nearest first."""
+        areas = await self._db(self.db.search_db_for_areas, lat, lon, radius, climb_filter)
+        for area in areas:
+            area.distance = distance_miles(lat, lon, area.lat, area.long)
+        # The bounding-box query also returns the corners outside the circle
+        areas = sorted((a for a in areas if a.distance <= radius), key=lambda a: a.distance)
+        return [area_summary(area) for area in areas]
+
+    async def nearest(self, lat: float, lon: float, k: int) -> List[Dict[str, Any]]:
+        """The `k` nearest areas."""
+        areas = await self._db(self.db.nearest_areas, lat, lon, k)
+        return [area_summary(area) for area in areas]
+
+    def cached_area(self, aid: int) -> Optional[ClimbingArea]:
+        """A scraped area still within its TTL, or None."""
+        with self._areas_lock:
+            entry = self._areas.get(aid)
+            if entry is None or time.time() - entry[0] > AREA_TTL_SECONDS:
+                return None
+            self._areas.move_to_end(aid)
+            return entry[1]
+
+    def store_area(self, area: ClimbingArea, scraped_at: Optional[float] = None) -> None:
+        """Put an area in the cache, evicting the least recently used beyond AREA_CACHE_SIZE."""
+        with self._areas_lock:
+            self._areas[area.aid] = (time.time() if scraped_at is None else scraped_at, area)
+            self._areas.move_to_end(area.aid)
+            while len(self._areas) > AREA_CACHE_SIZE:
+                self._areas.popitem(last=False)
+
+    async def area(self, aid: int) -> ClimbingArea:
+        """
+        An area with its climbs listed. Catalogued areas are read from the route catalog;
+        others get their area pages and route table scraped. Climb details are loaded
+        separately by `climb`.
+        """
+        area = self.cached_area(aid)
+        if area is not None:
+            return area
+        return await self._shared(("area", aid), lambda: self._load_area(aid))
+
+    async def _load_area(self, aid: int) -> ClimbingArea:
+        if self.warm is not None:
+            stored = self.warm.fresh_areas([aid]).get(aid)
+            if stored is not None:
+                self.store_area(stored[0], stored[1])
+                return stored[0]
+        area = await self._db(self.db.get_area, aid)
+        catalog = await self._db(self.db.get_routes_for_areas, [aid])
+        if aid in catalog:
+            area.climbs = catalog[aid]
+        else:
+            # Only the area pages and route table; details load per climb
+            await self._run(self._scrape_executor, lambda: scrape_area_worker(area, None, None, lazy=True))
+        self.store_area(area)
+        return area
+
+    async def area_climbs(self, aid: int) -> Dict[str, Any]:
+        """An area's fields, descriptions, comments and climb list."""
+        area = await self.area(aid)
+        if self.warm is not None:
+            self.warm.record_hits([area])
+        return {
+            **area_summary(area),
+            "descriptions": list(area.mp_descriptions),
+            "comments": list(area.mp_area_comments),
+            "climbs": [climb_summary(climb, i) for i, climb in enumerate(area.climbs)],
+        }
+
+    # ——— Climbs ———
+    async def climb(self, aid: int, index: int) -> Dict[str, Any]:
+        """
+        Every field of one climb of an area, loading its MP detail page (and its area's
+        descriptions and comments) the first time, plus its VL stats if enabled.
+        """
+        area = await self.area(aid)
+        if not 0 <= index < len(area.climbs):
+            raise RecordNotFound(f"Area {aid} has no climb {index}")
+        climb = area.climbs[index]
+        if not climb.details_loaded and climb.mp_link:
+            # Shared per area, so concurrent climb requests don't append its pages twice
+            if not area.details_loaded:
+                await self._shared(("area-details", aid), lambda: self._run(
+                    self._scrape_executor, self._load_area_details, area
+                ))
+            await self._shared(("mp", aid, index), lambda: self._run(
+                self._scrape_executor, self._load_mp, climb
+            ))
+        if self.vertical_life and not climb.vl_loaded and climb.name:
+            await self._shared(("vl", aid, index), lambda: self._run(self._vl_executor, self._load_vl, climb))
+        return {"area": area_summary(area), **climb_details(climb)}
+
+    def _load_area_details(self, area: ClimbingArea) -> None:
+        # Scrapers pull in BeautifulSoup, so they load on first use
+        from Controller.Scrapers.mt_proj_scraper import load_area_details
+
+        if not area.details_loaded:
+            load_area_details(area)
+
+    def _load_mp(self, climb: Climb) -> None:
+        from Controller.Scrapers.mt_proj_scraper import load_climb_details
+
+        if not climb.details_loaded:
+            load_climb_details(climb)
+
+    def _load_vl(self, climb: Climb) -> None:
+        # Selenium is a slow import, so it loads with the first lookup
+        from Controller.Scrapers.v_life_scraper import VerticalLifeSession
+
+        if self._vl_session is None:
+            self._vl_session = VerticalLifeSession()
+        self._vl_session.scrape_climb(climb)
+
+    # ——— Saved climbs and weather ———
+    async def saved(self) -> List[str]:
+        """Saved climb labels, as listed in the Save tab."""
+        return await self._db(self.db.get_all_saved_climb_names)
+
+    async def saved_climb(self, cid: int) -> Dict[str, Any]:
+        """One saved climb and its area."""
+        area, climb = await self._db(self.db.gather_climb_info, cid)
+        return {
+            "area": {
+                **area_summary(area),
+                "descriptions": list(area.mp_descriptions),
+                "comments": list(area.mp_area_comments),
+            },
+            **climb_details(climb),
+        }
+
+    async def weather(self, lat: float, lon: float) -> Dict[str, Any]:
+        """The 10-day forecast for a point; points in one grid cell share a request."""
+        text = self.forecasts.peek(lat, lon)
+        if text is None:
+            text = await self._shared(
+                ("weather", self.forecasts.bucket(lat, lon)),
+                lambda: self._run(self._scrape_executor, self.forecasts.get, lat, lon)
+            )
+        return {"lat": lat, "lon": lon, "forecast": text}
+
+    def close(self) -> None:
+        """Stop the worker pools and quit the VL browser."""
+        for executor in (self._db_executor, self._scrape_executor, self._vl_executor):
+            executor.shutdown(wait=False, cancel_futures=True)
+        if self._vl_session is not None:
+            self._vl_session.close()
@@ -0,0 +1,264 @@
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.Caculations.distance_caculator import distance_miles
+from Controller.Scrapers.cancellation import CancelToken, ScrapeCancelled
+from Controller.search_pipeline import scrape_area_worker
+from Model.climb import Climb
+from Model.climbing_area import ClimbingArea
+from Model.database import Database
+from Model.work_queue import DEAD, LEASE_SECONDS, Task, WorkQueue
+
+# ——— Module-level configuration ———
+# Task kinds:
+#   area    - scrape one area for a search (MP pages, climb details, VL); result is ClimbingArea.to_dict()
+#   mp_area - read one area page of a state crawl (name, coordinates, route table); result feeds the database
+AREA_TASK = "area"
+CRAWL_TASK = "mp_area"
+IDLE_POLL_SECONDS = 2.0        # how often an idle worker asks for work
+AREA_RESULT_MAX_AGE = 24 * 60 * 60  # scraped areas older than this are scraped again by the next search
+RESULT_POLL_SECONDS = 1.0      # how often a collector checks for finished tasks
+
+logger = logging.getLogger(__name__)
+
+
+def worker_name() -> str:
+    """host:pid, so leases show which process on which machine holds them."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ——— Handlers (run by workers) ———
+def handle_area(payload: Dict[str, Any], cancel: CancelToken) -> Dict[str, Any]:
+    """
+    Scrape an area without a climb filter: the task is shared by every search
+    that includes the area's URL, so the result has to serve any of them.
+    """
+    area = ClimbingArea.from_dict(payload["area"])
+    scrape_area_worker(area, cancel, None, lazy=payload.get("lazy", False),
+                       vertical_life=payload.get("vertical_life", True))
+    return area.to_dict()
+
+
+def handle_crawl_area(payload: Dict[str, Any], cancel: CancelToken) -> Optional[Dict[str, Any]]:
+    """Parse one area page of a state crawl; None if the page lists no routes."""
+    from Controller.Scrapers.database_initialization import parse_area
+
+    cancel.raise_if_cancelled()
+    parsed = parse_area(payload["path"])
+    if parsed is None:
+        return None
+    name, lat, lng, url, routes = parsed
+    return {
+        "name": name, "lat": lat, "lng": lng, "url": url,
+        "routes": None if routes is None else [climb.to_dict() for climb in routes],
+    }
+
+
+HANDLERS: Dict[str, Callable[[Dict[str, Any], CancelToken], Any]] = {
+    AREA_TASK: handle_area,
+    CRAWL_TASK: handle_crawl_area,
+}
+
+
+class QueueWorker:
+    """
+    Leases tasks from a WorkQueue and runs their handler until stopped (or, with
+    `drain`, until the queue has nothing ready). While a task runs, a heartbeat thread
+    extends its lease; if the lease is lost anyway, the task is cancelled, since
+    another worker owns it now.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        kinds: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        lease_seconds: float = LEASE_SECONDS,
+        handlers: Optional[Dict[str, Callable[[Dict[str, Any], CancelToken], Any]]] = None
+    ) -> None:
+        """
+        Args:
+            queue:         Broker to lease from.
+            kinds:         Task kinds to take (default every kind with a handler).
+            name:          Worker name recorded on leases (default host:pid).
+            lease_seconds: Lease length; the heartbeat extends it every third of that.
+            handlers:      Task kind -> handler(payload, cancel) returning the JSON-ready result.
+        """
+        self.queue = queue
+        self.handlers = handlers or HANDLERS
+        self.kinds = kinds or list(self.handlers)
+        self.name = name or worker_name()
+        self.lease_seconds = lease_seconds
+        self.cancel_token = CancelToken()
+        self.done = 0
+        self.failed = 0
+
+    def run(self, drain: bool = False) -> None:
+        """Work until `stop()` is called, or until nothing is ready with `drain`."""
+        logger.info("Worker %s taking %s", self.name, ", ".join(self.kinds))
+        while not self.cancel_token.cancelled:
+            task = self.queue.lease(self.name, self.kinds, self.lease_seconds)
+            if task is None:
+                if drain:
+                    return
+                try:
+                    self.cancel_token.wait(IDLE_POLL_SECONDS)
+                except ScrapeCancelled:
+                    return
+                continue
+            self.run_task(task)
+
+    def run_task(self, task: Task) -> None:
+        """Run one leased task and report its outcome to the broker."""
+        # Per-task token: cancelled by stop() or by losing the lease
+        cancel = CancelToken()
+        stop_task = self.cancel_token.on_cancel(cancel.cancel)
+        heartbeat_done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(task, cancel, heartbeat_done), name=f"lease-{task.id}", daemon=True
+        )
+        heartbeat.start()
+        logger.info("Task %d (%s, attempt %d): %s", task.id, task.kind, task.attempts, task.url)
+        try:
+            result = self.handlers[task.kind](task.payload, cancel)
+        except ScrapeCancelled:
+            if self.cancel_token.cancelled:
+                self.queue.release(task)
+                logger.info("Task %d given back", task.id)
+            else:
+                logger.warning("Task %d lost its lease", task.id)
+        except Exception as e:
+            logger.exception("Task %d failed", task.id)
+            self.failed += 1
+            self.queue.fail(task, f"{type(e).__name__}: {e}")
+        else:
+            self.done += 1
+            if not self.queue.complete(task, result):
+                logger.warning("Task %d finished after losing its lease; result dropped", task.id)
+        finally:
+            heartbeat_done.set()
+            heartbeat.join()
+            self.cancel_token.remove_callback(stop_task)
+
+    def _heartbeat(self, task: Task, cancel: CancelToken, done: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            if not self.queue.extend(task, self.lease_seconds):
+                cancel.cancel()
+                return
+
+    def stop(self) -> None:
+        """Cancel the running task (its lease is given back) and end `run`."""
+        self.cancel_token.cancel()
+
+
+# ——— Producers and collectors ———
+def enqueue_search(
+    queue: WorkQueue,
+    areas: List[ClimbingArea],
+    origin: Tuple[float, float],
+    lazy: bool = False,
+    vertical_life: bool = True
+) -> int:
+    """
+    Queue an area task per area, nearest first. Areas already queued, or scraped in the
+    same mode within AREA_RESULT_MAX_AGE by an earlier search, are not queued again.
+
+    Returns:
+        Number of new tasks.
+    """
+    tasks = []
+    for area in areas:
+        area.distance = distance_miles(origin[0], origin[1], area.lat, area.long)
+        basic = {field: getattr(area, field) for field in ("aid", "state", "name", "lat", "long", "mt_proj_link")}
+        tasks.append((AREA_TASK, area_task_key(area, lazy, vertical_life),
+                      {"area": basic, "lazy": lazy, "vertical_life": vertical_life}, area.distance))
+    return queue.put_many(tasks, max_age=AREA_RESULT_MAX_AGE)
+
+
+def area_task_key(area: ClimbingArea, lazy: bool, vertical_life: bool) -> str:
+    """
+    Deduplication key of an area task: its MP link plus the scrape mode, so a
+    route-table-only or no-VL result is never handed to a search that wants more.
+    """
+    return f"{area.mt_proj_link}#lazy={int(lazy)}&vl={int(vertical_life)}"
+
+
+def collect_search(
+    queue: WorkQueue,
+    areas: List[ClimbingArea],
+    climb_filter: Optional[ClimbFilter],
+    lazy: bool = False,
+    vertical_life: bool = True,
+    timeout: Optional[float] = None,
+    cancel: Optional[CancelToken] = None
+) -> Iterator[Optional[ClimbingArea]]:
+    """
+    Yield each area of a search as its task finishes: the scraped copy with this
+    search's distance and filtered climbs, or None for a dead task.
+    `lazy` and `vertical_life` must match the ones given to enqueue_search.
+    Stops early after `timeout` seconds without a new result.
+    """
+    by_url = {area_task_key(area, lazy, vertical_life): area for area in areas}
+    waiting = set(by_url)
+    last_result = time.monotonic()
+    while waiting:
+        for url, task in queue.finished(list(waiting)).items():
+            waiting.discard(url)
+            last_result = time.monotonic()
+            if task.status == DEAD:
+                logger.warning("Area %s failed: %s", url, task.error)
+                yield None
+                continue
+            area = ClimbingArea.from_dict(task.result)
+            area.distance = by_url[url].distance
+            if climb_filter is not None:
+                area.climbs = [c for c in area.climbs if climb_filter.accepts(c.mp_grade, c.type)]
+            yield area
+        if not waiting:
+            return
+        if timeout is not None and time.monotonic() - last_result > timeout:
+            logger.warning("No results for %.0f s; %d areas still queued", timeout, len(waiting))
+            return
+        if cancel is not None:
+            cancel.wait(RESULT_POLL_SECONDS)
+        else:
+            time.sleep(RESULT_POLL_SECONDS)
+
+
+def enqueue_crawl(queue: WorkQueue, state: str, paths: List[str]) -> int:
+    """Queue the area links of one state found by the crawl's search pages."""
+    from Controller.Scrapers.database_initialization import area_url
+
+    return queue.put_many((CRAWL_TASK, area_url(path), {"state": state, "path": path}, 0) for path in paths)
+
+
+def collect_crawl(queue: WorkQueue, db: Database, next_aid: int, catalog: bool = False) -> int:
+    """
+    Insert every finished crawl task not collected yet, numbering areas from
+    `next_aid` like DatabaseInitializationScraper does.
+
+    Returns:
+        The next free AID.
+    """
+    from Controller.Scrapers.database_initialization import store_area
+
+    while True:
+        tasks = queue.take_results(CRAWL_TASK)
+        if not tasks:
+            return next_aid
+        for task in tasks:
+            if task.status == DEAD:
+                logger.warning("Area %s failed: %s", task.url, task.error)
+                continue
+            if task.result is None:
+                continue
+            data = task.result
+            routes = None if data["routes"] is None else [Climb.from_dict(c) for c in data["routes"]]
+            store_area(db, next_aid, task.payload["state"],
+                       (data["name"], data["lat"], data["lng"], data["url"], routes), catalog)
+            next_aid += 1
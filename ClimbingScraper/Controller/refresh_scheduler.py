@@ -0,0 +1,149 @@
+import datetime
+import logging
+import threading
+import time
+from typing import Callable, Optional, Sequence
+
+from Controller.Scrapers.cancellation import CancelToken, ScrapeCancelled
+from Controller.Scrapers.rate_limits import budgeted
+from Controller.search_pipeline import scrape_area_worker
+from Model.photo import links_only
+from Model.warm_store import FRESH_SECONDS, WarmStore
+
+# ——— Module-level configuration ———
+TOP_N = 25                         # most popular areas kept warm
+REFRESH_INTERVAL = 60 * 60         # seconds between refresh passes (when no hours are given)
+REFRESH_HOURS: Sequence[int] = ()  # cron-like: local hours to run at, e.g. (3, 15); overrides the interval
+IDLE_POLL_SECONDS = 5              # how often a paused refresh checks whether the app is idle again
+STARTUP_DELAY = 60                 # seconds before the first pass, so startup isn't slowed down
+STOP_TIMEOUT = 10                  # seconds stop() waits for a running pass to notice the cancel
+
+logger = logging.getLogger(__name__)
+
+
+def next_run(now: float, interval: float = REFRESH_INTERVAL, hours: Sequence[int] = REFRESH_HOURS) -> float:
+    """
+    Time of the next refresh pass after `now`: the next full hour listed in `hours`,
+    or `now + interval` if no hours are given.
+    """
+    if not hours:
+        return now + interval
+    start = datetime.datetime.fromtimestamp(now).replace(minute=0, second=0, microsecond=0)
+    for step in range(1, 24 * 2 + 1):
+        candidate = start + datetime.timedelta(hours=step)
+        if candidate.hour in hours:
+            return candidate.timestamp()
+    return now + interval
+
+
+class RefreshScheduler:
+    """
+    Keeps the most popular areas (by WarmStore score) freshly scraped in the background,
+    so searches that hit them are served from the store instead of a live scrape.
+
+    Each pass takes the top `top_n` areas whose stored scrape is older than `max_age`
+    and scrapes them one at a time, with every request held to the per-host budgets
+    of rate_limits. Photos keep their links only; searches served from the store
+    download them. While `idle()` is False (a search is running), the pass pauses.
+    """
+
+    def __init__(
+        self,
+        store: WarmStore,
+        idle: Callable[[], bool] = lambda: True,
+        top_n: int = TOP_N,
+        max_age: float = FRESH_SECONDS,
+        interval: float = REFRESH_INTERVAL,
+        hours: Sequence[int] = REFRESH_HOURS,
+        vertical_life: bool = False
+    ) -> None:
+        """
+        Args:
+            store:         Warm store to read popularity from and write scrapes to.
+            idle:          Returns True when the app isn't busy with a search of its own.
+            top_n:         Number of popular areas kept warm.
+            max_age:       Seconds after which a stored scrape is refreshed.
+            interval:      Seconds between passes.
+            hours:         Local hours to run at instead of every `interval`.
+            vertical_life: Also look climbs up on Vertical-Life (opens a browser per area).
+        """
+        self.store = store
+        self.idle = idle
+        self.top_n = top_n
+        self.max_age = max_age
+        self.interval = interval
+        self.hours = hours
+        self.vertical_life = vertical_life
+        self.cancel_token = CancelToken()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, delay: float = STARTUP_DELAY) -> None:
+        """Run passes on a daemon thread, the first one after `delay` seconds."""
+        self._thread = threading.Thread(target=self._loop, args=(delay,), name="refresh", daemon=True)
+        self._thread.start()
+
+    def run_now(self) -> None:
+        """Start the next pass without waiting for the schedule."""
+        self._wake.set()
+
+    def _loop(self, delay: float) -> None:
+        due = time.time() + delay
+        while not self.cancel_token.cancelled:
+            self._wake.wait(max(due - time.time(), 0))
+            self._wake.clear()
+            if self.cancel_token.cancelled:
+                return
+            try:
+                self.refresh_once()
+            except ScrapeCancelled:
+                return
+            except Exception:
+                logger.exception("Refresh pass failed")
+            due = next_run(time.time(), self.interval, self.hours)
+
+    def refresh_once(self) -> int:
+        """
+        One pass over the stale popular areas.
+
+        Returns:
+            Number of areas refreshed.
+        """
+        areas = self.store.stale_top(self.top_n, self.max_age)
+        if not areas:
+            return 0
+        logger.info("Refreshing %d popular areas", len(areas))
+        refreshed = 0
+        for area in areas:
+            self._wait_until_idle()
+            try:
+                # No filter: the stored copy has to serve any search.
+                # Photos are downloaded when a search serves the area, not here
+                with budgeted(), links_only():
+                    scrape_area_worker(area, self.cancel_token, None, lazy=False, vertical_life=self.vertical_life)
+            except ScrapeCancelled:
+                raise
+            except Exception:
+                logger.exception("Refreshing area %r failed", area.name)
+                continue
+            self.store.put_area(area, self.vertical_life)
+            refreshed += 1
+        logger.info("Refreshed %d/%d popular areas", refreshed, len(areas))
+        return refreshed
+
+    def _wait_until_idle(self) -> None:
+        while not self.idle():
+            self.cancel_token.wait(IDLE_POLL_SECONDS)
+        self.cancel_token.raise_if_cancelled()
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Cancel the running pass and wait up to `timeout` seconds for the thread to end,
+        so the store can be closed after this returns.
+        """
+        self.cancel_token.cancel()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("Refresh thread still running after %.0f s", timeout)
@@ -1,8 +1,9 @@
 import logging
+from pathlib import Path
 from typing import Any, Optional, List, Dict
 import PySimpleGUI as sg
 
-from Controller.tab import Tab
+from Controller.tab import Tab, WEATHER_READY
 from View.app_gui import View
 from View.photo_viewer import create_photo_window, update_photo
 from Model.database import Database
@@ -29,7 +30,7 @@ class SaveTab(Tab):
         """
         super().__init__(view, db)
         self.current_climb: Optional[Climb] = None
-        self.images: Optional[List[str]] = None
+        self.images: Optional[List[Path]] = None
         self.image_ind: int = 0
         self.displayed_image_window: Optional[sg.Window] = None
         self.displayed_image: Optional[Any] = None
@@ -46,8 +47,16 @@ class SaveTab(Tab):
         Returns:
             bool: True if the event was handled here; False otherwise.
         """
+        # Background weather fetch finished
+        if event == f"{self.TAB_NUM}:{WEATHER_READY}":
+            return self.handle_weather_ready(values[event])
+
+        # Page buttons under the description/comment panels
+        if self.handle_page_event(event):
+            return True
+
         # Load saved climbs into the dropdown/list
-        if event == f"{self.TAB_NUM}:Load_DB":
+        elif event == f"{self.TAB_NUM}:Load_DB":
             climb_names = self.db.get_all_saved_climb_names()
             self.view.update_saved_climbs(climb_names)
             return True
@@ -65,13 +74,12 @@ class SaveTab(Tab):
         # Open photo viewer for current climb
         elif event == f"{self.TAB_NUM}:PHOTO_OPEN":
             self.load_images(self.current_climb)
-            if not self.images:
+            self.image_ind = 0
+            image = self.current_image()
+            if image is None:
                 self.view.show_popup("No images")
                 return True
-            self.image_ind = 0
-            self.displayed_image_window, self.displayed_image = create_photo_window(
-                self.images[self.image_ind]
-            )
+            self.displayed_image_window, self.displayed_image = create_photo_window(image)
             return True
 
         # Navigate to next photo
@@ -100,7 +108,7 @@ class SaveTab(Tab):
         """
 
         self.image_ind = (self.image_ind + 1) % len(self.images)  # type: ignore
-        update_photo(self.displayed_image, self.images[self.image_ind])
+        update_photo(self.displayed_image, self.current_image())
         logging.debug("Displayed next photo index=%d", self.image_ind)
 
     def _prev_photo(self) -> None:
@@ -108,5 +116,5 @@ class SaveTab(Tab):
         Move to the previous image in the slideshow and update the display.
         """
         self.image_ind = (self.image_ind - 1) % len(self.images)  # type: ignore
-        update_photo(self.displayed_image, self.images[self.image_ind])
+        update_photo(self.displayed_image, self.current_image())
         logging.debug("Displayed previous photo index=%d", self.image_ind)
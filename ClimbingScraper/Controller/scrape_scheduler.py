@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import logging
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from Controller.Caculations.distance_caculator import distance_miles
+from Controller.Scrapers.cancellation import CancelToken, ScrapeCancelled
+from Model.climbing_area import ClimbingArea
+
+# ——— Module-level configuration ———
+MAX_WORKERS = 4            # areas scraped at the same time
+MAX_PENDING_RESULTS = 8    # scraped-or-in-progress areas the GUI hasn't consumed yet
+CANCEL_TIMEOUT = 20        # seconds to wait for workers to release drivers after a cancel
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeScheduler:
+    """
+    Scrapes the areas of one search with a fixed pool of worker threads.
+    Areas are queued by distance from the search point, so the nearest results
+    arrive first. Per-stage concurrency (MP requests, VL browsers, photo downloads)
+    is capped separately by Controller.Scrapers.stage_limits.
+
+    Backpressure: a worker only starts a new area while fewer than `max_pending`
+    results are waiting to be consumed; the GUI calls `result_consumed()` for each one.
+
+    Cancellation: every area is scraped with the scheduler's CancelToken; `cancel()`
+    stops the queue and interrupts in-flight requests, drivers and downloads.
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[float, float],
+        work: Callable[[ClimbingArea, CancelToken], ClimbingArea],
+        on_result: Callable[["ScrapeScheduler", Optional[ClimbingArea]], None],
+        max_workers: int = MAX_WORKERS,
+        max_pending: int = MAX_PENDING_RESULTS
+    ) -> None:
+        """
+        Args:
+            origin:      (latitude, longitude) of the search point.
+            work:        Function that scrapes one area in place, honoring the cancel token.
+            on_result:   Called on a worker thread with (scheduler, area) when an area finishes,
+                         or (scheduler, None) when it failed.
+            max_workers: Size of the worker pool.
+            max_pending: Results allowed in flight before workers wait for the consumer.
+        """
+        self.origin = origin
+        self.work = work
+        self.on_result = on_result
+        self.max_workers = max_workers
+        self._heap: List[Tuple[float, int, ClimbingArea]] = []
+        self._counter = itertools.count()   # tie-breaker so areas never get compared
+        self._lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.cancel_token = CancelToken()
+
+    def submit(self, areas: List[ClimbingArea]) -> None:
+        """
+        Queue areas by distance from the origin and start the worker pool.
+        Sets `area.distance` on each area.
+        """
+        lat, lon = self.origin
+        with self._lock:
+            for area in areas:
+                area.distance = distance_miles(lat, lon, area.lat, area.long)
+                heapq.heappush(self._heap, (area.distance, next(self._counter), area))
+
+        for i in range(min(self.max_workers, len(areas))):
+            t = threading.Thread(target=self._worker_loop, name=f"scrape-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info("Scheduled %d areas on %d workers", len(areas), len(self._threads))
+
+    def _next_area(self) -> Optional[ClimbingArea]:
+        """Pop the nearest queued area, or None when the queue is empty."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return heapq.heappop(self._heap)[2]
+
+    def _worker_loop(self) -> None:
+        """Worker: scrape nearest-first until the queue is empty or the scheduler stops."""
+        while not self._stopped.is_set():
+            # Wait for the consumer to catch up before starting more work
+            self._pending.acquire()
+            area = None if self._stopped.is_set() else self._next_area()
+            if area is None:
+                self.result_consumed()
+                return
+            try:
+                self.work(area, self.cancel_token)
+                result: Optional[ClimbingArea] = area
+            except ScrapeCancelled:
+                logger.info("Scrape of %r cancelled", area.name)
+                self.result_consumed()
+                return
+            except Exception:
+                if self.cancel_token.cancelled:
+                    self.result_consumed()
+                    return
+                logger.exception("Scraping failed for area %r", area.name)
+                result = None
+            self.on_result(self, result)
+
+    def result_consumed(self) -> None:
+        """Called by the consumer once it has taken a result, freeing a pending slot."""
+        try:
+            self._pending.release()
+        except ValueError:
+            # More releases than results; harmless after a stop
+            pass
+
+    def queued(self) -> int:
+        """Number of areas not yet started."""
+        with self._lock:
+            return len(self._heap)
+
+    def stop(self) -> None:
+        """Drop queued areas; workers finish the area they are on and exit."""
+        self._stopped.set()
+        with self._lock:
+            self._heap.clear()
+        # Wake workers waiting on backpressure so they can see the stop flag
+        for _ in self._threads:
+            self.result_consumed()
+
+    def cancel(self, timeout: float = CANCEL_TIMEOUT, wait: bool = False) -> None:
+        """
+        Stop the queue and cancel in-flight scrapes.
+        Cleanup (quitting Chrome, closing sessions) runs on a background thread,
+        which then waits up to `timeout` seconds for the workers to exit.
+        With `wait`, the cleanup runs on the calling thread instead (used at shutdown).
+        """
+        self.stop()
+
+        def release() -> None:
+            self.cancel_token.cancel()
+            for t in self._threads:
+                t.join(timeout)
+            alive = sum(t.is_alive() for t in self._threads)
+            if alive:
+                logger.warning("%d scrape workers still running %ss after cancel", alive, timeout)
+            else:
+                logger.info("Search cancelled, all workers released")
+
+        if wait:
+            release()
+        else:
+            threading.Thread(target=release, name="scrape-cancel", daemon=True).start()
+
+    def done(self) -> bool:
+        """True once every worker has exited."""
+        return not any(t.is_alive() for t in self._threads)
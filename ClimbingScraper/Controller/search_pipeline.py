@@ -0,0 +1,96 @@
+from typing import List, Optional, Tuple
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.Caculations.distance_caculator import distance_miles
+from Controller.instrumentation import tagged
+from Controller.Scrapers.cancellation import CancelToken
+from Model.climbing_area import ClimbingArea
+from Model.database import Database
+from Model.warm_store import FRESH_SECONDS, WarmStore
+
+# Search steps shared by the GUI's SearchTab and the headless CLI; nothing here imports the GUI
+
+
+def split_catalog_areas(
+    db: Database,
+    areas: List[ClimbingArea],
+    origin: Tuple[float, float],
+    climb_filter: ClimbFilter
+) -> Tuple[List[ClimbingArea], List[ClimbingArea]]:
+    """
+    Separate areas that have route-catalog rows from those that need a live scrape.
+    Catalogued areas get their distance and filtered climbs (route-table fields only).
+
+    Returns:
+        (catalogued areas nearest first, areas to scrape)
+    """
+    catalog = db.get_routes_for_areas([area.aid for area in areas])
+    listed, to_scrape = [], []
+    for area in areas:
+        routes = catalog.get(area.aid)
+        if routes is None:
+            to_scrape.append(area)
+            continue
+        area.distance = distance_miles(origin[0], origin[1], area.lat, area.long)
+        area.climbs = [c for c in routes if climb_filter.accepts(c.mp_grade, c.type)]
+        listed.append(area)
+    listed.sort(key=lambda a: a.distance)
+    return listed, to_scrape
+
+
+def split_warm_areas(
+    store: WarmStore,
+    areas: List[ClimbingArea],
+    origin: Tuple[float, float],
+    climb_filter: ClimbFilter,
+    max_age: float = FRESH_SECONDS
+) -> Tuple[List[ClimbingArea], List[ClimbingArea]]:
+    """
+    Replace areas that have a fresh stored scrape (kept warm by the RefreshScheduler)
+    with that copy, its climbs filtered for this search.
+
+    Returns:
+        (stored areas nearest first, areas still to list or scrape)
+    """
+    fresh = store.fresh_areas([area.aid for area in areas], max_age)
+    warm, rest = [], []
+    for area in areas:
+        stored = fresh.get(area.aid)
+        if stored is None:
+            rest.append(area)
+            continue
+        warm_area = stored[0]
+        warm_area.distance = distance_miles(origin[0], origin[1], warm_area.lat, warm_area.long)
+        warm_area.climbs = [c for c in warm_area.climbs if climb_filter.accepts(c.mp_grade, c.type)]
+        warm.append(warm_area)
+    warm.sort(key=lambda a: a.distance)
+    return warm, rest
+
+
+def scrape_area_worker(
+    area: ClimbingArea,
+    cancel: Optional[CancelToken] = None,
+    climb_filter: Optional[ClimbFilter] = None,
+    lazy: bool = False,
+    vertical_life: bool = True
+) -> ClimbingArea:
+    """
+    Thread worker: scrapes MountainProject then Vertical-Life for a given area.
+    Only climbs accepted by `climb_filter` are scraped in detail.
+    With `lazy`, only the area pages and route table are scraped; the rest is
+    left to the DetailLoader. Without `vertical_life`, the VL lookup is skipped.
+    Raises ScrapeCancelled if `cancel` is cancelled part way through.
+    """
+    # Scrapers pull in selenium and BeautifulSoup, so they load on first search
+    from Controller.Scrapers.mt_proj_scraper import scrape_mt_proj
+
+    # Every request made for this area is charged to it in the search report
+    with tagged(area=area.name):
+        scrape_mt_proj(area, cancel, climb_filter, details=not lazy)
+        # No climbs left after filtering: don't start a browser for nothing
+        if area.climbs and not lazy and vertical_life:
+            from Controller.Scrapers.v_life_scraper import scrape_vertical_life
+            scrape_vertical_life(area, cancel)
+    # Build the panel text here so navigating to the area only swaps in finished strings
+    area.prerender()
+    return area
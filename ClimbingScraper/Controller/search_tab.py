@@ -1,14 +1,26 @@
-import gc
 import logging
+import os
 import threading
+import time
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from Controller.tab import Tab
-from Controller.Scrapers.database_initialization import DatabaseInitializationScraper
-from Controller.Scrapers.mt_proj_scraper import scrape_mt_proj
-from Controller.Scrapers.v_life_scraper import scrape_vertical_life
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.detail_loader import DetailLoader
+from Controller.instrumentation import METRICS, SearchReport
+from Controller.scrape_scheduler import ScrapeScheduler
+from Controller.refresh_scheduler import RefreshScheduler
+from Controller.search_pipeline import scrape_area_worker, split_catalog_areas, split_warm_areas
+from Controller.Scrapers.cancellation import CancelToken, ScrapeCancelled
+from Controller.tab import Tab, WEATHER_READY
+from Model.climb import Climb
 from Model.climbing_area import ClimbingArea
 from Model.database import Database
+from Model.result_store import ResultStore
+from Model.warm_store import WarmStore
+from Model.snapshot import (
+    AUTOSAVE_NAME, SNAPSHOT_DIR, SNAPSHOT_EXT, SnapshotError, list_snapshots, open_snapshot, save_snapshot
+)
 from View.app_gui import View
 from View.photo_viewer import create_photo_window, update_photo
 
@@ -19,6 +31,17 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(mes
 TAB_NUM = "1"
 IMG_FOLDER = "search_images"
 GEN_DB_STATE = "california"  # default state for initial database generation
+GEN_DB_CATALOG = True        # also store every route so searches can list climbs without scraping
+# Scrape only area pages and route tables during a search; each climb's MP details,
+# VL stats and photos load when it is first displayed (and the next climb is prefetched)
+LAZY_DETAILS = True
+# Reopen the session that was open when the app last closed
+RESTORE_ON_STARTUP = True
+# Re-scrape the most searched/saved areas in the background so searches find them warm
+BACKGROUND_REFRESH = True
+# Events posted by scraping threads (prefixed with TAB_NUM)
+AREA_READY = "AREA_READY"
+CLIMB_READY = "CLIMB_READY"
 
 class SearchTab(Tab):
     """
@@ -38,12 +61,37 @@ class SearchTab(Tab):
             db:   Connected Database instance.
         """
         super().__init__(view, db)
-        self.result_queue: List[Dict[str, Any]] = []
+        # Far areas' text is spilled to disk once the results outgrow the memory budget
+        self.result_queue: ResultStore = ResultStore()
         self.queue_ind: int = 0
-        self.images: List[str] = []
+        self.images: List[Path] = []
         self.image_ind: int = 0
         # Lock protects queue appends from worker threads
         self.lock = threading.Lock()
+        # Scheduler of the running search; results from older schedulers are ignored
+        self.scheduler: Optional[ScrapeScheduler] = None
+        self.search_total: int = 0
+        self.search_done: int = 0
+        # Stage timings of the running search, logged when it finishes or is cancelled
+        self.report: Optional[SearchReport] = None
+        # Climbs listed from the route catalog get their details when first displayed
+        self.details = DetailLoader(on_ready=lambda result: self.post_event(CLIMB_READY, result))
+        # Search origin, stored with session snapshots
+        self.origin: Optional[Tuple[float, float]] = None
+        # Snapshot files listed in the sessions dropdown, in the same order
+        self.sessions: List[Path] = []
+        self.refresh_sessions()
+        # Popularity and background-refreshed copies of popular areas
+        self.warm = WarmStore()
+        # Warm areas not shown yet, nearest first; merged into the results by distance
+        self.held_warm: List[ClimbingArea] = []
+        self.refresher = RefreshScheduler(self.warm, idle=self.is_idle)
+        if BACKGROUND_REFRESH:
+            self.refresher.start()
+        if RESTORE_ON_STARTUP:
+            autosave = SNAPSHOT_DIR / f"{AUTOSAVE_NAME}{SNAPSHOT_EXT}"
+            if autosave.is_file():
+                self.restore_session(autosave, quiet=True)
 
     def handle_event(self, event: str, values: Dict[str, Any], db: Database) -> bool:
         """
@@ -51,6 +99,22 @@ class SearchTab(Tab):
 
         Returns True if event was handled; False otherwise.
         """
+        # Background weather fetch finished
+        if event == f"{self.TAB_NUM}:{WEATHER_READY}":
+            return self.handle_weather_ready(values[event])
+
+        # A scraping thread finished one area
+        if event == f"{self.TAB_NUM}:{AREA_READY}":
+            return self._handle_area_ready(values[event])
+
+        # A catalog climb's details finished loading
+        if event == f"{self.TAB_NUM}:{CLIMB_READY}":
+            return self._handle_climb_ready(values[event])
+
+        # Page buttons under the description/comment panels
+        if self.handle_page_event(event):
+            return True
+
         # Climbing type selection
         if event == f"{self.TAB_NUM}:CLIMBING_TYPE":
             self.view.update_climbing_fields(values[event])
@@ -64,6 +128,16 @@ class SearchTab(Tab):
         if event == f"{self.TAB_NUM}:SEARCH":
             return self._handle_search(values)
 
+        # Stop the running search, keeping areas already scraped
+        if event == f"{self.TAB_NUM}:CANCEL_SEARCH":
+            return self._handle_cancel_search()
+
+        # Snapshot the current results, or reopen an earlier snapshot
+        if event == f"{self.TAB_NUM}:SAVE_SESSION":
+            return self._handle_save_session()
+        if event == f"{self.TAB_NUM}:OPEN_SESSION":
+            return self._handle_open_session(values)
+
         # Save current result to saved climbs
         if event == f"{self.TAB_NUM}:SAVE":
             return self._handle_save()
@@ -103,7 +177,9 @@ class SearchTab(Tab):
         Don't want user to accidentally click this
         """
         if self.view.show_confirmation_pop_up():
-            scraper = DatabaseInitializationScraper()
+            # Scrapers pull in selenium and BeautifulSoup, so they load on first use
+            from Controller.Scrapers.database_initialization import DatabaseInitializationScraper
+            scraper = DatabaseInitializationScraper(catalog=GEN_DB_CATALOG)
             scraper.scrape_state(GEN_DB_STATE)
             scraper.close()
             logging.info("Database initialized for state: %s", GEN_DB_STATE)
@@ -113,57 +189,220 @@ class SearchTab(Tab):
         """
         Clear previous results, query DB for areas, and launch
         scraping threads for each area.
+        Returns immediately; each finished area arrives as an AREA_READY event
+        and can be browsed while the rest are still being scraped.
+        Areas in the route catalog skip the scrape: their climbs are listed straight
+        from the database and each climb's details load when it is first displayed.
+        Popular areas refreshed in the background are served from the warm store,
+        merged with the scraped areas in distance order.
         """
         inputs = self.view.get_inputs_search_page(values)
         if inputs is None:
             return True
 
         lat, lon, dist = inputs
-        # Tear down old GUI and clear memory
-        # Old window has to be completly close with garbage collect
-        # because the pysimple gui does not work well with multithreading
-        try:
-            self.view.window.close()
-        except Exception:
-            pass
-        gc.collect()
-
+        self.origin = (lat, lon)
+        climb_filter = ClimbFilter.from_search_values(values)
         self.result_queue.clear()
+        self.held_warm = []
         self.queue_ind = 0
         self.clear_images()
         self.displayed_image = None
+        # The window is reused across searches; only the result panels are cleared
+        self.displayed_area = None
+        self.displayed_climb = None
+        self.view.reset_results(self.TAB_NUM)
+
+        # A new search replaces the running one; its drivers are released in the background
+        if self.scheduler:
+            self.scheduler.cancel()
+            self.scheduler = None
+        self.details.reset()
+        self._end_report()
+        self.report = METRICS.start_report(f"Search {lat:.4f},{lon:.4f} within {dist:g} miles")
+
+        # Fetch raw area objects from DB, minus areas whose route stats rule out any match
+        areas = self.db.search_db_for_areas(lat, lon, dist, climb_filter)
+        logging.info("Found %d areas, scheduling scrape", len(areas))
+        self.search_total = len(areas)
+        self.search_done = 0
+        self.view.update_search_progress(0, self.search_total)
+        if not areas:
+            self._end_report()
+            self.view.show_popup("No results found")
+            return True
 
-        # Fetch raw area objects from DB
-        areas = self.db.search_db_for_areas(lat, lon, dist)
-        logging.info("Found %d areas, starting scraping threads", len(areas))
+        # Coordinates are known now, so forecasts download while the areas are scraped
+        self.weather.prefetch(areas)
 
-        # Prepare threads
-        results: List[Optional[ClimbingArea]] = [None] * len(areas)
-        def worker(idx: int, area: ClimbingArea) -> None:
-            results[idx] = scrape_area_worker(area)
-            with self.lock:
-                self.result_queue.append({"area": area, "c_index": 0})
+        self.warm.record_hits(areas)
+        areas = self._list_warm_areas(areas, (lat, lon), climb_filter)
+        to_scrape = self._list_catalog_areas(areas, (lat, lon), climb_filter) if areas else []
+        if not to_scrape:
+            self._finish_search()
+            return True
+
+        # Nearest areas are scraped first by a bounded worker pool.
+        # Results reach the GUI thread as events; failed areas still count toward progress
+        self.scheduler = ScrapeScheduler(
+            (lat, lon),
+            work=lambda area, cancel: scrape_area_worker(area, cancel, climb_filter, LAZY_DETAILS),
+            on_result=lambda scheduler, area: self.post_event(AREA_READY, (scheduler, area))
+        )
+        self.scheduler.submit(to_scrape)
+        # Stored areas nearer than every area left to scrape can be shown now
+        self._release_warm(min(area.distance for area in to_scrape))
+        return True
+
+    def _list_warm_areas(
+        self,
+        areas: List[ClimbingArea],
+        origin: Tuple[float, float],
+        climb_filter: ClimbFilter
+    ) -> List[ClimbingArea]:
+        """
+        Take the areas with a fresh background-refreshed copy; they join the results
+        once the scrape reaches their distance (see _release_warm).
+        Their photos were cleared with the image folder, so they download again in the background.
+
+        Returns:
+            The areas that still need the catalog or a live scrape.
+        """
+        warm, rest = split_warm_areas(self.warm, areas, origin, climb_filter)
+        if not warm:
+            return rest
+        self.held_warm = warm
+        self.search_done += len(warm)
+        self.view.update_search_progress(self.search_done, self.search_total)
+        threading.Thread(
+            target=_restore_photos, args=([{"area": a} for a in warm], self.details.cancel_token), daemon=True
+        ).start()
+        logging.info("Served %d areas from the warm store, %d left", len(warm), len(rest))
+        return rest
+
+    def _release_warm(self, up_to: float = float("inf")) -> None:
+        """Add the held warm areas no farther than `up_to` miles to the results."""
+        while self.held_warm and self.held_warm[0].distance <= up_to:
+            self._add_result(self.held_warm.pop(0))
+
+    def is_idle(self) -> bool:
+        """True while no search is scraping; the background refresh pauses otherwise."""
+        scheduler = self.scheduler
+        return scheduler is None or scheduler.done()
+
+    def _list_catalog_areas(
+        self,
+        areas: List[ClimbingArea],
+        origin: Tuple[float, float],
+        climb_filter: ClimbFilter
+    ) -> List[ClimbingArea]:
+        """
+        Add areas that have route-catalog rows to the results right away, nearest first.
+
+        Returns:
+            The areas that aren't catalogued and still need a live scrape.
+        """
+        listed, to_scrape = split_catalog_areas(self.db, areas, origin, climb_filter)
+        for area in listed:
+            self._add_result(area)
+        self.search_done += len(listed)
+        self.view.update_search_progress(self.search_done, self.search_total)
+        if listed:
+            logging.info("Listed %d areas from the route catalog, %d to scrape", len(listed), len(to_scrape))
+        return to_scrape
+
+    def _handle_cancel_search(self) -> bool:
+        """
+        Cancel the running search. Areas already received stay browsable.
+        """
+        if self.scheduler is None or self.search_done == self.search_total:
+            return True
+        self.scheduler.cancel()
+        self.scheduler = None
+        self._release_warm()
+        self.view.show_search_cancelled(self.search_done, self.search_total)
+        logging.info("Search cancelled after %d/%d areas", self.search_done, self.search_total)
+        self._end_report()
+        return True
 
-        threads = []
-        for i, area in enumerate(areas):
-            t = threading.Thread(target=worker, args=(i, area), daemon=True)
-            t.start()
-            threads.append(t)
+    def _handle_area_ready(self, payload: Tuple[ScrapeScheduler, Optional[ClimbingArea]]) -> bool:
+        """
+        Add one scraped area to the results and update the progress indicator.
+        The first area with climbs is displayed right away.
+        """
+        scheduler, area = payload
+        # Let the scheduler start another area now that this result is taken
+        scheduler.result_consumed()
+        if scheduler is not self.scheduler:
+            # Finished after a newer search started
+            return True
+
+        self.search_done += 1
+        self.view.update_search_progress(self.search_done, self.search_total)
 
-        for t in threads:
-            t.join()
-        gc.collect()
+        if area is not None:
+            self._release_warm(area.distance)
+            self._add_result(area)
+
+        if self.search_done == self.search_total:
+            self._finish_search()
+        return True
 
-        # Rebuild GUI
-        self.view = View()
+    def _add_result(self, area: ClimbingArea) -> None:
+        """
+        Append an area with climbs to the results; the first one is displayed right away.
+        """
+        if not area.climbs:
+            return
+        self.result_queue.append({"area": area, "c_index": 0})
+        if len(self.result_queue) == 1:
+            self.update_display(area, area.climbs[0], 0)
+        else:
+            entry = self.result_queue[self.queue_ind]
+            self.view.update_counters(
+                f"{self.queue_ind + 1}/{len(self.result_queue)}",
+                f"{entry['c_index'] + 1}/{len(entry['area'].climbs)}"
+            )
+
+    def _finish_search(self) -> None:
+        """Log the outcome once every area has been listed or scraped."""
+        self._release_warm()
+        logging.info("Search finished: %d areas with climbs", len(self.result_queue))
+        self._end_report()
         if not self.result_queue:
             self.view.show_popup("No results found")
-        else:
-            area, climb = self.result_queue[self.queue_ind]["area"], \
-                          self.result_queue[self.queue_ind]["area"].climbs[0]
-            self.update_display(area, climb)
+
+    def _end_report(self) -> None:
+        """Log the running search's stage timings, if a report is open."""
+        if self.report is not None:
+            logging.info("%s", self.report.finish())
+            self.report = None
+
+    def _handle_climb_ready(self, payload: Tuple[ClimbingArea, Climb]) -> bool:
+        """
+        Refresh the panels if the loaded climb's area is still displayed.
+        Any climb's load may have filled in the area's descriptions and comments,
+        so the displayed climb is redrawn even when another climb finished.
+        """
+        area, _ = payload
+        if not self.result_queue:
+            return True
+        entry = self.result_queue[self.queue_ind]
+        if entry["area"] is area:
+            self.update_display(area, area.climbs[entry["c_index"]], entry["c_index"])
         return True
 
+    def update_display(self, area: Any, climb: Any, climbs_ind: Optional[int] = None) -> None:
+        """
+        Show the area and climb, and start loading the climb's details if they
+        haven't been loaded yet. The next climb in the area is requested too,
+        so stepping forward usually finds it ready.
+        """
+        super().update_display(area, climb, climbs_ind)
+        self.details.request(area, climb)
+        if climbs_ind is not None and climbs_ind + 1 < len(area.climbs):
+            self.details.request(area, area.climbs[climbs_ind + 1])
+
     def _handle_save(self) -> bool:
         """
         Insert the current area/climb into saved climbs in DB.
@@ -173,9 +412,142 @@ class SearchTab(Tab):
                           self.result_queue[self.queue_ind]["c_index"]
                       ]
         self.db.insert_saved_climb(area, climb)
+        self.warm.record_save(area)
         logging.info("Saved climb: %s", climb.name)
         return True
 
+    # ——— Session snapshots ———
+    def refresh_sessions(self) -> None:
+        """Re-read the snapshot folder and fill the sessions dropdown."""
+        found = list_snapshots()
+        self.sessions = [path for path, _ in found]
+        labels = []
+        for _, header in found:
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(header.get("created", 0)))
+            labels.append(f"{header.get('label')} ({len(header.get('areas', []))} areas, {created})")
+        self.view.update_sessions(labels)
+
+    def save_session(self, path: Optional[Path] = None, label: Optional[str] = None) -> Optional[Path]:
+        """
+        Write the current results and navigation state to a snapshot.
+
+        Args:
+            path:  Snapshot file; defaults to a new timestamped file.
+            label: Name shown in the sessions dropdown.
+
+        Returns:
+            The snapshot path, or None if there were no results to save.
+        """
+        if not self.result_queue:
+            return None
+        # Worker threads only append to the queue, so a copy is a consistent view
+        with self.lock:
+            entries = list(self.result_queue)
+        # Spilled areas are written from the spill file without loading them back
+        return save_snapshot(entries, self.queue_ind, path, label, self.origin, self.result_queue.area_dict)
+
+    def autosave(self) -> None:
+        """
+        Snapshot the session on exit so it reopens at the next start.
+        With no results, the previous autosave is removed instead of being restored again.
+        """
+        path = SNAPSHOT_DIR / f"{AUTOSAVE_NAME}{SNAPSHOT_EXT}"
+        # Warm areas still held back by an unfinished search belong to the session too;
+        # the window may be gone, so they are queued without touching the view
+        for area in self.held_warm:
+            if area.climbs:
+                self.result_queue.append({"area": area, "c_index": 0})
+        self.held_warm = []
+        try:
+            if self.save_session(path, label="Last session") is None:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logging.warning("Couldn't autosave the session: %s", e)
+
+    def _handle_save_session(self) -> bool:
+        """Save the results shown now as a new session."""
+        try:
+            path = self.save_session()
+        except OSError as e:
+            self.view.show_popup(f"Couldn't save the session: {e}")
+            return True
+        if path is None:
+            self.view.show_popup("No results to save")
+            return True
+        self.refresh_sessions()
+        return True
+
+    def _handle_open_session(self, values: Dict[str, Any]) -> bool:
+        """Replace the current results with the session picked in the dropdown."""
+        choice = self.view.get_session_choice(values)
+        if choice is None:
+            return True
+        self.restore_session(self.sessions[choice])
+        return True
+
+    def restore_session(self, path: Path, quiet: bool = False) -> bool:
+        """
+        Replace the results with a snapshot's areas and show the climb that was displayed.
+        Any running search is cancelled. Photos that are no longer on disk are
+        downloaded again in the background, starting with the displayed area.
+
+        Args:
+            path:  Snapshot file.
+            quiet: Log failures instead of showing a popup (startup restore).
+
+        Returns:
+            True if the session was restored.
+        """
+        start = time.perf_counter()
+        try:
+            entries, queue_ind, header = open_snapshot(path)
+        except (OSError, ValueError, SnapshotError) as e:
+            logging.warning("Couldn't open session %s: %s", path, e)
+            if not quiet:
+                self.view.show_popup(f"Couldn't open the session: {e}")
+            return False
+        if not header["areas"]:
+            return False
+
+        if self.scheduler:
+            self.scheduler.cancel()
+            self.scheduler = None
+        self.details.reset()
+        self.displayed_image = None
+        self.displayed_area = None
+        self.displayed_climb = None
+        self.view.reset_results(self.TAB_NUM)
+
+        # Areas are decoded one at a time and spilled as they arrive, so a huge
+        # session never has all its text in memory at once
+        try:
+            with self.lock:
+                self.result_queue.replace(entries, queue_ind)
+        except (OSError, SnapshotError) as e:
+            logging.warning("Couldn't read session %s: %s", path, e)
+            with self.lock:
+                self.result_queue.clear()
+            if not quiet:
+                self.view.show_popup(f"Couldn't read the session: {e}")
+            return False
+        self.queue_ind = queue_ind
+        self.origin = tuple(header["origin"]) if header.get("origin") else None
+        self.search_total = self.search_done = len(self.result_queue)
+        self.view.update_search_progress(self.search_done, self.search_total)
+
+        entry = self.result_queue[self.queue_ind]
+        self.update_display(entry["area"], entry["area"].climbs[entry["c_index"]], entry["c_index"])
+        logging.info("Restored %d areas from %s in %.1f ms",
+                     len(self.result_queue), Path(path).name, (time.perf_counter() - start) * 1000)
+
+        # Displayed area first, then the rest in browsing order
+        restored = list(self.result_queue)
+        ordered = restored[queue_ind:] + restored[:queue_ind]
+        threading.Thread(
+            target=_restore_photos, args=(ordered, self.details.cancel_token), daemon=True
+        ).start()
+        return True
+
     def _handle_photo_open(self) -> bool:
         """
         Display photos for the current climb if available.
@@ -185,25 +557,26 @@ class SearchTab(Tab):
                       self.result_queue[self.queue_ind]["c_index"]
                   ]
         self.load_images(climb)
-        if not self.images:
-            self.view.show_popup("No images")
+        self.image_ind = 0
+        image = self.current_image()
+        if image is None:
+            loading = not (climb.details_loaded and climb.vl_loaded)
+            self.view.show_popup("Photos are still loading" if loading else "No images")
             return True
 
-        self.image_ind = 0
-        self.displayed_image_window, self.displayed_image = \
-            create_photo_window(self.images[self.image_ind])
+        self.displayed_image_window, self.displayed_image = create_photo_window(image)
         return True
 
     def _next_photo(self) -> bool:
         """Advance to next photo in current slideshow."""
         self.image_ind = (self.image_ind + 1) % len(self.images)
-        update_photo(self.displayed_image, self.images[self.image_ind])
+        update_photo(self.displayed_image, self.current_image())
         return True
 
     def _prev_photo(self) -> bool:
         """Go back to previous photo in current slideshow."""
         self.image_ind = (self.image_ind - 1) % len(self.images)
-        update_photo(self.displayed_image, self.images[self.image_ind])
+        update_photo(self.displayed_image, self.current_image())
         return True
 
     def _navigate_area(self, step: int) -> bool:
@@ -211,9 +584,10 @@ class SearchTab(Tab):
         new_idx = self.queue_ind + step
         if 0 <= new_idx < len(self.result_queue):
             self.queue_ind = new_idx
-            area = self.result_queue[self.queue_ind]["area"]
-            climb = area.climbs[self.result_queue[self.queue_ind]["c_index"]]
-            self.update_display(area, climb)
+            # Loads the area back from the spill file if it was moved out of memory
+            area = self.result_queue.touch(self.queue_ind)
+            c_index = self.result_queue[self.queue_ind]["c_index"]
+            self.update_display(area, area.climbs[c_index], c_index)
             return True
         return False
 
@@ -224,15 +598,24 @@ class SearchTab(Tab):
         climbs = entry["area"].climbs
         if 0 <= idx < len(climbs):
             entry["c_index"] = idx
-            self.update_display(entry["area"], climbs[idx])
+            self.update_display(entry["area"], climbs[idx], idx)
             return True
         return False
 
 
-def scrape_area_worker(area: ClimbingArea) -> ClimbingArea:
+def _restore_photos(entries: List[Dict[str, Any]], cancel: CancelToken) -> None:
     """
-    Thread worker: scrapes MountainProject then Vertical-Life for a given area.
+    Thread worker: download the photos of restored climbs that aren't in IMG_FOLDER
+    any more (the folder is emptied on exit and on every search).
+    Stops when `cancel` is cancelled, i.e. when a new search or session replaces this one.
     """
-    scrape_mt_proj(area)
-    scrape_vertical_life(area)
-    return area
+    for entry in entries:
+        for climb in entry["area"].climbs:
+            for photo in (*climb.mp_photos, *climb.vl_photos):
+                if cancel.cancelled:
+                    return
+                if not os.path.exists(photo.path(IMG_FOLDER)):
+                    try:
+                        photo.download_image(IMG_FOLDER, cancel)
+                    except ScrapeCancelled:
+                        return
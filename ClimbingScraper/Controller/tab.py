@@ -1,13 +1,14 @@
 import io
 import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
 import threading
 from typing import Any, List, Optional, Dict, Union
 
-from PIL import Image, UnidentifiedImageError
-
+from Controller.weather_prefetcher import WeatherPrefetcher, WEATHER_PLACEHOLDER
 from Model.database import Database
+from Model.rendered_text import PAGE_SIZE
 
 # Configure module-level logger
 logger = logging.getLogger(__name__)
@@ -17,6 +18,13 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(mes
 _ALLOWED_EXTS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
 # Maximum thumbnail size (width, height) preserving aspect ratio
 _MAX_THUMB_SIZE = (3200, 2400)
+# Converted photos kept in memory; the rest are decoded again when shown
+IMAGE_CACHE_SIZE = 4
+# Event posted by the weather prefetcher when a forecast lands (prefixed with TAB_NUM)
+WEATHER_READY = "WEATHER_READY"
+# Description/comment panels shown one page at a time; each has _PREV/_NEXT buttons
+AREA_PANELS = ("AREA_DESCRIPTION", "AREA_REVIEWS")
+CLIMB_PANELS = ("CLIMB_DESCRIPTION", "CLIMB_COMMENTS")
 
 class Tab(ABC):
     """
@@ -37,13 +45,19 @@ class Tab(ABC):
         """
         self.view = view
         self.db = db
-        self.images: List[bytes] = []
+        self.images: List[Path] = []
         self.image_ind: int = 0
         self.displayed_image: Optional[Any] = None
         self.displayed_image_window: Optional[Any] = None
         self.result_queue: List[Dict[str, Union[int, Any]]] = []
         self.queue_ind: int = 0
         self.lock = threading.Lock()
+        # Area and climb currently shown, so late results only refresh the right panels
+        self.displayed_area: Optional[Any] = None
+        self.displayed_climb: Optional[Any] = None
+        # Page shown in each paged panel; reset when a different area/climb is displayed
+        self.panel_pages: Dict[str, int] = dict.fromkeys(AREA_PANELS + CLIMB_PANELS, 0)
+        self.weather = WeatherPrefetcher(on_ready=self._post_weather_ready)
 
     def result_queue_size(self) -> int:
         """
@@ -72,6 +86,76 @@ class Tab(ABC):
                 except Exception as e:
                     logger.error("Failed to delete %s: %s", file_path.name, e)
 
+    def post_event(self, name: str, value: Any) -> None:
+        """
+        Hand a value from a worker thread to the GUI thread as a tab-prefixed event.
+        write_event_value is the only window call that is safe from other threads.
+        """
+        try:
+            self.view.window.write_event_value(f"{self.TAB_NUM}:{name}", value)
+        except Exception as e:
+            # Window may already be closed when the app is shutting down
+            logger.debug("Couldn't post %s event: %s", name, e)
+
+    def _post_weather_ready(self, result: Any) -> None:
+        """Called on a weather worker thread; the forecast is cached even if the event is lost."""
+        self.post_event(WEATHER_READY, result)
+
+    def handle_weather_ready(self, result: Any) -> bool:
+        """
+        Refresh the WEATHER element if the finished forecast belongs to the displayed area.
+
+        Args:
+            result: (bucket key, forecast text) tuple from the prefetcher.
+        """
+        key, text = result
+        area = self.displayed_area
+        if area is not None and area.lat is not None \
+                and self.weather.cache.bucket(area.lat, area.long) == key:
+            self.view.display_area_weather(self.TAB_NUM, text)
+        return True
+
+    def handle_page_event(self, event: str) -> bool:
+        """
+        Turn the page of a description/comment panel.
+
+        Args:
+            event: "<TAB_NUM>:<PANEL>_PREV" or "<TAB_NUM>:<PANEL>_NEXT".
+
+        Returns True if the event was a page event for this tab.
+        """
+        prefix = f"{self.TAB_NUM}:"
+        if not event.startswith(prefix):
+            return False
+        panel, _, direction = event[len(prefix):].rpartition("_")
+        if panel not in self.panel_pages or direction not in ("PREV", "NEXT"):
+            return False
+        if self.displayed_area is None:
+            return True
+        self.panel_pages[panel] += 1 if direction == "NEXT" else -1
+        self._show_panel(panel)
+        return True
+
+    def _show_panel(self, panel: str) -> None:
+        """
+        Render the current page of one panel from the displayed area/climb.
+        Only one page of entries is built and sent to the widget, so the cost
+        doesn't grow with the number of comments.
+        """
+        area, climb = self.displayed_area, self.displayed_climb
+        page = self.panel_pages[panel]
+        if panel == "AREA_DESCRIPTION":
+            text, page, pages = area.area_descriptions_page(page, PAGE_SIZE)
+        elif panel == "AREA_REVIEWS":
+            text, page, pages = area.area_comments_page(page, PAGE_SIZE)
+        elif panel == "CLIMB_DESCRIPTION":
+            text, page, pages = climb.descriptions_page(page, PAGE_SIZE)
+        else:
+            text, page, pages = climb.comments_page(page, PAGE_SIZE)
+        # Pages are clamped by the model, e.g. after stepping past the last one
+        self.panel_pages[panel] = page
+        self.view.display_panel_page(self.TAB_NUM, panel, text, page, pages)
+
     @abstractmethod
     def handle_event(self, event: str, values: Dict[str, Any], db: Database) -> bool:
         """
@@ -101,19 +185,25 @@ class Tab(ABC):
             climb_counter = f"{climbs_ind+1}/{len(area.climbs)}"
             self.view.update_counters(area_counter, climb_counter)
 
+        # A different area or climb starts its panels on the first page
+        if area is not self.displayed_area:
+            self.panel_pages.update(dict.fromkeys(AREA_PANELS, 0))
+        if climb is not self.displayed_climb:
+            self.panel_pages.update(dict.fromkeys(CLIMB_PANELS, 0))
+
         # Area fields
+        self.displayed_area = area
+        self.displayed_climb = climb
         self.view.display_area_basic(
             self.TAB_NUM, area.string_basic_info()
         )
-        self.view.display_area_weather(
-            self.TAB_NUM, area.string_weather()
-        )
-        self.view.display_area_descriptions(
-            self.TAB_NUM, area.string_area_descriptions()
-        )
-        self.view.display_area_comments(
-            self.TAB_NUM, area.string_area_comments()
-        )
+        # Never block on the weather API; the forecast replaces the placeholder when it arrives
+        weather = area.string_weather(WEATHER_PLACEHOLDER)
+        if weather is WEATHER_PLACEHOLDER:
+            self.weather.prefetch([area])
+        self.view.display_area_weather(self.TAB_NUM, weather)
+        for panel in AREA_PANELS:
+            self._show_panel(panel)
 
         # Climb fields
         self.view.display_climb_basic(
@@ -122,23 +212,19 @@ class Tab(ABC):
         self.view.update_chart(
             self.TAB_NUM, climb.get_data_chart()
         )
-        self.view.display_climb_descriptions(
-            self.TAB_NUM, climb.string_descriptions()
-        )
-        self.view.display_climb_comments(
-            self.TAB_NUM, climb.string_comments()
-        )
+        for panel in CLIMB_PANELS:
+            self._show_panel(panel)
 
     def load_images(self, climb: Any) -> None:
         """
-        Load and verify images from the IMG_FOLDER whose filenames start with
-        the given climb's name, storing raw PNG bytes in self.images.
+        List the images in IMG_FOLDER whose filenames start with the given climb's name.
+        Only the paths are kept in self.images; each one is decoded when it is shown
+        (see current_image), so a climb with many photos doesn't hold them all as PNGs.
 
         Args:
             climb: Climb instance with `.name` attribute for prefix matching.
         """
         prefix = climb.name
-        images: List[bytes] = []
         img_dir = (
             Path(__file__).resolve().parent
             / '..' / 'View' / 'images' / self.IMG_FOLDER
@@ -149,26 +235,50 @@ class Tab(ABC):
             self.images = []
             return
 
-        for path in sorted(img_dir.iterdir()):
-            if path.suffix.lower() not in _ALLOWED_EXTS:
-                continue
-            if prefix and not path.name.casefold().startswith(prefix.casefold()):
-                continue
+        self.images = [
+            path for path in sorted(img_dir.iterdir())
+            if path.suffix.lower() in _ALLOWED_EXTS
+            and (not prefix or path.name.casefold().startswith(prefix.casefold()))
+        ]
+        logger.info("%d images found for prefix '%s'", len(self.images), prefix)
+
+    def current_image(self) -> Optional[bytes]:
+        """
+        PNG bytes of the image at self.image_ind, for the photo viewer.
+        Images that turn out to be unreadable are dropped from the slideshow.
 
+        Returns None once no readable image is left.
+        """
+        while self.images:
+            self.image_ind %= len(self.images)
+            path = self.images[self.image_ind]
             try:
-                # Verify image integrity
-                with Image.open(path) as img:
-                    img.verify()
-                # Reload, convert, and buffer as PNG
-                with Image.open(path) as img:
-                    img = img.convert('RGB')
-                    img.thumbnail(_MAX_THUMB_SIZE)
-                    buf = io.BytesIO()
-                    img.save(buf, format='PNG')
-                    images.append(buf.getvalue())
-                logger.debug("Loaded image: %s", path.name)
-            except (UnidentifiedImageError, OSError) as err:
+                return _png_bytes(str(path), path.stat().st_mtime)
+            except OSError as err:
                 logger.warning("Skipping invalid image %s: %s", path.name, err)
+                del self.images[self.image_ind]
+        return None
+
+
+@lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _png_bytes(path: str, mtime: float) -> bytes:
+    """
+    Verify an image and convert it to a bounded-size PNG.
+    Cached by path and modification time, so stepping back and forth doesn't decode again.
+    """
+    # Pillow is only needed once the photo viewer opens
+    from PIL import Image, UnidentifiedImageError
 
-        self.images = images
-        logger.info("%d images loaded for prefix '%s'", len(images), prefix)
+    try:
+        # Verify image integrity
+        with Image.open(path) as img:
+            img.verify()
+        # Reload, convert, and buffer as PNG
+        with Image.open(path) as img:
+            img = img.convert('RGB')
+            img.thumbnail(_MAX_THUMB_SIZE)
+            buf = io.BytesIO()
+            img.save(buf, format='PNG')
+            return buf.getvalue()
+    except UnidentifiedImageError as err:
+        raise OSError(str(err)) from err
@@ -0,0 +1,84 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, Set, Tuple
+
+from Controller.Caculations.weather import ERROR_PREFIX
+from Controller.Caculations.weather_cache import FORECAST_CACHE, WeatherCache, BucketKey
+
+# ——— Module-level configuration ———
+MAX_WORKERS = 8            # concurrent OpenWeather requests
+WEATHER_PLACEHOLDER = "10-Day Weather Forecast:\n\nLoading…"
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherPrefetcher:
+    """
+    Fetches weather forecasts in background threads and fills the shared WeatherCache.
+    Each grid cell is requested at most once at a time; `on_ready` is called with the
+    cell's bucket key and forecast text (or error message) when the request finishes,
+    so the GUI can refresh the WEATHER element.
+    """
+
+    def __init__(
+        self,
+        on_ready: Optional[Callable[[Tuple[BucketKey, str]], None]] = None,
+        cache: WeatherCache = FORECAST_CACHE,
+        max_workers: int = MAX_WORKERS
+    ) -> None:
+        """
+        Args:
+            on_ready:    Callback run on a worker thread with (bucket, text) once a fetch finishes.
+            cache:       Cache to read from and fill.
+            max_workers: Size of the fetch thread pool.
+        """
+        self.on_ready = on_ready
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather")
+        self._in_flight: Set[BucketKey] = set()
+        self._lock = threading.Lock()
+
+    def prefetch(self, areas: Iterable) -> int:
+        """
+        Queue forecast fetches for every area whose cell is neither cached nor in flight.
+
+        Args:
+            areas: ClimbingArea-like objects with `lat` and `long`.
+
+        Returns:
+            int: Number of fetches queued.
+        """
+        queued = 0
+        for area in areas:
+            if area.lat is None or area.long is None:
+                continue
+            if self.cache.peek(area.lat, area.long) is not None:
+                continue
+            key = self.cache.bucket(area.lat, area.long)
+            with self._lock:
+                if key in self._in_flight:
+                    continue
+                self._in_flight.add(key)
+            self._executor.submit(self._fetch, area.lat, area.long, key)
+            queued += 1
+        if queued:
+            logger.info("Prefetching weather for %d grid cells", queued)
+        return queued
+
+    def _fetch(self, lat: float, lon: float, key: BucketKey) -> None:
+        """Worker: fill the cache for one cell and notify the GUI."""
+        try:
+            text = self.cache.get(lat, lon)
+        except Exception as e:
+            logger.exception("Weather prefetch failed for %s", key)
+            text = f"{ERROR_PREFIX}: {e}"
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+        if self.on_ready:
+            self.on_ready((key, text))
+
+    def shutdown(self) -> None:
+        """Drop queued fetches and stop the pool without waiting for running ones."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -2,9 +2,22 @@
 from Controller.Caculations.us_to_euro_grading import convert_eu_to_us
 # Import the Photo model for handling images
 from Model.photo import Photo
+# Linear-time panel rendering, cached until the source lists change
+from Model.rendered_text import TrackedList, RenderCache, quoted_page, PAGE_SIZE
 
 
 class Climb:
+    # Slotted: a wide search keeps thousands of climbs alive, and a per-instance __dict__
+    # costs more than the fields themselves
+    __slots__ = (
+        "name", "type",
+        "mp_stars", "num_mp_stars", "mp_grade", "mp_descriptions", "mp_comments", "mp_photos",
+        "mp_link", "details_loaded",
+        "vl_comments", "vl_ascents", "vl_recommends", "vl_onsite_rate", "vl_style",
+        "vl_grade", "vl_stars", "vl_photos", "vl_loaded",
+        "_rendered",
+    )
+
     def __init__(self):
         # Identification fields
         self.name = None
@@ -13,12 +26,14 @@ class Climb:
         self.mp_stars = None            # Numeric star rating from MP
         self.num_mp_stars = None        # Raw string count of MP ratings
         self.mp_grade = None            # Grade from Mountain Project (YDS)
-        self.mp_descriptions = []       # Detailed description texts from MP
-        self.mp_comments = []           # User comments from MP
+        self.mp_descriptions = TrackedList()    # Detailed description texts from MP
+        self.mp_comments = TrackedList()        # User comments from MP
         self.mp_photos = []             # Photo objects associated with MP
+        self.mp_link = None             # MP route page, used to fetch details on demand
+        self.details_loaded = False     # True once the MP detail page has been scraped
 
         # Vertical-Life data
-        self.vl_comments = []           # User comments from VL
+        self.vl_comments = TrackedList()        # User comments from VL
         self.vl_ascents = None          # Total ascent count on VL
         self.vl_recommends = None       # Number of “recommends” on VL
         self.vl_onsite_rate = None      # Calculated onsight success rate (%)
@@ -26,12 +41,45 @@ class Climb:
         self.vl_grade = None            # Grade from VL (EU system)
         self.vl_stars = None            # Star rating from VL
         self.vl_photos = []             # Photo objects associated with VL
+        self.vl_loaded = False          # True once the climb has been looked up on VL
+        self._rendered = RenderCache()  # Panel text, rebuilt only when its lists change
+
+    # Plain scalar fields copied as-is by to_dict/from_dict (session snapshots)
+    _SCALAR_FIELDS = (
+        "name", "type", "mp_stars", "num_mp_stars", "mp_grade", "mp_link", "details_loaded",
+        "vl_ascents", "vl_recommends", "vl_onsite_rate", "vl_style", "vl_grade", "vl_stars", "vl_loaded",
+    )
+
+    # Convert to JSON-ready data; photos are kept as (link, filename) references
+    def to_dict(self):
+        data = {field: getattr(self, field) for field in self._SCALAR_FIELDS}
+        data["mp_descriptions"] = list(self.mp_descriptions)
+        data["mp_comments"] = list(self.mp_comments)
+        data["vl_comments"] = list(self.vl_comments)
+        data["mp_photos"] = [[p.link, p.filename] for p in self.mp_photos]
+        data["vl_photos"] = [[p.link, p.filename] for p in self.vl_photos]
+        return data
+
+    # Inverse of to_dict; photos are not downloaded again
+    @classmethod
+    def from_dict(cls, data):
+        climb = cls()
+        for field in cls._SCALAR_FIELDS:
+            if field in data:
+                setattr(climb, field, data[field])
+        climb.mp_descriptions.extend(data.get("mp_descriptions", ()))
+        climb.mp_comments.extend(data.get("mp_comments", ()))
+        climb.vl_comments.extend(data.get("vl_comments", ()))
+        climb.mp_photos = [Photo.restore(link, filename) for link, filename in data.get("mp_photos", ())]
+        climb.vl_photos = [Photo.restore(link, filename) for link, filename in data.get("vl_photos", ())]
+        return climb
 
     # Implement to minimize dependency on external code
-    def add_photo(self, link, folder):
+    def add_photo(self, link, folder, cancel = None):
         # Create a Photo instance and store it in the MP photos list
         # When Photo object is created, it is downloaded in either saved_images or search_images
-        self.mp_photos.append(Photo(link, self.name, folder))
+        # An optional CancelToken stops the download when the search is cancelled
+        self.mp_photos.append(Photo(link, self.name, folder, cancel))
 
     def string_basic_info(self):
         # Build a summary string for basic climb information
@@ -59,26 +107,21 @@ class Climb:
         result = [round(x / self.vl_ascents, 2) * 100 for x in data]
         return result
 
-    def string_descriptions(self):
-        # Build a header for MP descriptions
-        text = f"Description from MP ({len(self.mp_descriptions)}):\n"
-        text += f"{"-" * 133}\n"
-        # Append each description, quoted and separated by blank lines
-        for d in self.mp_descriptions:
-            text += f"\"{d}\"\n\n"
-        return text
+    def descriptions_page(self, page, page_size):
+        # One page of the descriptions panel: (text, page, pages)
+        return self._rendered.get(f"descriptions:{page}:{page_size}", [self.mp_descriptions], lambda: quoted_page(
+            [(f"Description from MP ({len(self.mp_descriptions)}):\n", self.mp_descriptions)], page, page_size, 133
+        ))
 
-    def string_comments(self):
-        # Header for MP comments
-        text = f"Comments from MP ({len(self.mp_comments)}):\n"
-        text += f"{"-" * 133}\n"
-        # Append each MP comment
-        for c in self.mp_comments:
-            text += f"\"{c}\"\n\n"
-        # Header for VL comments
-        text += f"\nComments from VL ({len(self.vl_comments)}):\n"
-        text += f"{"-" * 133}\n"
-        # Append each VL comment
-        for c in self.vl_comments:
-            text += f"\"{c}\"\n\n"
-        return text
+    def comments_page(self, page, page_size):
+        # One page of the comments panel; MP comments come first, then VL comments
+        return self._rendered.get(f"comments:{page}:{page_size}", [self.mp_comments, self.vl_comments], lambda: quoted_page([
+            (f"Comments from MP ({len(self.mp_comments)}):\n", self.mp_comments),
+            (f"\nComments from VL ({len(self.vl_comments)}):\n", self.vl_comments),
+        ], page, page_size, 133))
+
+    def prerender(self, page_size=PAGE_SIZE):
+        # Build the first page of each panel ahead of time (e.g. on a worker thread)
+        # so displaying the climb is a cache hit
+        self.descriptions_page(0, page_size)
+        self.comments_page(0, page_size)
@@ -1,7 +1,16 @@
-from Controller.Caculations.weather import get_weather_forecast
+from Controller.Caculations.weather_cache import FORECAST_CACHE
+from Model.climb import Climb
+# Linear-time panel rendering, cached until the source lists change
+from Model.rendered_text import TrackedList, RenderCache, quoted_page, PAGE_SIZE
 
 
 class ClimbingArea:
+    # Slotted like Climb, since every area of a search stays in memory
+    __slots__ = (
+        "aid", "state", "name", "lat", "long", "mt_proj_link", "distance",
+        "mp_descriptions", "mp_area_comments", "details_loaded", "climbs", "_rendered",
+    )
+
     def __init__(self, aid = None, state = None, name = None, lat = None, long = None, mt_proj_link = None):
         # Unique area identifier
         self.aid = aid
@@ -15,12 +24,41 @@ class ClimbingArea:
         self.long = long
         # Mountain Project URL for the area
         self.mt_proj_link = mt_proj_link
+        # Miles from the search point, set when a search schedules the area
+        self.distance = None
         # Descriptive texts from Mountain Project
-        self.mp_descriptions = []
+        self.mp_descriptions = TrackedList()
         # User comments on the area from Mountain Project
-        self.mp_area_comments = []
+        self.mp_area_comments = TrackedList()
+        # True once descriptions and comments have been scraped
+        self.details_loaded = False
         # List of Climb objects associated with this area
         self.climbs = []
+        # Panel text, rebuilt only when its lists change
+        self._rendered = RenderCache()
+
+    # Plain scalar fields copied as-is by to_dict/from_dict (session snapshots)
+    _SCALAR_FIELDS = ("aid", "state", "name", "lat", "long", "mt_proj_link", "distance", "details_loaded")
+
+    # Convert the area and its climbs to JSON-ready data
+    def to_dict(self):
+        data = {field: getattr(self, field) for field in self._SCALAR_FIELDS}
+        data["mp_descriptions"] = list(self.mp_descriptions)
+        data["mp_area_comments"] = list(self.mp_area_comments)
+        data["climbs"] = [climb.to_dict() for climb in self.climbs]
+        return data
+
+    # Inverse of to_dict
+    @classmethod
+    def from_dict(cls, data):
+        area = cls()
+        for field in cls._SCALAR_FIELDS:
+            if field in data:
+                setattr(area, field, data[field])
+        area.mp_descriptions.extend(data.get("mp_descriptions", ()))
+        area.mp_area_comments.extend(data.get("mp_area_comments", ()))
+        area.climbs = [Climb.from_dict(c) for c in data.get("climbs", ())]
+        return area
 
     # Testing: basic area info output
     def string_basic_info(self):
@@ -30,31 +68,34 @@ class ClimbingArea:
         text += f"{'-' * 50}\n"
         # Area name and coordinates
         text += f"Name:\n{self.name}\n\nCoordinates:\n{self.lat} {self.long}\n"
+        if self.distance is not None:
+            text += f"\nDistance:\n{self.distance:.1f} miles\n"
         return text
 
     # Fetch and return a weather forecast string
-    def string_weather(self):
-        # Use helper to call the weather API and format output
-        return get_weather_forecast(self.lat, self.long)
-
-    # Format all area descriptions into a single block
-    def string_area_descriptions(self):
-        # Header with count of descriptions
-        text = f"Area Descriptions from MP ({len(self.mp_descriptions)}):\n"
-        # Long separator for readability
-        text += f"{'-' * 141}\n"
-        # Append each description in quotes with blank line separators
-        for d in self.mp_descriptions:
-            text += f"\"{d}\"\n\n"
-        return text
+    def string_weather(self, placeholder = None):
+        # With a placeholder, never block: return it when the forecast isn't cached yet
+        if placeholder is not None:
+            cached = FORECAST_CACHE.peek(self.lat, self.long)
+            return placeholder if cached is None else cached
+        # Cached per grid cell, so only the first area in a cell calls the weather API
+        return FORECAST_CACHE.get(self.lat, self.long)
 
-    # Format all area comments into a single block
-    def string_area_comments(self):
-        # Header with count of comments
-        text = f"Area Comments ({len(self.mp_area_comments)}):\n"
-        # Separator line
-        text += f"{'-' * 133}\n"
-        # Append each comment in quotes with blank line separators
-        for c in self.mp_area_comments:
-            text += f"\"{c}\"\n\n"
-        return text
+    # One page of the descriptions panel: (text, page, pages)
+    def area_descriptions_page(self, page, page_size):
+        return self._rendered.get(f"descriptions:{page}:{page_size}", [self.mp_descriptions], lambda: quoted_page(
+            [(f"Area Descriptions from MP ({len(self.mp_descriptions)}):\n", self.mp_descriptions)], page, page_size, 141
+        ))
+
+    # One page of the comments panel: (text, page, pages)
+    def area_comments_page(self, page, page_size):
+        return self._rendered.get(f"comments:{page}:{page_size}", [self.mp_area_comments], lambda: quoted_page(
+            [(f"Area Comments ({len(self.mp_area_comments)}):\n", self.mp_area_comments)], page, page_size, 133
+        ))
+
+    # Build the first page of each panel of the area and its climbs ahead of time (e.g. on a worker thread)
+    def prerender(self, page_size=PAGE_SIZE):
+        self.area_descriptions_page(0, page_size)
+        self.area_comments_page(0, page_size)
+        for climb in self.climbs:
+            climb.prerender(page_size)
@@ -1,16 +1,20 @@
+import math
 import sys
 import time
 import logging
-from typing import List, Tuple, Dict, Optional
-
-import mysql.connector
-from haversine import haversine, Unit
+from typing import List, Tuple, Dict, Optional, TYPE_CHECKING
 
+from Controller.Caculations.area_stats import AreaStats
+from Controller.Caculations.climb_filter import ClimbFilter
 from Controller.Caculations.convert_unix_time import format_timestamp
-from Controller.Caculations.distance_caculator import get_coordinate_range
+from Controller.Caculations.distance_caculator import distance_miles, get_coordinate_range
+from Controller.instrumentation import timed
 from Model.climb import Climb
 from Model.climbing_area import ClimbingArea
 
+if TYPE_CHECKING:
+    import mysql.connector
+
 # ——— Configuration ———
 DB_CONFIG = {
     'host': 'localhost',
@@ -18,32 +22,112 @@ DB_CONFIG = {
     'user': 'root',
     'password': '1234',
 }
+# Rows beyond k fetched by nearest_areas before re-ranking by great-circle distance
+NEAREST_EXTRA_ROWS = 10
+
+# area_stats table: route aggregates recorded when the catalog is built,
+# used to skip areas with no routes in a search's type/grade range.
+# Grade columns hold ordinals from Controller/Caculations/grades.py
+AREA_STATS_TABLE = (
+    "CREATE TABLE IF NOT EXISTS area_stats ("
+    " AID INT UNSIGNED NOT NULL,"
+    " route_count INT UNSIGNED,"
+    " rope_count INT UNSIGNED,"
+    " boulder_count INT UNSIGNED,"
+    " other_count INT UNSIGNED,"
+    " mean_stars FLOAT,"
+    " rope_min FLOAT,"
+    " rope_max FLOAT,"
+    " rope_unknown INT UNSIGNED,"
+    " boulder_min FLOAT,"
+    " boulder_max FLOAT,"
+    " boulder_unknown INT UNSIGNED,"
+    " grade_histogram TEXT,"
+    " PRIMARY KEY (AID),"
+    " FOREIGN KEY (AID) REFERENCES climb_area(AID)"
+    ");"
+)
+# area_routes table: optional route catalog, one row per route on the area's
+# printable page, so searches can list climbs without scraping them first
+AREA_ROUTES_TABLE = (
+    "CREATE TABLE IF NOT EXISTS area_routes ("
+    " RID INT UNSIGNED NOT NULL AUTO_INCREMENT,"
+    " AID INT UNSIGNED NOT NULL,"
+    " climb_name VARCHAR(200),"
+    " climb_type VARCHAR(50),"
+    " mp_stars INT UNSIGNED,"
+    " num_mp_star INT UNSIGNED,"
+    " mp_grade VARCHAR(20),"
+    " mp_link VARCHAR(200),"
+    " PRIMARY KEY (RID),"
+    " INDEX (AID),"
+    " FOREIGN KEY (AID) REFERENCES climb_area(AID)"
+    ");"
+)
+# Tables added after the original schema; created on connect so databases
+# built by older versions of create_database keep working
+ADDED_TABLES = [AREA_STATS_TABLE, AREA_ROUTES_TABLE]
 
 # Set up module‐level logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
 
+class RecordNotFound(ValueError):
+    """No row with the requested ID (area, climb or climb index of an area)."""
+
+
+class _TimedCursor:
+    """
+    Cursor wrapper that times every statement as the "db" stage, labelled with its
+    SQL verb (SELECT, INSERT, ...). Everything else goes straight to the cursor.
+    """
+
+    def __init__(self, cursor: "mysql.connector.cursor.MySQLCursor") -> None:
+        self._cursor = cursor
+
+    def execute(self, query: str, params=()):
+        with timed("db", op=query.split(None, 1)[0].upper()):
+            return self._cursor.execute(query, params)
+
+    def executemany(self, query: str, seq_params):
+        with timed("db", op=query.split(None, 1)[0].upper()):
+            return self._cursor.executemany(query, seq_params)
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
 class Database:
     """
     Data access layer for climbing application.
     Manages connection, inserts, queries, and deletions.
     """
 
-    def __init__(self) -> None:
-        self.connection: Optional[mysql.connector.MySQLConnection] = None
-        self.cursor: Optional[mysql.connector.cursor.MySQLCursor] = None
+    def __init__(self, database: Optional[str] = None) -> None:
+        """
+        Args:
+            database: Database to use instead of DB_CONFIG's (e.g. the benchmark's scratch database).
+        """
+        self.database = database or DB_CONFIG["database"]
+        self.connection: Optional["mysql.connector.MySQLConnection"] = None
+        self.cursor: Optional["mysql.connector.cursor.MySQLCursor"] = None
 
     def connect_to_database(self) -> None:
         """
         Establish a MySQL connection using DB_CONFIG.
         Exits on failure.
         """
-        self.connection = mysql.connector.connect(**DB_CONFIG)
+        # mysql-connector is a slow import; load it when the first connection is made
+        import mysql.connector
+
+        self.connection = mysql.connector.connect(**{**DB_CONFIG, "database": self.database})
         if not self.connection.is_connected():
             logger.error("Couldn't connect to database")
             sys.exit(1)
-        self.cursor = self.connection.cursor()
+        self.cursor = _TimedCursor(self.connection.cursor())
+        for table in ADDED_TABLES:
+            self._execute(table, ())
 
     def _execute(self, query: str, params: Tuple) -> None:
         """
@@ -74,6 +158,41 @@ class Database:
             (aid, area_name, latitude, longitude, mt_proj_link, state)
         )
 
+    def insert_area_stats(self, aid: int, stats: AreaStats) -> None:
+        """
+        Insert (or replace) the route statistics of a climbing area.
+        """
+        self._execute(
+            """
+            REPLACE INTO area_stats
+              (AID, route_count, rope_count, boulder_count, other_count, mean_stars,
+               rope_min, rope_max, rope_unknown, boulder_min, boulder_max, boulder_unknown,
+               grade_histogram)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+            (aid, *stats.to_row())
+        )
+
+    def insert_area_routes(self, aid: int, climbs: List[Climb]) -> None:
+        """
+        Store the route catalog of one area: the route-table fields of each climb.
+        """
+        if not climbs:
+            return
+        assert self.cursor is not None, "Database not connected"
+        self.cursor.executemany(
+            """
+            INSERT INTO area_routes
+              (AID, climb_name, climb_type, mp_stars, num_mp_star, mp_grade, mp_link)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            [
+                (aid, c.name, c.type, c.mp_stars, _int_or_none(c.num_mp_stars), c.mp_grade, c.mp_link)
+                for c in climbs
+            ]
+        )
+        self.connection.commit()
+
     def insert_saved_climb(self, area: ClimbingArea, climb: Climb) -> None:
         """
         Save all data for one climb transactionally.
@@ -156,31 +275,162 @@ class Database:
         )
 
     def search_db_for_areas(
-        self, latitude: float, longitude: float, distance: float
+        self, latitude: float, longitude: float, distance: float,
+        climb_filter: Optional[ClimbFilter] = None
     ) -> List[ClimbingArea]:
         """
         Retrieve all areas within `distance` miles of (latitude, longitude).
+
+        With `climb_filter`, areas whose recorded route stats show no route of the
+        requested type and grade range are dropped. The SQL query rules areas out by
+        type counts and grade bounds; the grade histogram then catches areas whose
+        routes straddle the range without falling in it. Areas with no stats are kept.
         """
         coord_range = get_coordinate_range(latitude, longitude, distance)
+        params = [
+            coord_range["min_lat"],
+            coord_range["max_lat"],
+            coord_range["min_lng"],
+            coord_range["max_lng"],
+        ]
+        stats_condition = ""
+        if climb_filter is not None:
+            condition, condition_params = self._stats_condition(climb_filter)
+            stats_condition = f"AND (s.AID IS NULL OR {condition})"
+            params.extend(condition_params)
+
+        self.cursor.execute(
+            f"""
+            SELECT a.AID, a.area_name, a.latitude, a.longitude, a.mt_proj_link, a.state,
+                   s.route_count, s.rope_count, s.boulder_count, s.other_count, s.mean_stars,
+                   s.rope_min, s.rope_max, s.rope_unknown,
+                   s.boulder_min, s.boulder_max, s.boulder_unknown, s.grade_histogram
+            FROM climb_area a
+            LEFT JOIN area_stats s ON s.AID = a.AID
+            WHERE a.latitude BETWEEN %s AND %s
+              AND a.longitude BETWEEN %s AND %s
+              {stats_condition}
+            """,
+            tuple(params)
+        )
+        areas = []
+        skipped = 0
+        for (aid, name, lat, lon, link, state, *stats_row) in self.cursor.fetchall():
+            if climb_filter is not None and stats_row[0] is not None:
+                if not AreaStats.from_row(tuple(stats_row)).could_match(climb_filter):
+                    skipped += 1
+                    continue
+            areas.append(ClimbingArea(aid, state, name, lat, lon, link))
+        if skipped:
+            logger.info("Skipped %d areas with no routes in the histogram range", skipped)
+        return areas
+
+    def nearest_areas(self, latitude: float, longitude: float, k: int) -> List[ClimbingArea]:
+        """
+        The `k` areas closest to (latitude, longitude), nearest first, with `distance` set.
+
+        MySQL orders by a flat-earth distance (longitude scaled by cos(latitude)),
+        which ranks nearby areas like the great-circle distance does. A few extra
+        rows are fetched and re-ranked by great-circle distance to absorb the error.
+        """
+        lon_scale = math.cos(math.radians(latitude))
         self.cursor.execute(
             """
             SELECT AID, area_name, latitude, longitude, mt_proj_link, state
             FROM climb_area
-            WHERE latitude BETWEEN %s AND %s
-              AND longitude BETWEEN %s AND %s
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            ORDER BY POW(latitude - %s, 2) + POW((longitude - %s) * %s, 2)
+            LIMIT %s
             """,
-            (
-                coord_range["min_lat"],
-                coord_range["max_lat"],
-                coord_range["min_lng"],
-                coord_range["max_lng"],
-            )
+            (latitude, longitude, lon_scale, k + NEAREST_EXTRA_ROWS)
         )
-        rows = self.cursor.fetchall()
-        return [
-            ClimbingArea(aid, state, name, lat, lon, link)
-            for (aid, name, lat, lon, link, state) in rows
-        ]
+        areas = []
+        for (aid, name, lat, lon, link, state) in self.cursor.fetchall():
+            area = ClimbingArea(aid, state, name, lat, lon, link)
+            area.distance = distance_miles(latitude, longitude, lat, lon)
+            areas.append(area)
+        areas.sort(key=lambda a: a.distance)
+        return areas[:k]
+
+    def next_free_aid(self) -> int:
+        """One past the highest AID stored, so a resumed crawl doesn't reuse AIDs."""
+        self.cursor.execute("SELECT COALESCE(MAX(AID), -1) + 1 FROM climb_area")
+        return int(self.cursor.fetchone()[0])
+
+    def get_area(self, aid: int) -> ClimbingArea:
+        """
+        Basic fields of one area (no descriptions, comments or climbs).
+        Raises RecordNotFound if there is no such area.
+        """
+        self.cursor.execute(
+            "SELECT AID, area_name, latitude, longitude, mt_proj_link, state"
+            " FROM climb_area WHERE AID = %s",
+            (aid,)
+        )
+        row = self.cursor.fetchone()
+        if not row:
+            raise RecordNotFound(f"No area with AID={aid!r}")
+        aid, name, lat, lon, link, state = row
+        return ClimbingArea(aid, state, name, lat, lon, link)
+
+    @staticmethod
+    def _stats_condition(climb_filter: ClimbFilter) -> Tuple[str, List]:
+        """
+        SQL condition on area_stats (aliased `s`) that is true when an area may hold
+        a climb `climb_filter` accepts. Unknown grades count as a possible match.
+        """
+        clauses: List[str] = []
+        params: List = []
+        if climb_filter.climbing_type == "All":
+            clauses.append("s.other_count > 0")
+        for wanted, prefix, (low, high) in (
+            (climb_filter.wants_rope(), "rope", climb_filter.rope_range),
+            (climb_filter.wants_boulder(), "boulder", climb_filter.boulder_range),
+        ):
+            if not wanted:
+                continue
+            bounds = []
+            if low is not None:
+                bounds.append(f"s.{prefix}_max >= %s")
+                params.append(low)
+            if high is not None:
+                bounds.append(f"s.{prefix}_min <= %s")
+                params.append(high)
+            in_range = " AND ".join(bounds) or "TRUE"
+            clauses.append(f"(s.{prefix}_count > 0 AND (s.{prefix}_unknown > 0 OR ({in_range})))")
+        return " OR ".join(clauses) or "FALSE", params
+
+    def get_routes_for_areas(self, aids: List[int]) -> Dict[int, List[Climb]]:
+        """
+        Load the catalogued routes of several areas in one query.
+        Climbs carry only route-table fields and `mp_link`; details are fetched on demand.
+
+        Returns:
+            {AID: [Climb, ...]} for areas that have catalog rows, in page order.
+        """
+        routes: Dict[int, List[Climb]] = {}
+        if not aids:
+            return routes
+        placeholders = ", ".join(["%s"] * len(aids))
+        self.cursor.execute(
+            f"""
+            SELECT AID, climb_name, climb_type, mp_stars, num_mp_star, mp_grade, mp_link
+            FROM area_routes
+            WHERE AID IN ({placeholders})
+            ORDER BY AID, RID
+            """,
+            tuple(aids)
+        )
+        for (aid, name, climb_type, stars, num_stars, grade, link) in self.cursor.fetchall():
+            climb = Climb()
+            climb.name, climb.mp_link = name, link
+            # Shared by many rows; store one copy of each
+            climb.type = sys.intern(climb_type) if climb_type else climb_type
+            climb.mp_grade = sys.intern(grade) if grade else grade
+            climb.mp_stars = stars
+            climb.num_mp_stars = None if num_stars is None else str(num_stars)
+            routes.setdefault(aid, []).append(climb)
+        return routes
 
     def get_all_saved_climb_names(self) -> List[str]:
         """
@@ -223,7 +473,7 @@ class Database:
         )
         row = self.cursor.fetchone()
         if not row:
-            raise ValueError(f"No climb with CID={cid!r}")
+            raise RecordNotFound(f"No climb with CID={cid!r}")
         (
             aid, climb.name, climb.type, climb.mp_stars, climb.num_mp_stars,
             climb.mp_grade, climb.vl_ascents, climb.vl_recommends,
@@ -273,7 +523,7 @@ class Database:
         )
         row = self.cursor.fetchone()
         if not row:
-            raise ValueError(f"No area with AID={aid!r}")
+            raise RecordNotFound(f"No area with AID={aid!r}")
         area.name, area.lat, area.long, area.state = row
 
     def _get_area_descriptions(self, area: ClimbingArea, aid: int) -> None:
@@ -304,3 +554,11 @@ class Database:
             self.cursor.close()
         if self.connection:
             self.connection.close()
+
+
+def _int_or_none(value) -> Optional[int]:
+    """Rating counts are scraped as text (e.g. "12"); store them as integers."""
+    try:
+        return int(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
@@ -1,20 +1,62 @@
 import os
+import threading
+from contextlib import contextmanager
 
-import requests
+from Controller.instrumentation import count, timed
+from Controller.Scrapers.cancellation import check, ScrapeCancelled
+from Controller.Scrapers.rate_limits import throttle
+from Controller.Scrapers.stage_limits import stage
+
+# Seconds before a stalled image download is abandoned
+DOWNLOAD_TIMEOUT = 15
+
+_local = threading.local()
+
+
+@contextmanager
+def links_only():
+    # Photos created by the current thread inside the block keep their link and
+    # filename but aren't downloaded (background refreshes: the viewer's folder is
+    # emptied on every search, and restored photos are downloaded when shown)
+    previous = getattr(_local, "links_only", False)
+    _local.links_only = True
+    try:
+        yield
+    finally:
+        _local.links_only = previous
 
 
 class Photo:
     # A model representing a downloadable image for a climb
-    def __init__(self, link, climb_name, folder):
+    __slots__ = ("filename", "link")
+
+    def __init__(self, link, climb_name, folder, cancel = None):
         # Construct a filename by combining the climb name with the URL's basename (strip query params)
         self.filename = climb_name + link.split("/")[-1].split("?")[0]
         # Store the image URL for later download
         self.link = link
-        # Trigger immediate download into the specified folder
-        self.download_image(folder)
+        # Trigger immediate download into the specified folder, unless inside links_only()
+        if not getattr(_local, "links_only", False):
+            self.download_image(folder, cancel)
+
+    # Rebuild a Photo from a saved link and filename without downloading it again
+    @classmethod
+    def restore(cls, link, filename):
+        photo = cls.__new__(cls)
+        photo.link = link
+        photo.filename = filename
+        return photo
+
+    # Local path of the image inside View/images/<folder>
+    def path(self, folder):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.normpath(
+            os.path.join(current_dir, '..', 'View', 'images', folder, self.filename)
+        )
 
     # Download the image from self.link into the given folder
-    def download_image(self, folder):
+    # cancel is an optional CancelToken, checked between chunks
+    def download_image(self, folder, cancel = None):
         # Determine this script's directory
         current_dir = os.path.dirname(os.path.abspath(__file__))
         # Build target folder path relative to project: ../View/images/<folder>
@@ -28,17 +70,34 @@ class Photo:
         # Full filesystem path for saving the image
         save_path = os.path.join(target_folder, self.filename)
 
+        # Imported on first use to keep application startup light
+        import requests
+        from Controller.Scrapers import http_archive
+
         try:
-            # Stream the HTTP GET to avoid loading entire content at once
-            response = requests.get(self.link, stream=True)
-            # Raise on HTTP error status codes (4xx/5xx)
-            response.raise_for_status()
-            # Write the content to file in chunks
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(1024):
-                    f.write(chunk)
+            check(cancel)
+            # Background refreshes stay within the image host's request budget
+            throttle(self.link, cancel)
+            # Limit concurrent downloads across all search workers
+            # Timed from the request to the last chunk written
+            with stage("photo"), timed("photo", self.link):
+                # Stream the HTTP GET to avoid loading entire content at once
+                response = http_archive.get(self.link, stream=True, timeout=DOWNLOAD_TIMEOUT)
+                # Raise on HTTP error status codes (4xx/5xx)
+                response.raise_for_status()
+                # Write the content to file in chunks
+                with open(save_path, 'wb') as f:
+                    for chunk in response.iter_content(1024):
+                        check(cancel)
+                        f.write(chunk)
+            count("bytes", os.path.getsize(save_path), url=self.link)
             # Return the local path if successful
             return save_path
+        except ScrapeCancelled:
+            # Don't leave a half-written image behind for the photo viewer
+            if os.path.exists(save_path):
+                os.remove(save_path)
+            raise
         except requests.exceptions.RequestException as e:
             # Print an error message if download fails
             print(f"❌ Failed to download image: {e}")
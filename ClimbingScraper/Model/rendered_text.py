@@ -0,0 +1,93 @@
+# Helpers for the text panels of Climb and ClimbingArea:
+# panels are built with a single join (linear in the text size) and cached on the model
+# until one of the lists they were built from changes.
+
+import sys
+
+# Entries per page of a description/comment panel; the GUI shows one page at a time
+PAGE_SIZE = 20
+
+
+class TrackedList(list):
+    # A list that counts its own mutations, so cached text built from it can tell it is stale
+    # (a plain list that is appended to or replaced is still detected through len and id)
+    __slots__ = ("version",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+
+def _tracked(name):
+    # Wrap a list mutator so it bumps the version after running
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(TrackedList, _name, _tracked(_name))
+
+
+def quoted_block(header, items, width):
+    # Header line, a dashed rule `width` wide, then each item in quotes followed by a blank line
+    return "".join([header, "-" * width, "\n", *[f"\"{item}\"\n\n" for item in items]])
+
+
+class RenderCache:
+    # Memoizes rendered panels per model instance, keyed on the state of their source lists
+    __slots__ = ("_entries",)
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, name, sources, build):
+        # Return the cached text for `name` unless a source list has changed since it was built
+        # The lists themselves are kept (not their ids), so a replaced list is never mistaken for the old one
+        state = [(getattr(s, "version", 0), len(s)) for s in sources]
+        entry = self._entries.get(name)
+        if entry is not None:
+            old_sources, old_state, text = entry
+            if old_state == state and all(a is b for a, b in zip(old_sources, sources)):
+                return text
+        text = build()
+        self._entries[name] = (list(sources), state, text)
+        return text
+
+    def clear(self):
+        # Drop every panel, releasing the text and the source lists it kept
+        self._entries.clear()
+
+    def nbytes(self):
+        # Approximate memory held by the cached text (paged entries are (text, page, pages))
+        total = 0
+        for _, _, text in self._entries.values():
+            total += sys.getsizeof(text[0] if isinstance(text, tuple) else text)
+        return total
+
+
+def quoted_page(sections, page, page_size, width):
+    # One page of a panel made of (header, items) sections, e.g. MP then VL comments.
+    # Every section keeps its header; only the items falling on `page` are rendered,
+    # so the cost depends on page_size, not on how many items there are.
+    # Returns (text, page, pages) with `page` clamped to the valid range.
+    total = sum(len(items) for _, items in sections)
+    pages = max(1, -(-total // page_size))
+    page = min(max(page, 0), pages - 1)
+    start, end = page * page_size, (page + 1) * page_size
+    parts = []
+    offset = 0
+    for header, items in sections:
+        lo, hi = max(start - offset, 0), min(end - offset, len(items))
+        parts.append(quoted_block(header, items[lo:hi] if lo < hi else [], width))
+        offset += len(items)
+    return "".join(parts), page, pages
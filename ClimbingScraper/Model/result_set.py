@@ -0,0 +1,133 @@
+import math
+import sys
+from array import array
+from itertools import compress
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.Caculations.grades import BOULDER, ROUTE, parse_grade, sort_indices
+from Model.climb import Climb
+from Model.climbing_area import ClimbingArea
+
+# Numeric columns, each an array('d') with NaN where the value is missing.
+# Route (YDS/French) and boulder (V/Font) ordinals aren't comparable, so each has its own
+# column and a climb has a value in at most one of them.
+NUMERIC_COLUMNS = (
+    "mp_stars", "num_mp_stars", "vl_ascents", "vl_onsite_rate", "route_grade", "boulder_grade", "distance"
+)
+# Sort keys: the numeric columns, plus "grade" for routes then boulders, each by difficulty
+SORT_KEYS = NUMERIC_COLUMNS + ("grade",)
+
+
+def _number(value) -> float:
+    """Scraped numbers arrive as ints, floats or text such as "1,204"; NaN if missing."""
+    if value is None:
+        return math.nan
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return math.nan
+
+
+class ClimbResultSet:
+    """
+    Columnar view over the climbs of a search: one row per climb, numeric fields in
+    typed arrays and repeated strings (types, grades, area names) interned.
+    Sorting and filtering work column by column without touching the Climb objects,
+    which stay reachable through `row(i)` for display.
+    """
+    __slots__ = ("areas", "area_index", "climbs", "names", "types", "grades") + NUMERIC_COLUMNS
+
+    def __init__(self) -> None:
+        self.areas: List[ClimbingArea] = []
+        self.area_index = array("I")          # row -> index into self.areas
+        self.climbs: List[Climb] = []
+        self.names: List[str] = []
+        self.types: List[Optional[str]] = []
+        self.grades: List[Optional[str]] = []
+        for column in NUMERIC_COLUMNS:
+            setattr(self, column, array("d"))
+
+    @classmethod
+    def from_areas(cls, areas: Iterable[ClimbingArea]) -> "ClimbResultSet":
+        result_set = cls()
+        for area in areas:
+            result_set.add_area(area)
+        return result_set
+
+    def __len__(self) -> int:
+        return len(self.climbs)
+
+    def add_area(self, area: ClimbingArea) -> None:
+        """Append one row per climb of `area`."""
+        index = len(self.areas)
+        self.areas.append(area)
+        distance = _number(area.distance)
+        for climb in area.climbs:
+            self.area_index.append(index)
+            self.climbs.append(climb)
+            self.names.append(climb.name)
+            self.types.append(sys.intern(climb.type) if climb.type else climb.type)
+            self.grades.append(sys.intern(climb.mp_grade) if climb.mp_grade else climb.mp_grade)
+            self.mp_stars.append(_number(climb.mp_stars))
+            self.num_mp_stars.append(_number(climb.num_mp_stars))
+            self.vl_ascents.append(_number(climb.vl_ascents))
+            self.vl_onsite_rate.append(_number(climb.vl_onsite_rate))
+            scale, ordinal = parse_grade(climb.mp_grade, climb.type) or (None, math.nan)
+            self.route_grade.append(ordinal if scale == ROUTE else math.nan)
+            self.boulder_grade.append(ordinal if scale == BOULDER else math.nan)
+            self.distance.append(distance)
+
+    def row(self, i: int) -> Tuple[ClimbingArea, Climb]:
+        """The (area, climb) behind row `i`."""
+        return self.areas[self.area_index[i]], self.climbs[i]
+
+    def column(self, name: str) -> array:
+        """One of NUMERIC_COLUMNS."""
+        if name not in NUMERIC_COLUMNS:
+            raise KeyError(f"Unknown column {name!r}")
+        return getattr(self, name)
+
+    def sort(self, by: str, reverse: bool = False, rows: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        Row indices ordered by a column; missing values always come last.
+
+        Args:
+            by:      One of SORT_KEYS. "grade" orders routes, then boulders, then
+                     climbs with an unknown grade; `reverse` flips each scale separately.
+            reverse: Largest first.
+            rows:    Optional subset of rows (e.g. from `filter`) to order.
+        """
+        if rows is None:
+            rows = range(len(self.climbs))
+        if by != "grade":
+            return self._sort_column(self.column(by), rows, reverse)
+        routes = self._sort_column(self.route_grade, rows, reverse)
+        known_routes = sum(1 for i in routes if self.route_grade[i] == self.route_grade[i])
+        boulders = self._sort_column(self.boulder_grade, routes[known_routes:], reverse)
+        return routes[:known_routes] + boulders
+
+    @staticmethod
+    def _sort_column(values: array, rows: Sequence[int], reverse: bool) -> List[int]:
+        subset = array("d", map(values.__getitem__, rows))
+        return [rows[i] for i in sort_indices(subset, reverse)]
+
+    def filter(
+        self,
+        climb_filter: Optional[ClimbFilter] = None,
+        min_stars: Optional[float] = None,
+        max_distance: Optional[float] = None
+    ) -> List[int]:
+        """
+        Row indices that pass every given condition. Each condition builds a mask
+        over a whole column; the grade/type check runs once per distinct (grade, type) pair.
+        """
+        mask = [True] * len(self.climbs)
+        if min_stars is not None:
+            mask = [ok and stars >= min_stars for ok, stars in zip(mask, self.mp_stars)]
+        if max_distance is not None:
+            mask = [ok and distance <= max_distance for ok, distance in zip(mask, self.distance)]
+        if climb_filter is not None:
+            accepted = {key: climb_filter.accepts(*key) for key in set(zip(self.grades, self.types))}
+            mask = [ok and accepted[key] for ok, key in zip(mask, zip(self.grades, self.types))]
+        return list(compress(range(len(self.climbs)), mask))
@@ -0,0 +1,239 @@
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from Model.climbing_area import ClimbingArea
+from Model.rendered_text import TrackedList
+
+# ——— Module-level configuration ———
+# Heavy text (descriptions, comments, rendered panels) kept in memory across all result areas
+MEMORY_BUDGET_MB = float(os.environ.get("CLIMBING_RESULT_BUDGET_MB", 256))
+# Areas on each side of the displayed one that are never spilled
+KEEP_NEIGHBOURS = 2
+# Folder of the spill database; it is deleted when the store is closed
+SPILL_DIR = os.environ.get("CLIMBING_SPILL_DIR", tempfile.gettempdir())
+COMPRESS_LEVEL = 1
+
+# List fields moved to disk when an area is spilled; scalars, climbs and photos stay
+_AREA_HEAVY = ("mp_descriptions", "mp_area_comments")
+_CLIMB_HEAVY = ("mp_descriptions", "mp_comments", "vl_comments")
+
+logger = logging.getLogger(__name__)
+
+# Entry shape used by SearchTab.result_queue
+ResultEntry = Dict[str, Any]
+
+
+def _list_bytes(items: Iterable[str]) -> int:
+    return sum(sys.getsizeof(item) for item in items)
+
+
+def heavy_size(area: ClimbingArea) -> int:
+    """Approximate bytes of spillable text held by an area and its climbs."""
+    total = area._rendered.nbytes()
+    for field in _AREA_HEAVY:
+        total += _list_bytes(getattr(area, field))
+    for climb in area.climbs:
+        total += climb._rendered.nbytes()
+        for field in _CLIMB_HEAVY:
+            total += _list_bytes(getattr(climb, field))
+    return total
+
+
+class ResultStore:
+    """
+    The search results ({"area", "c_index"} entries in browsing order) under a memory budget.
+
+    Behaves like the list it replaces (len, indexing, iteration, append, clear).
+    When the heavy text of the resident areas exceeds the budget, the areas farthest
+    from the displayed one have their descriptions and comments moved to a SQLite
+    file and their rendered panels dropped. `touch(index)` brings an area (and its
+    neighbours) back before it is displayed. The ClimbingArea and Climb objects
+    themselves are never replaced, so references held by the GUI or the detail
+    loader stay valid.
+    """
+
+    def __init__(self, budget_mb: float = MEMORY_BUDGET_MB, keep: int = KEEP_NEIGHBOURS) -> None:
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.keep = keep
+        self.entries: List[ResultEntry] = []
+        self.current = 0
+        # id(area) -> estimated heavy bytes, for areas whose text is in memory
+        self._resident: Dict[int, int] = {}
+        self._spilled = set()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._path: Optional[str] = None
+
+    # ——— List interface ———
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def __iter__(self) -> Iterator[ResultEntry]:
+        return iter(self.entries)
+
+    def append(self, entry: ResultEntry) -> None:
+        self.entries.append(entry)
+        self._resident[id(entry["area"])] = heavy_size(entry["area"])
+        self._enforce()
+
+    def clear(self) -> None:
+        """Drop every result and empty the spill file."""
+        self.entries.clear()
+        self.current = 0
+        self._resident.clear()
+        self._spilled.clear()
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM spill")
+            self._conn.commit()
+
+    def replace(self, entries: Iterable[ResultEntry], current: int = 0) -> None:
+        """
+        Swap in a new result list (e.g. a restored session), spilling as needed.
+        Areas are taken one at a time: once the budget is reached, each area outside
+        the window around `current` is spilled before the next one is read, so a
+        streamed session never holds much more than the budget.
+        """
+        self.clear()
+        self.current = current
+        total = 0
+        for entry in entries:
+            area = entry["area"]
+            index = len(self.entries)
+            self.entries.append(entry)
+            size = self._resident[id(area)] = heavy_size(area)
+            total += size
+            if total > self.budget and abs(index - current) > self.keep:
+                self._spill(area)
+                total -= size
+        self.touch(current)
+
+    # ——— Residency ———
+    def touch(self, index: int) -> ClimbingArea:
+        """
+        Make `index` the displayed area: load it and its neighbours back from disk
+        if they were spilled, then spill far areas if the budget is exceeded.
+
+        Returns:
+            The area at `index`, with all its fields in memory.
+        """
+        self.current = index
+        for i in self._window():
+            area = self.entries[i]["area"]
+            if id(area) in self._spilled:
+                self._load(area)
+            # Neighbours are the areas the detail loader fills in, so their sizes are refreshed
+            self._resident[id(area)] = heavy_size(area)
+        self._enforce()
+        return self.entries[index]["area"]
+
+    def is_spilled(self, area: ClimbingArea) -> bool:
+        return id(area) in self._spilled
+
+    def resident_bytes(self) -> int:
+        return sum(self._resident.values())
+
+    def area_dict(self, area: ClimbingArea) -> Dict[str, Any]:
+        """area.to_dict() including the text of a spilled area, without loading it back."""
+        data = area.to_dict()
+        if id(area) not in self._spilled:
+            return data
+        stored = self._read(area)
+        for field in _AREA_HEAVY:
+            data[field] = stored["area"][field] + data[field]
+        for climb_data, climb_stored in zip(data["climbs"], stored["climbs"]):
+            for field in _CLIMB_HEAVY:
+                climb_data[field] = climb_stored[field] + climb_data[field]
+        return data
+
+    def close(self) -> None:
+        """Delete the spill file."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
+
+    def _window(self) -> range:
+        return range(max(self.current - self.keep, 0), min(self.current + self.keep + 1, len(self.entries)))
+
+    def _enforce(self) -> None:
+        """Spill resident areas, farthest from the displayed one first, until under budget."""
+        total = self.resident_bytes()
+        if total <= self.budget:
+            return
+        window = self._window()
+        candidates = sorted(
+            (i for i in range(len(self.entries))
+             if i not in window and id(self.entries[i]["area"]) in self._resident),
+            key=lambda i: abs(i - self.current), reverse=True
+        )
+        for i in candidates:
+            if total <= self.budget:
+                break
+            area = self.entries[i]["area"]
+            total -= self._resident.get(id(area), 0)
+            self._spill(area)
+        logger.debug("Result store: %d areas spilled, %.1f MB resident",
+                     len(self._spilled), total / 1024 / 1024)
+
+    # ——— Spill file ———
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            fd, self._path = tempfile.mkstemp(prefix="climbing-results-", suffix=".sqlite", dir=SPILL_DIR)
+            os.close(fd)
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute("PRAGMA journal_mode=OFF")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS spill (key INTEGER PRIMARY KEY, data BLOB)")
+        return self._conn
+
+    def _spill(self, area: ClimbingArea) -> None:
+        """Write the area's heavy lists to disk and replace them with empty ones."""
+        data = {
+            "area": {field: list(getattr(area, field)) for field in _AREA_HEAVY},
+            "climbs": [{field: list(getattr(climb, field)) for field in _CLIMB_HEAVY} for climb in area.climbs],
+        }
+        blob = zlib.compress(json.dumps(data, separators=(",", ":")).encode(), COMPRESS_LEVEL)
+        conn = self._db()
+        conn.execute("INSERT OR REPLACE INTO spill (key, data) VALUES (?, ?)", (id(area), blob))
+        conn.commit()
+
+        # Fresh lists rather than clearing the old ones: cached panels still hold the
+        # old lists, and anything appended while spilled is kept on load
+        for field in _AREA_HEAVY:
+            setattr(area, field, TrackedList())
+        area._rendered.clear()
+        for climb in area.climbs:
+            for field in _CLIMB_HEAVY:
+                setattr(climb, field, TrackedList())
+            climb._rendered.clear()
+        self._resident.pop(id(area), None)
+        self._spilled.add(id(area))
+
+    def _read(self, area: ClimbingArea) -> Dict[str, Any]:
+        row = self._db().execute("SELECT data FROM spill WHERE key = ?", (id(area),)).fetchone()
+        return json.loads(zlib.decompress(row[0]))
+
+    def _load(self, area: ClimbingArea) -> None:
+        """Put a spilled area's lists back, ahead of anything added since it was spilled."""
+        stored = self._read(area)
+        for field in _AREA_HEAVY:
+            setattr(area, field, TrackedList(stored["area"][field] + getattr(area, field)))
+        for climb, climb_stored in zip(area.climbs, stored["climbs"]):
+            for field in _CLIMB_HEAVY:
+                setattr(climb, field, TrackedList(climb_stored[field] + getattr(climb, field)))
+        self._db().execute("DELETE FROM spill WHERE key = ?", (id(area),))
+        self._spilled.discard(id(area))
+        self._resident[id(area)] = heavy_size(area)
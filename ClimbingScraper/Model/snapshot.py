@@ -0,0 +1,202 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Model.climbing_area import ClimbingArea
+
+# ——— Module-level configuration ———
+SNAPSHOT_DIR = Path(os.environ.get(
+    "CLIMBING_SNAPSHOT_DIR", Path(__file__).resolve().parent.parent / "snapshots"
+))
+SNAPSHOT_EXT = ".snap"
+AUTOSAVE_NAME = "autosave"     # written when the app exits
+COMPRESS_LEVEL = 6
+
+# File layout (all integers little-endian):
+#   MAGIC | version (uint16) | header length (uint32) | header JSON | area blobs
+# The header lists every area's name, climb count, navigation index and the
+# offset/length of its blob (zlib-compressed JSON of ClimbingArea.to_dict()),
+# relative to the end of the header.
+MAGIC = b"CLIMBSNP"
+VERSION = 1
+_PREFIX = struct.Struct("<8sHI")
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotError(Exception):
+    """Raised for files that aren't snapshots or were written by a newer version."""
+
+
+# Entry shape used by SearchTab.result_queue
+ResultEntry = Dict[str, Any]
+
+
+def save_snapshot(
+    entries: Iterable[ResultEntry],
+    queue_ind: int = 0,
+    path: Optional[Path] = None,
+    label: Optional[str] = None,
+    origin: Optional[Tuple[float, float]] = None,
+    area_to_dict: Callable[[ClimbingArea], Dict[str, Any]] = ClimbingArea.to_dict
+) -> Path:
+    """
+    Write a search session to a snapshot file.
+
+    Args:
+        entries:   Result queue entries, {"area": ClimbingArea, "c_index": int}.
+        queue_ind: Index of the displayed area.
+        path:      Target file; defaults to a timestamped file in SNAPSHOT_DIR.
+        label:     Name shown in the session list.
+        origin:    (latitude, longitude) the search was run from.
+        area_to_dict: Serializer for one area, e.g. ResultStore.area_dict for spilled areas.
+
+    Returns:
+        Path: The written file. It is replaced atomically, so a crash never leaves half a snapshot.
+    """
+    created = time.time()
+    if path is None:
+        path = SNAPSHOT_DIR / f"session-{time.strftime('%Y%m%d-%H%M%S', time.localtime(created))}{SNAPSHOT_EXT}"
+    path = Path(path)
+
+    blobs: List[bytes] = []
+    index = []
+    offset = 0
+    for entry in entries:
+        area = entry["area"]
+        blob = zlib.compress(json.dumps(area_to_dict(area), separators=(",", ":")).encode(), COMPRESS_LEVEL)
+        index.append({
+            "name": area.name, "climbs": len(area.climbs), "c_index": entry["c_index"],
+            "offset": offset, "length": len(blob),
+        })
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        "created": created,
+        "label": label or path.stem,
+        "origin": list(origin) if origin else None,
+        "queue_ind": queue_ind,
+        "areas": index,
+    }, separators=(",", ":")).encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+    logger.info("Saved %d areas to %s (%d bytes)", len(index), path.name, path.stat().st_size)
+    return path
+
+
+def _read_header(buf) -> Tuple[Dict[str, Any], int]:
+    """Parse the prefix and header of a mapped snapshot; returns (header, data offset)."""
+    if len(buf) < _PREFIX.size:
+        raise SnapshotError("File too short")
+    magic, version, header_len = _PREFIX.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise SnapshotError("Not a session snapshot")
+    if version > VERSION:
+        raise SnapshotError(f"Snapshot version {version} is newer than supported version {VERSION}")
+    start = _PREFIX.size
+    header = json.loads(bytes(buf[start:start + header_len]))
+    header["version"] = version
+    return header, start + header_len
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """
+    Read only a snapshot's header (label, creation time, area list), for listing sessions.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise SnapshotError("File too short")
+        _, _, header_len = _PREFIX.unpack(prefix)
+        header, _ = _read_header(prefix + f.read(header_len))
+    return header
+
+
+def open_snapshot(path: Path) -> Tuple[Iterator[ResultEntry], int, Dict[str, Any]]:
+    """
+    Restore a search session one area at a time. Only the header is read up front;
+    each area is decompressed when the returned iterator reaches it, so a consumer
+    such as ResultStore.replace can spill areas before the next one is decoded.
+    The file is memory-mapped until the iterator is exhausted.
+
+    Raises:
+        SnapshotError: From the call for a bad header, from the iterator for a damaged area.
+
+    Returns:
+        (iterator of result queue entries, displayed area index, header)
+    """
+    f = open(path, "rb")
+    try:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        f.close()
+        raise
+    try:
+        header, data_start = _read_header(buf)
+    except BaseException:
+        buf.close()
+        f.close()
+        raise
+    if not header["areas"]:
+        buf.close()
+        f.close()
+        return iter(()), 0, header
+
+    def entries() -> Iterator[ResultEntry]:
+        with f, buf:
+            for item in header["areas"]:
+                start = data_start + item["offset"]
+                try:
+                    data = json.loads(zlib.decompress(buf[start:start + item["length"]]))
+                except (zlib.error, ValueError) as e:
+                    raise SnapshotError(f"Damaged area {item.get('name')!r}: {e}") from e
+                area = ClimbingArea.from_dict(data)
+                # Clamp in case the area's climb list was edited since the index was written
+                c_index = min(item["c_index"], max(len(area.climbs) - 1, 0))
+                yield {"area": area, "c_index": c_index}
+
+    queue_ind = min(header.get("queue_ind", 0), max(len(header["areas"]) - 1, 0))
+    return entries(), queue_ind, header
+
+
+def load_snapshot(path: Path) -> Tuple[List[ResultEntry], int, Dict[str, Any]]:
+    """
+    Restore a whole search session into memory (see open_snapshot to stream it).
+
+    Returns:
+        (result queue entries, displayed area index, header)
+    """
+    entries, queue_ind, header = open_snapshot(path)
+    return list(entries), queue_ind, header
+
+
+def list_snapshots(directory: Path = SNAPSHOT_DIR) -> List[Tuple[Path, Dict[str, Any]]]:
+    """
+    Snapshots in `directory`, newest first, with their headers.
+    Unreadable files are skipped.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    found = []
+    for path in directory.glob(f"*{SNAPSHOT_EXT}"):
+        try:
+            found.append((path, read_header(path)))
+        except (OSError, ValueError, SnapshotError) as e:
+            logger.warning("Skipping snapshot %s: %s", path.name, e)
+    found.sort(key=lambda item: item[1].get("created", 0), reverse=True)
+    return found
@@ -0,0 +1,168 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Model.climbing_area import ClimbingArea
+
+# ——— Module-level configuration ———
+WARM_STORE_PATH = Path(os.environ.get(
+    "CLIMBING_WARM_STORE", Path(__file__).resolve().parent.parent / "warm_store.sqlite"
+))
+HALF_LIFE_SECONDS = 7 * 24 * 60 * 60    # popularity halves after a week without hits
+HIT_WEIGHT = 1.0                        # an area returned by a search
+SAVE_WEIGHT = 5.0                       # a climb of the area saved
+FRESH_SECONDS = 24 * 60 * 60            # stored scrapes newer than this are served as-is
+COMPRESS_LEVEL = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS popularity (
+    aid      INTEGER PRIMARY KEY,
+    name     TEXT,
+    state    TEXT,
+    lat      REAL,
+    lon      REAL,
+    link     TEXT,
+    score    REAL NOT NULL,     -- decayed score as of `updated`
+    updated  REAL NOT NULL,
+    priority REAL NOT NULL,     -- log2(score) + updated / half-life, orders areas by current score
+    hits     INTEGER NOT NULL DEFAULT 0,
+    saves    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS popularity_priority ON popularity (priority);
+CREATE TABLE IF NOT EXISTS areas (
+    aid           INTEGER PRIMARY KEY,
+    scraped_at    REAL NOT NULL,
+    vertical_life INTEGER NOT NULL,
+    data          BLOB NOT NULL    -- zlib-compressed JSON of ClimbingArea.to_dict()
+);
+"""
+
+
+class WarmStore:
+    """
+    Local SQLite store used to serve popular areas without a live scrape.
+
+    - popularity: a score per area, raised by search hits and saves and decaying
+      with HALF_LIFE_SECONDS. It also keeps the area's basic fields, so background
+      refreshes never need the MySQL connection.
+    - areas: full scrapes of areas with the time they were taken.
+
+    Safe to share between the GUI thread and the refresh thread.
+    """
+
+    def __init__(self, path: Path = WARM_STORE_PATH, half_life: float = HALF_LIFE_SECONDS) -> None:
+        self.path = Path(path)
+        self.half_life = half_life
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    # ——— Popularity ———
+    def _priority(self, score: float, updated: float) -> float:
+        return math.log2(score) + updated / self.half_life
+
+    def record(self, areas: Iterable[ClimbingArea], weight: float, saves: int = 0) -> None:
+        """Add `weight` to the score of each area (hits count one each, `saves` adds to saves)."""
+        now = time.time()
+        with self._lock, self._conn:
+            for area in areas:
+                row = self._conn.execute(
+                    "SELECT score, updated FROM popularity WHERE aid = ?", (area.aid,)
+                ).fetchone()
+                score = weight
+                if row is not None:
+                    score += row[0] * 0.5 ** ((now - row[1]) / self.half_life)
+                self._conn.execute(
+                    """
+                    INSERT INTO popularity (aid, name, state, lat, lon, link, score, updated, priority, hits, saves)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (aid) DO UPDATE SET
+                        name = excluded.name, state = excluded.state, lat = excluded.lat,
+                        lon = excluded.lon, link = excluded.link, score = excluded.score,
+                        updated = excluded.updated, priority = excluded.priority,
+                        hits = hits + excluded.hits, saves = saves + excluded.saves
+                    """,
+                    (area.aid, area.name, area.state, area.lat, area.long, area.mt_proj_link,
+                     score, now, self._priority(score, now), 0 if saves else 1, saves)
+                )
+
+    def record_hits(self, areas: Iterable[ClimbingArea]) -> None:
+        """Areas returned by a search."""
+        self.record(areas, HIT_WEIGHT)
+
+    def record_save(self, area: ClimbingArea) -> None:
+        """A climb of `area` was saved."""
+        self.record([area], SAVE_WEIGHT, saves=1)
+
+    def top_areas(self, n: int) -> List[Tuple[ClimbingArea, float]]:
+        """The `n` most popular areas right now, with their current scores."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT aid, name, state, lat, lon, link, score, updated"
+                " FROM popularity ORDER BY priority DESC LIMIT ?",
+                (n,)
+            ).fetchall()
+        return [
+            (ClimbingArea(aid, state, name, lat, lon, link), score * 0.5 ** ((now - updated) / self.half_life))
+            for (aid, name, state, lat, lon, link, score, updated) in rows
+        ]
+
+    def stale_top(self, n: int, max_age: float = FRESH_SECONDS) -> List[ClimbingArea]:
+        """Of the `n` most popular areas, those with no stored scrape newer than `max_age` seconds."""
+        top = self.top_areas(n)
+        ages = self.scraped_at([area.aid for area, _ in top])
+        now = time.time()
+        return [area for area, _ in top if now - ages.get(area.aid, 0) > max_age]
+
+    # ——— Stored scrapes ———
+    def put_area(self, area: ClimbingArea, vertical_life: bool, scraped_at: Optional[float] = None) -> None:
+        """Store a full scrape of an area, replacing any older one."""
+        blob = zlib.compress(json.dumps(area.to_dict(), separators=(",", ":")).encode(), COMPRESS_LEVEL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO areas (aid, scraped_at, vertical_life, data) VALUES (?, ?, ?, ?)",
+                (area.aid, time.time() if scraped_at is None else scraped_at, int(vertical_life), blob)
+            )
+
+    def scraped_at(self, aids: List[int]) -> Dict[int, float]:
+        """When each of `aids` was last stored (missing areas are left out)."""
+        if not aids:
+            return {}
+        placeholders = ", ".join("?" * len(aids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT aid, scraped_at FROM areas WHERE aid IN ({placeholders})", tuple(aids)
+            ).fetchall()
+        return dict(rows)
+
+    def fresh_areas(self, aids: List[int], max_age: float = FRESH_SECONDS) -> Dict[int, Tuple[ClimbingArea, float]]:
+        """
+        Stored scrapes of `aids` newer than `max_age` seconds.
+
+        Returns:
+            {AID: (area, scraped_at)}; the areas are new objects, so callers may filter their climbs.
+        """
+        if not aids:
+            return {}
+        placeholders = ", ".join("?" * len(aids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT aid, scraped_at, data FROM areas WHERE aid IN ({placeholders}) AND scraped_at >= ?",
+                (*aids, time.time() - max_age)
+            ).fetchall()
+        return {
+            aid: (ClimbingArea.from_dict(json.loads(zlib.decompress(data))), scraped_at)
+            for aid, scraped_at, data in rows
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,357 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# ——— Module-level configuration ———
+WORK_QUEUE_PATH = Path(os.environ.get(
+    "CLIMBING_WORK_QUEUE", Path(__file__).resolve().parent.parent / "work_queue.sqlite"
+))
+LEASE_SECONDS = 5 * 60          # a worker must finish or extend its task within this long
+MAX_ATTEMPTS = 3                # leases per task before it is marked dead
+RETRY_DELAY_SECONDS = 30        # first retry delay, doubled on every further attempt
+BUSY_TIMEOUT_MS = 30 * 1000     # how long a process waits for another one's write lock
+COMPRESS_LEVEL = 6
+
+# Task states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind         TEXT NOT NULL,
+    url          TEXT NOT NULL UNIQUE,    -- deduplication key
+    payload      TEXT NOT NULL,           -- JSON
+    priority     REAL NOT NULL DEFAULT 0, -- lower is leased first
+    status       TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,           -- pending tasks wait until then (retry backoff)
+    lease_until  REAL,
+    worker       TEXT,
+    result       BLOB,                    -- zlib-compressed JSON
+    error        TEXT,
+    collected    INTEGER NOT NULL DEFAULT 0,
+    created      REAL NOT NULL,
+    finished     REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority, id);
+"""
+
+
+class Task:
+    """One unit of work as leased by a worker."""
+
+    def __init__(self, id: int, kind: str, url: str, payload: Dict[str, Any], attempts: int = 0,
+                 status: str = PENDING, worker: Optional[str] = None,
+                 result: Optional[Any] = None, error: Optional[str] = None) -> None:
+        self.id = id
+        self.kind = kind
+        self.url = url
+        self.payload = payload
+        # Leases so far, including the current one
+        self.attempts = attempts
+        self.status = status
+        self.worker = worker
+        # Set once the task is done (result) or dead (error of the last attempt)
+        self.result = result
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"Task({self.id}, {self.kind!r}, {self.url!r}, {self.status})"
+
+
+class WorkQueue(ABC):
+    """
+    Broker between producers, which put tasks, and workers, which lease and finish them.
+
+    - Tasks are deduplicated by URL (a task key; producers put whatever changes the
+      result into it): putting a URL that is already queued or finished returns the
+      existing task, unless it finished more than `max_age` seconds ago, in which case
+      it is queued again with the new payload.
+    - A lease hands a task to one worker until `lease_until`; if the worker neither
+      completes, fails nor extends it in time (it crashed or was killed),
+      the task is leased again. Every lease counts as an attempt.
+    - Failed tasks are retried with exponential backoff until `max_attempts`, then
+      marked dead with their last error.
+    - Results stay in the broker until collected.
+    """
+
+    @abstractmethod
+    def put(self, kind: str, url: str, payload: Dict[str, Any], priority: float = 0,
+            max_age: Optional[float] = None) -> Tuple[int, bool]:
+        """
+        Queue a task unless its URL already is. With `max_age`, a task that finished
+        more than `max_age` seconds ago is queued again; without it, results never expire.
+
+        Returns:
+            (task ID, True if it was (re)queued or False if the URL was already known)
+        """
+
+    def put_many(self, tasks: Iterable[Tuple[str, str, Dict[str, Any], float]],
+                 max_age: Optional[float] = None) -> int:
+        """Queue (kind, url, payload, priority) tuples; returns how many were (re)queued."""
+        return sum(self.put(*task, max_age=max_age)[1] for task in tasks)
+
+    @abstractmethod
+    def lease(self, worker: str, kinds: Optional[List[str]] = None,
+              lease_seconds: float = LEASE_SECONDS) -> Optional[Task]:
+        """The next ready task (optionally of the given kinds) for `worker`, or None."""
+
+    @abstractmethod
+    def extend(self, task: Task, lease_seconds: float = LEASE_SECONDS) -> bool:
+        """Push back the lease; False if the worker no longer holds it."""
+
+    @abstractmethod
+    def complete(self, task: Task, result: Any) -> bool:
+        """Store the result of a leased task; False if the lease had been lost (result dropped)."""
+
+    @abstractmethod
+    def fail(self, task: Task, error: str) -> bool:
+        """Give a leased task back for a retry, or mark it dead after its last attempt."""
+
+    @abstractmethod
+    def release(self, task: Task) -> bool:
+        """Give a leased task back without counting the attempt (worker shutting down)."""
+
+    @abstractmethod
+    def finished(self, urls: List[str]) -> Dict[str, Task]:
+        """Done and dead tasks among `urls`, with their results or errors."""
+
+    @abstractmethod
+    def take_results(self, kind: str, limit: int = 100) -> List[Task]:
+        """Done and dead tasks of `kind` not collected yet, marked collected."""
+
+    @abstractmethod
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Number of tasks per (kind, status)."""
+
+    @abstractmethod
+    def retry_dead(self, kind: Optional[str] = None) -> int:
+        """Queue dead tasks again with fresh attempts; returns how many."""
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    Default broker: a SQLite file in WAL mode, for workers on one host. Every process
+    opens the file itself and they coordinate through SQLite's write lock; leases are
+    taken in an immediate transaction, so no two workers get the same task.
+    WAL needs memory shared between the processes, so the file must not be shared
+    with other machines over a network filesystem; other brokers can be added to BROKERS.
+    """
+
+    def __init__(self, path: Path = WORK_QUEUE_PATH, max_attempts: int = MAX_ATTEMPTS,
+                 retry_delay: float = RETRY_DELAY_SECONDS) -> None:
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _write(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    # Inserts a task, or resets a done one that finished before the cutoff (a NULL cutoff never matches)
+    _PUT = (
+        "INSERT INTO tasks (kind, url, payload, priority, status, available_at, created)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (url) DO UPDATE SET"
+        " kind = excluded.kind, payload = excluded.payload, priority = excluded.priority,"
+        " status = excluded.status, attempts = 0, available_at = excluded.available_at,"
+        " lease_until = NULL, worker = NULL, result = NULL, error = NULL, collected = 0,"
+        " created = excluded.created, finished = NULL"
+        " WHERE tasks.status = ? AND tasks.finished < ?"
+    )
+
+    def _put_params(self, kind: str, url: str, payload: Dict[str, Any], priority: float,
+                    max_age: Optional[float], now: float) -> tuple:
+        cutoff = None if max_age is None else now - max_age
+        return kind, url, json.dumps(payload), priority, PENDING, now, now, DONE, cutoff
+
+    def put(self, kind: str, url: str, payload: Dict[str, Any], priority: float = 0,
+            max_age: Optional[float] = None) -> Tuple[int, bool]:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(self._PUT, self._put_params(kind, url, payload, priority, max_age, now))
+            row = self._conn.execute("SELECT id FROM tasks WHERE url = ?", (url,)).fetchone()
+        return row[0], cursor.rowcount > 0
+
+    def put_many(self, tasks: Iterable[Tuple[str, str, Dict[str, Any], float]],
+                 max_age: Optional[float] = None) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for kind, url, payload, priority in tasks:
+                    added += self._conn.execute(
+                        self._PUT, self._put_params(kind, url, payload, priority, max_age, now)
+                    ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def lease(self, worker: str, kinds: Optional[List[str]] = None,
+              lease_seconds: float = LEASE_SECONDS) -> Optional[Task]:
+        now = time.time()
+        kind_clause, kind_params = "", ()
+        if kinds:
+            kind_clause = f" AND kind IN ({', '.join('?' * len(kinds))})"
+            kind_params = tuple(kinds)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Leases that ran out on their last attempt will never finish
+                self._conn.execute(
+                    "UPDATE tasks SET status = ?, error = 'lease expired', finished = ?, worker = NULL"
+                    " WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                    (DEAD, now, LEASED, now, self.max_attempts)
+                )
+                row = self._conn.execute(
+                    "SELECT id, kind, url, payload, attempts FROM tasks"
+                    " WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?))"
+                    f"{kind_clause} ORDER BY priority, id LIMIT 1",
+                    (PENDING, now, LEASED, now, *kind_params)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                task_id, kind, url, payload, attempts = row
+                self._conn.execute(
+                    "UPDATE tasks SET status = ?, attempts = ?, lease_until = ?, worker = ? WHERE id = ?",
+                    (LEASED, attempts + 1, now + lease_seconds, worker, task_id)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return Task(task_id, kind, url, json.loads(payload), attempts + 1, LEASED, worker)
+
+    # Updates below only apply while the worker still holds the lease
+    _HELD = " WHERE id = ? AND status = ? AND worker = ?"
+
+    def extend(self, task: Task, lease_seconds: float = LEASE_SECONDS) -> bool:
+        return self._write(
+            "UPDATE tasks SET lease_until = ?" + self._HELD,
+            (time.time() + lease_seconds, task.id, LEASED, task.worker)
+        ).rowcount == 1
+
+    def complete(self, task: Task, result: Any) -> bool:
+        blob = zlib.compress(json.dumps(result, separators=(",", ":")).encode(), COMPRESS_LEVEL)
+        return self._write(
+            "UPDATE tasks SET status = ?, result = ?, error = NULL, finished = ?, lease_until = NULL" + self._HELD,
+            (DONE, blob, time.time(), task.id, LEASED, task.worker)
+        ).rowcount == 1
+
+    def fail(self, task: Task, error: str) -> bool:
+        now = time.time()
+        if task.attempts >= self.max_attempts:
+            return self._write(
+                "UPDATE tasks SET status = ?, error = ?, finished = ?, lease_until = NULL" + self._HELD,
+                (DEAD, error, now, task.id, LEASED, task.worker)
+            ).rowcount == 1
+        delay = self.retry_delay * 2 ** (task.attempts - 1)
+        return self._write(
+            "UPDATE tasks SET status = ?, error = ?, available_at = ?, lease_until = NULL, worker = NULL"
+            + self._HELD,
+            (PENDING, error, now + delay, task.id, LEASED, task.worker)
+        ).rowcount == 1
+
+    def release(self, task: Task) -> bool:
+        return self._write(
+            "UPDATE tasks SET status = ?, attempts = attempts - 1, available_at = ?,"
+            " lease_until = NULL, worker = NULL" + self._HELD,
+            (PENDING, time.time(), task.id, LEASED, task.worker)
+        ).rowcount == 1
+
+    def _finished_tasks(self, rows) -> List[Task]:
+        return [
+            Task(task_id, kind, url, json.loads(payload), attempts, status, None,
+                 json.loads(zlib.decompress(result)) if result is not None else None, error)
+            for task_id, kind, url, payload, attempts, status, result, error in rows
+        ]
+
+    def finished(self, urls: List[str]) -> Dict[str, Task]:
+        tasks: Dict[str, Task] = {}
+        # Chunked to stay under SQLite's parameter limit
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, kind, url, payload, attempts, status, result, error FROM tasks"
+                    f" WHERE url IN ({', '.join('?' * len(chunk))}) AND status IN (?, ?)",
+                    (*chunk, DONE, DEAD)
+                ).fetchall()
+            tasks.update((task.url, task) for task in self._finished_tasks(rows))
+        return tasks
+
+    def take_results(self, kind: str, limit: int = 100) -> List[Task]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, kind, url, payload, attempts, status, result, error FROM tasks"
+                    " WHERE kind = ? AND status IN (?, ?) AND collected = 0 ORDER BY id LIMIT ?",
+                    (kind, DONE, DEAD, limit)
+                ).fetchall()
+                self._conn.executemany("UPDATE tasks SET collected = 1 WHERE id = ?", [(row[0],) for row in rows])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._finished_tasks(rows)
+
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status").fetchall()
+        return {(kind, status): count for kind, status, count in rows}
+
+    def retry_dead(self, kind: Optional[str] = None) -> int:
+        return self._write(
+            "UPDATE tasks SET status = ?, attempts = 0, available_at = ?, collected = 0, finished = NULL"
+            " WHERE status = ? AND (? IS NULL OR kind = ?)",
+            (PENDING, time.time(), DEAD, kind, kind)
+        ).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Broker implementations by URL scheme, e.g. "sqlite:///tmp/queue.sqlite"
+BROKERS = {"sqlite": SqliteWorkQueue}
+
+
+def open_queue(location: Optional[str] = None, **options) -> WorkQueue:
+    """
+    Open a broker from "<scheme>://<location>"; a plain path (or None for
+    WORK_QUEUE_PATH) opens the SQLite broker.
+    """
+    if location is None:
+        return SqliteWorkQueue(**options)
+    scheme, sep, rest = location.partition("://")
+    if not sep:
+        return SqliteWorkQueue(Path(location), **options)
+    if scheme not in BROKERS:
+        raise ValueError(f"Unknown broker {scheme!r}; known: {', '.join(BROKERS)}")
+    return BROKERS[scheme](Path(rest), **options)
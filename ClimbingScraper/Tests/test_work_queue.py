@@ -0,0 +1,201 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from Controller.queue_worker import QueueWorker, area_task_key, collect_search, enqueue_search
+from Model.climbing_area import ClimbingArea
+from Model.work_queue import DEAD, DONE, LEASED, PENDING, SqliteWorkQueue
+
+# Lease short enough to run out within a test
+SHORT_LEASE = 0.05
+
+
+class WorkQueueTestCase(unittest.TestCase):
+    """Each test gets its own queue file; `open_queue` opens another connection to it, like another process."""
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = Path(self._dir.name) / "queue.sqlite"
+        self._queues = []
+        self.queue = self.open_queue()
+
+    def tearDown(self) -> None:
+        for queue in self._queues:
+            queue.close()
+        self._dir.cleanup()
+
+    def open_queue(self, **options) -> SqliteWorkQueue:
+        queue = SqliteWorkQueue(self.path, **options)
+        self._queues.append(queue)
+        return queue
+
+    def status(self, url: str) -> tuple:
+        return self.queue._conn.execute(
+            "SELECT status, attempts, worker FROM tasks WHERE url = ?", (url,)
+        ).fetchone()
+
+
+class LeaseTest(WorkQueueTestCase):
+    def test_one_task_goes_to_one_worker(self):
+        self.queue.put("area", "u1", {})
+        first = self.open_queue().lease("a")
+        second = self.open_queue().lease("b")
+        self.assertEqual(first.url, "u1")
+        self.assertIsNone(second)
+
+    def test_concurrent_workers_run_a_task_once(self):
+        self.queue.put("area", "u1", {"n": 1})
+        calls = []
+        lock = threading.Lock()
+
+        def handler(payload, cancel):
+            with lock:
+                calls.append(payload["n"])
+            time.sleep(0.05)
+            return payload["n"]
+
+        workers = [QueueWorker(self.open_queue(), name=name, handlers={"area": handler}) for name in ("a", "b")]
+        threads = [threading.Thread(target=worker.run, kwargs={"drain": True}) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(self.queue.finished(["u1"])["u1"].result, 1)
+
+    def test_expired_lease_is_taken_by_another_worker(self):
+        self.queue.put("area", "u1", {})
+        lost = self.queue.lease("a", lease_seconds=SHORT_LEASE)
+        time.sleep(SHORT_LEASE * 2)
+        taken = self.open_queue().lease("b")
+        self.assertEqual(taken.id, lost.id)
+        self.assertEqual(taken.attempts, 2)
+        self.assertEqual(self.status("u1"), (LEASED, 2, "b"))
+
+    def test_worker_that_lost_its_lease_cannot_finish(self):
+        self.queue.put("area", "u1", {})
+        lost = self.queue.lease("a", lease_seconds=SHORT_LEASE)
+        time.sleep(SHORT_LEASE * 2)
+        taken = self.queue.lease("b")
+        self.assertFalse(self.queue.extend(lost))
+        self.assertFalse(self.queue.complete(lost, "stale"))
+        self.assertFalse(self.queue.fail(lost, "stale"))
+        self.assertTrue(self.queue.complete(taken, "fresh"))
+        self.assertEqual(self.queue.finished(["u1"])["u1"].result, "fresh")
+
+
+class RetryTest(WorkQueueTestCase):
+    def test_failed_task_waits_for_its_backoff(self):
+        queue = self.open_queue(retry_delay=60)
+        queue.put("area", "u1", {})
+        queue.fail(queue.lease("a"), "boom")
+        self.assertEqual(self.status("u1"), (PENDING, 1, None))
+        self.assertIsNone(queue.lease("a"))
+
+    def test_task_is_dead_after_max_attempts(self):
+        queue = self.open_queue(max_attempts=2, retry_delay=0)
+        queue.put("area", "u1", {})
+        self.assertTrue(queue.fail(queue.lease("a"), "first"))
+        self.assertTrue(queue.fail(queue.lease("a"), "second"))
+        self.assertIsNone(queue.lease("a"))
+        task = queue.finished(["u1"])["u1"]
+        self.assertEqual((task.status, task.attempts, task.error), (DEAD, 2, "second"))
+
+    def test_lease_expiring_on_the_last_attempt_is_dead(self):
+        queue = self.open_queue(max_attempts=1)
+        queue.put("area", "u1", {})
+        queue.lease("a", lease_seconds=SHORT_LEASE)
+        time.sleep(SHORT_LEASE * 2)
+        self.assertIsNone(queue.lease("b"))
+        self.assertEqual(queue.finished(["u1"])["u1"].error, "lease expired")
+
+    def test_stopped_worker_gives_its_task_back(self):
+        self.queue.put("area", "u1", {})
+        started = threading.Event()
+
+        def handler(payload, cancel):
+            started.set()
+            cancel.wait(5)
+
+        worker = QueueWorker(self.open_queue(), name="a", handlers={"area": handler})
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        self.assertTrue(started.wait(5))
+        worker.stop()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        # Released leases don't count as attempts
+        self.assertEqual(self.status("u1"), (PENDING, 0, None))
+
+
+class DeduplicationTest(WorkQueueTestCase):
+    def finish(self, url: str, result) -> None:
+        self.queue.put("area", url, {})
+        task = self.queue.lease("a")
+        self.assertEqual(task.url, url)
+        self.queue.complete(task, result)
+
+    def test_known_url_is_not_queued_again(self):
+        first, added = self.queue.put("area", "u1", {"v": 1})
+        again, added_again = self.queue.put("area", "u1", {"v": 2})
+        self.assertTrue(added)
+        self.assertEqual((again, added_again), (first, False))
+        self.assertEqual(self.queue.lease("a").payload, {"v": 1})
+
+    def test_max_age_requeues_only_old_done_tasks(self):
+        # Leases go to the oldest ready task, so each one is leased right after it is put
+        self.finish("done", "old")
+        dead = self.open_queue(max_attempts=1)
+        dead.put("area", "dead", {})
+        dead.fail(dead.lease("a"), "boom")
+        self.queue.put("area", "leased", {})
+        self.queue.lease("a", lease_seconds=60)
+        self.queue.put("area", "pending", {})
+        time.sleep(0.01)
+
+        added = {url: self.queue.put("area", url, {"new": True}, max_age=0)[1]
+                 for url in ("done", "pending", "leased", "dead")}
+        self.assertEqual(added, {"done": True, "pending": False, "leased": False, "dead": False})
+        self.assertEqual(self.status("done"), (PENDING, 0, None))
+        self.assertEqual([self.status(url)[0] for url in ("pending", "leased", "dead")], [PENDING, LEASED, DEAD])
+        self.assertEqual(self.queue.finished(["done"]), {})
+
+    def test_recent_or_ageless_done_task_is_kept(self):
+        self.finish("u1", "kept")
+        self.assertFalse(self.queue.put("area", "u1", {}, max_age=60)[1])
+        self.assertFalse(self.queue.put("area", "u1", {})[1])
+        self.assertEqual(self.queue.put_many([("area", "u1", {}, 0)], max_age=60), 0)
+        self.assertEqual(self.queue.finished(["u1"])["u1"].status, DONE)
+
+
+class CollectionTest(WorkQueueTestCase):
+    def test_results_are_taken_once(self):
+        self.queue.put("area", "u1", {})
+        self.queue.complete(self.queue.lease("a"), {"ok": True})
+        self.assertEqual([task.result for task in self.queue.take_results("area")], [{"ok": True}])
+        self.assertEqual(self.queue.take_results("area"), [])
+
+    def test_search_collects_worker_results(self):
+        areas = [ClimbingArea(i, "state", f"area {i}", 37.0 + i / 10, -119.0, f"https://example.com/area/{i}")
+                 for i in range(3)]
+        self.assertEqual(enqueue_search(self.queue, areas, (37.0, -119.0)), 3)
+        self.assertEqual(enqueue_search(self.queue, areas, (37.0, -119.0)), 0)
+
+        def handler(payload, cancel):
+            if payload["area"]["aid"] == 2:
+                raise ValueError("no page")
+            return ClimbingArea.from_dict(payload["area"]).to_dict()
+
+        QueueWorker(self.open_queue(max_attempts=1), name="a", handlers={"area": handler}).run(drain=True)
+        collected = list(collect_search(self.queue, areas, None, timeout=1))
+        self.assertEqual(sorted(area.aid for area in collected if area is not None), [0, 1])
+        self.assertEqual(collected.count(None), 1)
+        # Keys include the scrape mode, so a lazy search doesn't reuse the full results
+        self.assertEqual(enqueue_search(self.queue, areas[:1], (37.0, -119.0), lazy=True), 1)
+        self.assertEqual(self.status(area_task_key(areas[0], True, True))[0], PENDING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,11 @@ from pathlib import Path
 from typing import List, Optional
 
 import PySimpleGUI as sg
-from copy import deepcopy
 
-from Controller.Caculations.pie_chart import create_pie_chart
-from View.layouts.save_layout import save_layout
-from View.layouts.search_layout import search_layout
+from Controller.Caculations.chart_service import get_pie_chart
+from View.layouts.save_layout import build_save_layout
+from View.layouts.search_layout import build_search_layout
+from View.layouts.ui_config import _generate_sample_chart
 
 
 class View:
@@ -36,11 +36,20 @@ class View:
             size=sg.Window.get_screen_size()
         )
         self.window.bind("<Configure>", "_WINDOW_RESIZE_")
+        # Show the window first, then draw the placeholder charts into it
+        self.window.refresh()
+        self.show_default_charts()
+
+    def show_default_charts(self) -> None:
+        """Draw the sample style chart in both tabs before any climb is displayed."""
+        chart = _generate_sample_chart()
+        for tab in ("1", "2"):
+            self.window[f"{tab}:STYLE_CHART"].update(data=chart)
 
     def _build_layout(self) -> list:
-        # Deep-copy imported layouts to avoid reusing Elements across windows
-        search_tab = deepcopy(search_layout)
-        save_tab = deepcopy(save_layout)
+        # Layout factories return fresh Elements, so nothing is shared across windows
+        search_tab = build_search_layout()
+        save_tab = build_save_layout()
 
         tabs = [[
             sg.Tab("Search", search_tab),
@@ -93,6 +102,28 @@ class View:
         sg.theme(prev_theme)
         return choice
 
+    def update_search_progress(self, done: int, total: int) -> None:
+        """Show how many areas of the running search have been scraped."""
+        self.window["1:SEARCH_PROGRESS"].update(f"Areas scraped: {done}/{total}")
+        self.window["1:SEARCH_BAR"].update(current_count=done, max=max(total, 1))
+
+    def show_search_cancelled(self, done: int, total: int) -> None:
+        """Replace the progress label once the user cancels a search."""
+        self.window["1:SEARCH_PROGRESS"].update(f"Search cancelled: {done}/{total} areas")
+
+    def reset_results(self, tab: str) -> None:
+        """
+        Blank a tab's result panels in place, e.g. when a new search starts.
+        The window and its other state (inputs, the other tab) are left untouched.
+        """
+        for panel in ("AREA_BASIC", "WEATHER", "CLIMB_BASIC"):
+            self._update_multiline(f"{tab}:{panel}", "")
+        for panel in ("AREA_DESCRIPTION", "AREA_REVIEWS", "CLIMB_DESCRIPTION", "CLIMB_COMMENTS"):
+            self.display_panel_page(tab, panel, "", 0, 1)
+        self.window[f"{tab}:STYLE_CHART"].update(data=_generate_sample_chart())
+        if tab == "1":
+            self.update_counters("0/0", "0/0")
+
     def update_counters(self, area_count: str, climb_count: str) -> None:
         """Update the area and climb counters in the Search tab."""
         self.window["1:NUM_AREAS"].update(area_count)
@@ -109,30 +140,39 @@ class View:
     def display_area_weather(self, tab: str, text: str) -> None:
         self._update_multiline(f"{tab}:WEATHER", text)
 
-    def display_area_descriptions(self, tab: str, text: str) -> None:
-        self._update_multiline(f"{tab}:AREA_DESCRIPTION", text)
-
-    def display_area_comments(self, tab: str, text: str) -> None:
-        self._update_multiline(f"{tab}:AREA_REVIEWS", text)
-
     def display_climb_basic(self, tab: str, text: str) -> None:
         self._update_multiline(f"{tab}:CLIMB_BASIC", text)
 
-    def display_climb_descriptions(self, tab: str, text: str) -> None:
-        self._update_multiline(f"{tab}:CLIMB_DESCRIPTION", text)
-
-    def display_climb_comments(self, tab: str, text: str) -> None:
-        self._update_multiline(f"{tab}:CLIMB_COMMENTS", text)
+    def display_panel_page(self, tab: str, panel: str, text: str, page: int, pages: int) -> None:
+        """
+        Show one page of a paged description/comment panel and update its controls.
+
+        Args:
+            tab:   Tab number ("1" or "2").
+            panel: AREA_DESCRIPTION, AREA_REVIEWS, CLIMB_DESCRIPTION or CLIMB_COMMENTS.
+            page:  Zero-based page shown.
+            pages: Total number of pages.
+        """
+        key = f"{tab}:{panel}"
+        self._update_multiline(key, text)
+        self.window[f"{key}_PAGE"].update(f"{page + 1}/{pages}")
+        self.window[f"{key}_PREV"].update(disabled=page == 0)
+        self.window[f"{key}_NEXT"].update(disabled=page >= pages - 1)
 
     def update_chart(self, tab: str, data) -> None:
-        """Generate and display a pie chart for climb style data."""
-        self.window[f"{tab}:STYLE_CHART"].update(create_pie_chart(data))
+        """Display a pie chart for climb style data (memoized by chart_service)."""
+        self.window[f"{tab}:STYLE_CHART"].update(get_pie_chart(data))
 
     def update_saved_climbs(self, names: List[str]) -> None:
         """Populate the saved climbs dropdown in the Save tab."""
         values = names or ["Nothing Loaded"]
         self.window["2:COMBO_SAVE"].update(values=values, value=values[0])
 
+    def update_sessions(self, labels: List[str]) -> None:
+        """Populate the saved sessions dropdown in the Search tab, newest first."""
+        values = labels or ["No saved sessions"]
+        self.window["1:SESSIONS"].update(values=values, value=values[0])
+
     def get_inputs_search_page(self, values: dict) -> Optional[tuple]:
         """Retrieve and validate search parameters (lat, lon, distance)."""
         try:
@@ -148,3 +188,11 @@ class View:
             self.show_popup("No climb has been selected")
             return None
         return int(sel.split("CID:", 1)[1].rstrip(')'))
+
+    def get_session_choice(self, values: dict) -> Optional[int]:
+        """Index of the session picked in the Search tab dropdown, or None if there are none."""
+        sel = values["1:SESSIONS"]
+        if sel == "No saved sessions":
+            self.show_popup("No session has been selected")
+            return None
+        return self.window["1:SESSIONS"].Values.index(sel)
@@ -0,0 +1,49 @@
+import PySimpleGUI as sg
+# Import UI configuration for fonts and colors
+from View.layouts.ui_config import UIConfig
+
+
+def paged_panel(key: str, size: tuple) -> sg.Column:
+    """
+    A Multiline that shows one page of a long list (descriptions or comments)
+    with previous/next buttons and a page counter underneath.
+
+    Element keys: `key` for the text, `key`_PREV / `key`_NEXT for the buttons
+    and `key`_PAGE for the "page/pages" counter.
+
+    Args:
+        key:  Multiline key, e.g. "1:CLIMB_COMMENTS".
+        size: (columns, rows) of the text area; the nav row sits below it.
+    """
+    return sg.Column([
+        [
+            sg.Multiline(
+                key=key,
+                font=UIConfig.FONT,
+                background_color=UIConfig.MULTILINE_BG,
+                text_color=UIConfig.MULTILINE_TEXT,
+                size=size
+            )
+        ],
+        [  # Page navigation
+            sg.Button(
+                "◀",
+                key=f"{key}_PREV",
+                font=UIConfig.FONT,
+                button_color=UIConfig.BUTTON_COLOR,
+                disabled=True
+            ),
+            sg.Text(
+                "1/1",  # page counter
+                key=f"{key}_PAGE",
+                font=UIConfig.FONT
+            ),
+            sg.Button(
+                "▶",
+                key=f"{key}_NEXT",
+                font=UIConfig.FONT,
+                button_color=UIConfig.BUTTON_COLOR,
+                disabled=True
+            )
+        ]
+    ], pad=(0, 0))
@@ -1,4 +1,5 @@
-from Controller.Caculations.pie_chart import create_pie_chart
+from Controller.Caculations.chart_service import get_pie_chart
+from Controller.Caculations.pie_chart import FIG_SIZE, DPI
 
 
 class UIConfig:
@@ -14,22 +15,24 @@ class UIConfig:
     MULTILINE_BG = "#FFFFFF"                 # Background color for multiline text areas
     MULTILINE_TEXT = "#000000"               # Text color for multiline areas
 
+    # Style chart size in pixels; the chart itself is drawn after the window opens
+    CHART_SIZE = (round(FIG_SIZE[0] * DPI), round(FIG_SIZE[1] * DPI))
+
     # Climbing grade scales
-    # Top-rope / sport grades: 5.6 through 5.12d
-    GRADES_ROPE = [
-        f"5.{i}" if i < 10 else f"5.1{i - 10}{l}"
-        for i in range(6, 13) for l in ['a', 'b', 'c', 'd']
-    ][:17]
-    # Bouldering grades: V0 through V10
-    GRADES_BOULDERING = [f"V{i}" for i in range(11)]
+    # Top-rope / sport grades: 5.0 through 5.15d (the first and last leave the range open)
+    GRADES_ROPE = [f"5.{i}" for i in range(0, 10)] + [
+        f"5.{i}{l}" for i in range(10, 16) for l in ['a', 'b', 'c', 'd']
+    ]
+    # Bouldering grades: VB through V17 (the first and last leave the range open)
+    GRADES_BOULDERING = ["VB"] + [f"V{i}" for i in range(18)]
 
 
 def _generate_sample_chart():
     """
     Generate a default pie chart for initial display when no real data is available.
     This done for pie chart before any search has been run
-    Returns the PNG image bytes from create_pie_chart.
+    Returns the PNG image bytes from get_pie_chart.
     """
     data = [20, 20, 20, 20, 20]  # even slices summing to 100%
     title = "Default"           # placeholder chart title
-    return create_pie_chart(data, title)
+    return get_pie_chart(data, title)
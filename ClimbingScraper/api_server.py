@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from Controller.Caculations.climb_filter import ClimbFilter
+from Controller.instrumentation import METRICS, count, timed, write_metrics_file
+from Controller.query_service import QueryService
+from Controller.scrape_scheduler import MAX_WORKERS
+from Model.database import Database, RecordNotFound
+from Model.warm_store import WarmStore
+
+# ——— Module-level configuration ———
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_SECONDS = 15     # idle time before a kept-alive connection is closed
+DEFAULT_K = 10
+MAX_K = 500
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class PlainText(str):
+    """Handler result sent as-is instead of as JSON."""
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HttpError(Exception):
+    """Raised by handlers to answer with an error status and message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# ——— Query-string helpers ———
+def _param(query: Dict[str, List[str]], name: str, cast: Callable = str, default: Any = None) -> Any:
+    values = query.get(name)
+    if not values:
+        if default is None:
+            raise HttpError(400, f"Missing parameter {name!r}")
+        return default
+    try:
+        return cast(values[0])
+    except ValueError:
+        raise HttpError(400, f"Bad value for {name!r}: {values[0]!r}")
+
+
+def _filter(query: Dict[str, List[str]]) -> Optional[ClimbFilter]:
+    """ClimbFilter from optional type/rope_min/rope_max/boulder_min/boulder_max parameters."""
+    if not any(name in query for name in ("type", "rope_min", "rope_max", "boulder_min", "boulder_max")):
+        return None
+    return ClimbFilter(
+        _param(query, "type", default="All"),
+        (_param(query, "rope_min", default="5.0"), _param(query, "rope_max", default="5.15d")),
+        (_param(query, "boulder_min", default="VB"), _param(query, "boulder_max", default="V17")),
+    )
+
+
+class ApiServer:
+    """
+    Minimal HTTP/1.1 JSON server on asyncio streams (GET and HEAD only, keep-alive).
+    Every request of the process goes through one QueryService, so concurrent
+    clients share its DB thread, scrape pool, caches and in-flight requests.
+
+    Responses carry a strong ETag (hash of the body) and a Cache-Control max-age;
+    a matching If-None-Match gets 304 with no body.
+
+    Endpoints:
+        GET /areas?lat=&lon=&radius=[&type=&rope_min=...]   areas within radius miles
+        GET /areas/nearest?lat=&lon=[&k=]                     k nearest areas
+        GET /areas/<aid>                                      area with descriptions, comments and climbs
+        GET /areas/<aid>/climbs/<index>                       one climb's details
+        GET /saved                                            saved climbs
+        GET /saved/<cid>                                      one saved climb
+        GET /weather?lat=&lon=                                10-day forecast
+        GET /metrics                                          stage timings and counters (Prometheus text)
+    """
+
+    def __init__(self, service: QueryService) -> None:
+        self.service = service
+        # (pattern, handler, max-age seconds)
+        self.routes: List[Tuple[re.Pattern, Callable[..., Awaitable[Any]], int]] = [
+            (re.compile(r"/areas"), self._areas, 300),
+            (re.compile(r"/areas/nearest"), self._nearest, 300),
+            (re.compile(r"/areas/(\d+)(?:/climbs)?"), self._area, 60),
+            (re.compile(r"/areas/(\d+)/climbs/(\d+)"), self._climb, 60),
+            (re.compile(r"/saved"), self._saved, 0),
+            (re.compile(r"/saved/(\d+)"), self._saved_climb, 0),
+            (re.compile(r"/weather"), self._weather, 600),
+            (re.compile(r"/metrics"), self._metrics, 0),
+        ]
+
+    # ——— Handlers ———
+    async def _areas(self, query):
+        return await self.service.search(
+            _param(query, "lat", float), _param(query, "lon", float),
+            _param(query, "radius", float), _filter(query)
+        )
+
+    async def _nearest(self, query):
+        k = min(max(_param(query, "k", int, DEFAULT_K), 1), MAX_K)
+        return await self.service.nearest(_param(query, "lat", float), _param(query, "lon", float), k)
+
+    async def _area(self, query, aid):
+        return await self.service.area_climbs(int(aid))
+
+    async def _climb(self, query, aid, index):
+        return await self.service.climb(int(aid), int(index))
+
+    async def _saved(self, query):
+        return await self.service.saved()
+
+    async def _saved_climb(self, query, cid):
+        return await self.service.saved_climb(int(cid))
+
+    async def _weather(self, query):
+        return await self.service.weather(_param(query, "lat", float), _param(query, "lon", float))
+
+    async def _metrics(self, query):
+        return PlainText(METRICS.prometheus_text())
+
+    # ——— HTTP ———
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Route one request; returns (status, headers, body)."""
+        if method not in ("GET", "HEAD"):
+            raise HttpError(405, f"Method {method} not allowed")
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = url.path.rstrip("/") or "/"
+        for pattern, handler, max_age in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                break
+        else:
+            raise HttpError(404, f"No route for {path}")
+
+        try:
+            with timed("api", route=pattern.pattern):
+                result = await handler(query, *match.groups())
+        except RecordNotFound as e:
+            # Unknown AID, CID or climb index
+            raise HttpError(404, str(e))
+        if isinstance(result, PlainText):
+            body, content_type = result.encode(), PlainText.CONTENT_TYPE
+        else:
+            body = json.dumps(result, ensure_ascii=False, default=str).encode()
+            content_type = "application/json; charset=utf-8"
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        response_headers = {
+            "Content-Type": content_type,
+            "ETag": etag,
+            "Cache-Control": f"max-age={max_age}" if max_age else "no-cache",
+        }
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            return 304, response_headers, b""
+        return 200, response_headers, body
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until the client closes it or goes idle."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return
+                method, target, headers, version = self._parse_head(head)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    status, response_headers, body = await self.dispatch(method, target, headers)
+                except HttpError as e:
+                    status, response_headers = e.status, {"Content-Type": "application/json; charset=utf-8"}
+                    body = json.dumps({"error": str(e)}).encode()
+                except Exception:
+                    logger.exception("Request failed: %s %s", method, target)
+                    status, response_headers = 500, {"Content-Type": "application/json; charset=utf-8"}
+                    body = b'{"error": "internal error"}'
+                self._write_response(writer, status, response_headers, b"" if method == "HEAD" else body,
+                                     len(body), keep_alive)
+                count("api_responses", status=status)
+                await writer.drain()
+                logger.info("%s %s -> %d", method, target, status)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, Dict[str, str], str]:
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            method, target, version = "BAD", "/", "HTTP/1.0"
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        return method, target, headers, version
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                        body: bytes, length: int, keep_alive: bool) -> None:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        headers = {**headers, "Connection": "keep-alive" if keep_alive else "close"}
+        if status != 304:
+            headers["Content-Length"] = str(length)
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        logger.info("Serving on http://%s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local HTTP API for area search, climbs, saved climbs and weather.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="threads scraping at the same time")
+    parser.add_argument("--vl", action="store_true", help="look climbs up on Vertical-Life too")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    db = Database()
+    db.connect_to_database()
+    # Shares popularity and refreshed areas with the GUI
+    service = QueryService(db, scrape_workers=args.workers, vertical_life=args.vl, warm=WarmStore())
+    try:
+        asyncio.run(ApiServer(service).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        db.close()
+        write_metrics_file()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
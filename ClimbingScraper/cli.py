@@ -0,0 +1,369 @@
+import argparse
+import json
+import logging
+import queue
+import sys
+import time
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+from Controller.Caculations.climb_filter import BOULDER_LIMITS, ROPE_LIMITS, ClimbFilter
+from Controller.instrumentation import METRICS, METRICS_FILE, write_metrics_file
+from Controller.scrape_scheduler import ScrapeScheduler, MAX_WORKERS
+from Controller.Scrapers import http_archive
+from Controller.search_pipeline import scrape_area_worker, split_catalog_areas
+from Model.climbing_area import ClimbingArea
+from Model.database import Database
+from Model.result_set import ClimbResultSet, SORT_KEYS
+
+# ——— Module-level configuration ———
+CLIMBING_TYPES = ("Top Rope", "Bouldering", "All")
+PARQUET_BATCH_ROWS = 2000      # rows buffered before a Parquet row group is written
+
+# Area fields repeated on every climb row
+_AREA_COLUMNS = ("aid", "name", "state", "lat", "long", "mt_proj_link", "distance")
+# List fields written as arrays of strings
+_LIST_COLUMNS = ("mp_descriptions", "mp_comments", "vl_comments", "mp_photos", "vl_photos", "area_descriptions")
+
+logger = logging.getLogger(__name__)
+
+
+# ——— Queries ———
+def read_queries(path: str, defaults: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Queries from a file, one per line: either "lat,lon,radius" (commas or spaces)
+    or a JSON object with lat, lon, radius and optionally any filter option
+    (type, rope_min, rope_max, boulder_min, boulder_max). Blank lines and # comments are skipped.
+    """
+    with open(path, encoding="utf-8") if path != "-" else sys.stdin as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                query = {**defaults, **json.loads(line)}
+            else:
+                parts = line.replace(",", " ").split()
+                if len(parts) != 3:
+                    raise ValueError(f"{path}:{number}: expected lat, lon and radius")
+                query = {**defaults, "lat": parts[0], "lon": parts[1], "radius": parts[2]}
+            query["lat"], query["lon"], query["radius"] = \
+                float(query["lat"]), float(query["lon"]), float(query["radius"])
+            yield query
+
+
+def query_filter(query: Dict[str, Any]) -> ClimbFilter:
+    """ClimbFilter from a query's type and grade options."""
+    return ClimbFilter(
+        query["type"],
+        (query["rope_min"], query["rope_max"]),
+        (query["boulder_min"], query["boulder_max"]),
+    )
+
+
+# ——— Output ———
+def climb_rows(area: ClimbingArea, query_id: int) -> Iterator[Dict[str, Any]]:
+    """One flat record per climb, with the area's fields and the query it came from."""
+    for climb in area.climbs:
+        yield climb_row(area, climb, query_id)
+
+
+def climb_row(area: ClimbingArea, climb, query_id: int) -> Dict[str, Any]:
+    """The flat record of one climb of `area`."""
+    row = {"query": query_id, **{f"area_{field}": getattr(area, field) for field in _AREA_COLUMNS}}
+    row.update(climb.to_dict())
+    row["mp_photos"] = [link for link, _ in row["mp_photos"]]
+    row["vl_photos"] = [link for link, _ in row["vl_photos"]]
+    row["area_descriptions"] = list(area.mp_descriptions)
+    row["area_comments"] = list(area.mp_area_comments)
+    return row
+
+
+class JsonLinesWriter:
+    """Writes each row as one JSON object per line, flushed per area so output streams."""
+
+    def __init__(self, out: IO[str]) -> None:
+        self.out = out
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.out.write(json.dumps(row, ensure_ascii=False, default=str))
+            self.out.write("\n")
+        self.out.flush()
+
+    def close(self) -> None:
+        if self.out is not sys.stdout:
+            self.out.close()
+
+
+class ParquetWriter:
+    """
+    Writes rows to a Parquet file in row groups of PARQUET_BATCH_ROWS.
+    Needs pyarrow, which is only imported when this format is chosen.
+    Scalars are stored as strings (scraped values mix numbers and text), except
+    coordinates and distance.
+    """
+
+    def __init__(self, path: str) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+        self.pa = pa
+        self.buffer: List[Dict[str, Any]] = []
+        self.schema = None
+        self.writer = None
+        self._open = lambda schema: pq.ParquetWriter(path, schema)
+
+    def _column_type(self, name: str):
+        pa = self.pa
+        if name in ("area_lat", "area_long", "area_distance"):
+            return pa.float64()
+        if name == "query":
+            return pa.int64()
+        if name in _LIST_COLUMNS or name == "area_comments":
+            return pa.list_(pa.string())
+        if name in ("details_loaded", "vl_loaded"):
+            return pa.bool_()
+        return pa.string()
+
+    def _convert(self, name: str, value: Any) -> Any:
+        if value is None or name in _LIST_COLUMNS or name in ("query", "area_comments", "details_loaded", "vl_loaded"):
+            return value
+        if name in ("area_lat", "area_long", "area_distance"):
+            return float(value)
+        return value if isinstance(value, str) else json.dumps(value, default=str)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self.buffer.extend(rows)
+        if len(self.buffer) >= PARQUET_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self.buffer:
+            return
+        if self.schema is None:
+            names = list(self.buffer[0])
+            self.schema = self.pa.schema([(name, self._column_type(name)) for name in names])
+            self.writer = self._open(self.schema)
+        columns = {
+            name: [self._convert(name, row.get(name)) for row in self.buffer]
+            for name in self.schema.names
+        }
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+        self.buffer.clear()
+
+    def close(self) -> None:
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+# ——— Running ———
+class Stats:
+    """Throughput counters for the summary printed at the end."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.areas_found = 0
+        self.areas_catalog = 0
+        self.areas_scraped = 0
+        self.areas_failed = 0
+        self.climbs = 0
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        done = self.areas_catalog + self.areas_scraped
+        return (
+            f"{self.queries} queries, {self.areas_found} areas found "
+            f"({self.areas_catalog} from catalog, {self.areas_scraped} scraped, {self.areas_failed} failed), "
+            f"{self.climbs} climbs in {elapsed:.1f} s: "
+            f"{done / elapsed if elapsed else 0:.2f} areas/s, {self.climbs / elapsed if elapsed else 0:.2f} climbs/s"
+        )
+
+
+class SortedWriter:
+    """
+    Collects one query's climbs into a ClimbResultSet and writes them, filtered by
+    --min-stars and ordered by --sort, once every area of the query is done.
+    """
+
+    def __init__(self, writer, query_id: int, args) -> None:
+        self.writer = writer
+        self.query_id = query_id
+        self.args = args
+        self.climbs = ClimbResultSet()
+
+    def add_area(self, area: ClimbingArea) -> None:
+        self.climbs.add_area(area)
+
+    def flush(self) -> None:
+        rows = self.climbs.filter(min_stars=self.args.min_stars)
+        if self.args.sort:
+            rows = self.climbs.sort(self.args.sort, reverse=self.args.descending, rows=rows)
+        if rows:
+            self.writer.write([climb_row(*self.climbs.row(i), self.query_id) for i in rows])
+
+
+def run_query(db: Database, query: Dict[str, Any], query_id: int, writer, args, stats: Stats) -> None:
+    """
+    Search one point: list catalogued areas (with --catalog), scrape the rest on a
+    ScrapeScheduler pool, and write each area's climbs as soon as it finishes.
+    With --sort or --min-stars, the climbs are written once the whole query is done.
+    """
+    if args.sort or args.min_stars is not None:
+        sorted_writer = SortedWriter(writer, query_id, args)
+        _search(db, query, query_id, sorted_writer, args, stats)
+        sorted_writer.flush()
+    else:
+        _search(db, query, query_id, writer, args, stats)
+
+
+def _search(db: Database, query: Dict[str, Any], query_id: int, writer, args, stats: Stats) -> None:
+    origin = (query["lat"], query["lon"])
+    climb_filter = query_filter(query)
+    areas = db.search_db_for_areas(query["lat"], query["lon"], query["radius"], climb_filter)
+    stats.queries += 1
+    stats.areas_found += len(areas)
+    logger.info("Query %d: %d areas within %.0f miles of %s", query_id, len(areas), query["radius"], origin)
+
+    if args.catalog:
+        listed, areas = split_catalog_areas(db, areas, origin, climb_filter)
+        for area in listed:
+            _write_area(area, query_id, writer, stats)
+        stats.areas_catalog += len(listed)
+    if not areas:
+        return
+
+    # Same pool the GUI uses; its results are handed to this thread through a queue
+    results: "queue.Queue[Optional[ClimbingArea]]" = queue.Queue()
+    scheduler = ScrapeScheduler(
+        origin,
+        work=lambda area, cancel: scrape_area_worker(
+            area, cancel, climb_filter, lazy=args.route_table_only, vertical_life=not args.no_vl
+        ),
+        on_result=lambda _, area: results.put(area),
+        max_workers=args.workers,
+        max_pending=args.workers * 2
+    )
+    scheduler.submit(areas)
+    try:
+        for _ in range(len(areas)):
+            area = results.get()
+            scheduler.result_consumed()
+            if area is None:
+                stats.areas_failed += 1
+                continue
+            stats.areas_scraped += 1
+            _write_area(area, query_id, writer, stats)
+    except KeyboardInterrupt:
+        scheduler.cancel(wait=True)
+        raise
+
+
+def _write_area(area: ClimbingArea, query_id: int, writer, stats: Stats) -> None:
+    if isinstance(writer, SortedWriter):
+        stats.climbs += len(area.climbs)
+        writer.add_area(area)
+        return
+    rows = list(climb_rows(area, query_id))
+    stats.climbs += len(rows)
+    if rows:
+        writer.write(rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Search and scrape climbing areas without the GUI; results are written one row per climb."
+    )
+    where = parser.add_argument_group("search point")
+    where.add_argument("--lat", type=float, help="latitude of the search point")
+    where.add_argument("--lon", type=float, help="longitude of the search point")
+    where.add_argument("--radius", type=float, default=60, help="miles around the point (default 60)")
+    where.add_argument("--queries", help="file of queries, one per line ('-' for stdin); replaces --lat/--lon")
+
+    filters = parser.add_argument_group("filters (defaults for every query)")
+    filters.add_argument("--type", choices=CLIMBING_TYPES, default="All")
+    filters.add_argument("--rope-min", default=ROPE_LIMITS[0])
+    filters.add_argument("--rope-max", default=ROPE_LIMITS[1])
+    filters.add_argument("--boulder-min", default=BOULDER_LIMITS[0])
+    filters.add_argument("--boulder-max", default=BOULDER_LIMITS[1])
+
+    scrape = parser.add_argument_group("scraping")
+    scrape.add_argument("--workers", type=int, default=MAX_WORKERS, help="areas scraped at the same time")
+    scrape.add_argument("--no-vl", action="store_true", help="skip the Vertical-Life lookups")
+    scrape.add_argument("--route-table-only", action="store_true",
+                        help="scrape only area pages and route tables, not each climb's page")
+    scrape.add_argument("--catalog", action="store_true",
+                        help="list areas in the route catalog from the database instead of scraping them")
+    archive = scrape.add_mutually_exclusive_group()
+    archive.add_argument("--record", nargs="?", const=str(http_archive.ARCHIVE_PATH), metavar="ARCHIVE",
+                         help="save every HTTP response and browser page into an archive (default http_archive.sqlite)")
+    archive.add_argument("--replay", nargs="?", const=str(http_archive.ARCHIVE_PATH), metavar="ARCHIVE",
+                         help="answer every request from a recorded archive, without the network")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    output.add_argument("--output", "-o", help="output file (default stdout; required for parquet)")
+    output.add_argument("--sort", choices=SORT_KEYS,
+                        help="write each query's climbs ordered by this column once the query finishes "
+                             "(grade: routes, then boulders)")
+    output.add_argument("--descending", action="store_true", help="with --sort, largest first")
+    output.add_argument("--min-stars", type=float, help="only write climbs with at least this many MP stars")
+    output.add_argument("--quiet", "-q", action="store_true", help="only log warnings")
+    output.add_argument("--metrics", default=METRICS_FILE,
+                        help="write stage timings and counters to this JSON file (default $CLIMBING_METRICS_FILE)")
+    args = parser.parse_args()
+
+    # Logs go to stderr so stdout carries only results
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s: %(message)s",
+        stream=sys.stderr
+    )
+    defaults = {
+        "type": args.type, "rope_min": args.rope_min, "rope_max": args.rope_max,
+        "boulder_min": args.boulder_min, "boulder_max": args.boulder_max, "radius": args.radius,
+    }
+    if args.queries:
+        queries = read_queries(args.queries, defaults)
+    elif args.lat is not None and args.lon is not None:
+        queries = iter([{**defaults, "lat": args.lat, "lon": args.lon}])
+    else:
+        parser.error("give --lat and --lon, or --queries")
+
+    if args.record:
+        http_archive.configure(http_archive.RECORD, args.record)
+    elif args.replay:
+        http_archive.configure(http_archive.REPLAY, args.replay)
+
+    if args.format == "parquet":
+        if not args.output:
+            parser.error("--format parquet needs --output")
+        writer = ParquetWriter(args.output)
+    else:
+        writer = JsonLinesWriter(open(args.output, "w", encoding="utf-8") if args.output else sys.stdout)
+
+    db = Database()
+    db.connect_to_database()
+    stats = Stats()
+    report = METRICS.start_report("Run")
+    status = 0
+    try:
+        for query_id, query in enumerate(queries):
+            run_query(db, query, query_id, writer, args, stats)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        status = 130
+    finally:
+        writer.close()
+        db.close()
+        print(stats.summary(), file=sys.stderr)
+        print(report.finish(), file=sys.stderr)
+        write_metrics_file(args.metrics)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@ import mysql.connector
 from mysql.connector import errorcode
 import argparse
 
+from Model.database import AREA_ROUTES_TABLE, AREA_STATS_TABLE
+
 # Global database configuration, edit these!
 # Also view if __name__ == '__main__': to decide whether you want to insert demo data beforehand
 DB_HOST = 'localhost'
@@ -32,15 +34,15 @@ def get_connection(database: str = None):
         raise
 
 
-def create_schema(conn):
+def create_schema(conn, db_name: str = DB_NAME, verbose: bool = True):
     """
-    Create the 'climbing' database and all required tables.
+    Create the 'climbing' database (or db_name) and all required tables.
     Drops the database if it already exists.
     """
     statements = [
-        "DROP DATABASE IF EXISTS {0};".format(DB_NAME),
-        "CREATE DATABASE {0};".format(DB_NAME),
-        "USE {0};".format(DB_NAME),
+        "DROP DATABASE IF EXISTS {0};".format(db_name),
+        "CREATE DATABASE {0};".format(db_name),
+        "USE {0};".format(db_name),
         # climb_area table
         (
             "CREATE TABLE climb_area ("
@@ -53,6 +55,8 @@ def create_schema(conn):
             " PRIMARY KEY (AID)"
             ");"
         ),
+        AREA_STATS_TABLE,
+        AREA_ROUTES_TABLE,
         # area_descriptions table
         (
             "CREATE TABLE area_descriptions ("
@@ -123,14 +127,16 @@ def create_schema(conn):
     for stmt in statements:
         try:
             cursor.execute(stmt)
-            print(f"Executed: {stmt.split()[0]}")
+            if verbose:
+                print(f"Executed: {stmt.split()[0]}")
         except mysql.connector.Error as err:
             print(f"Failed to execute: {stmt[:30]}... Error: {err}")
             cursor.close()
             raise
     conn.commit()
     cursor.close()
-    print("Schema created successfully.")
+    if verbose:
+        print("Schema created successfully.")
 
 
 def seed_data(conn):
@@ -0,0 +1,208 @@
+import argparse
+import logging
+import signal
+import sys
+import threading
+import time
+
+from cli import CLIMBING_TYPES, JsonLinesWriter, climb_rows, query_filter
+from Controller.Caculations.climb_filter import BOULDER_LIMITS, ROPE_LIMITS
+from Controller.instrumentation import write_metrics_file
+from Controller.Scrapers import http_archive
+from Controller.queue_worker import (
+    AREA_TASK, CRAWL_TASK, RESULT_POLL_SECONDS, QueueWorker, collect_crawl, collect_search, enqueue_crawl, enqueue_search
+)
+from Model.work_queue import LEASED, LEASE_SECONDS, PENDING, open_queue
+
+logger = logging.getLogger(__name__)
+
+
+def _unfinished(queue, kind: str) -> int:
+    counts = queue.counts()
+    return counts.get((kind, PENDING), 0) + counts.get((kind, LEASED), 0)
+
+
+# ——— Roles ———
+def run_worker(args) -> int:
+    """Lease and run tasks until interrupted (or until the queue is drained with --drain)."""
+    queue = open_queue(args.broker)
+    worker = QueueWorker(queue, kinds=args.kinds, lease_seconds=args.lease)
+    # SIGTERM from a process manager gives the current task back like Ctrl+C does
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run(drain=args.drain)
+    except KeyboardInterrupt:
+        worker.stop()
+    finally:
+        queue.close()
+        print(f"{worker.done} tasks done, {worker.failed} failed", file=sys.stderr)
+        write_metrics_file()
+    return 0
+
+
+def run_search(args) -> int:
+    """Producer and collector of one search: queue its areas, then write climbs as workers finish them."""
+    from Model.database import Database
+
+    query = {
+        "type": args.type, "rope_min": args.rope_min, "rope_max": args.rope_max,
+        "boulder_min": args.boulder_min, "boulder_max": args.boulder_max,
+    }
+    climb_filter = query_filter(query)
+    db = Database()
+    db.connect_to_database()
+    try:
+        areas = db.search_db_for_areas(args.lat, args.lon, args.radius, climb_filter)
+    finally:
+        db.close()
+
+    queue = open_queue(args.broker)
+    writer = JsonLinesWriter(open(args.output, "w", encoding="utf-8") if args.output else sys.stdout)
+    try:
+        added = enqueue_search(queue, areas, (args.lat, args.lon), lazy=args.route_table_only,
+                               vertical_life=not args.no_vl)
+        logger.info("%d areas found, %d newly queued", len(areas), added)
+        if args.no_wait:
+            return 0
+        received = failed = 0
+        for area in collect_search(queue, areas, climb_filter, lazy=args.route_table_only,
+                                   vertical_life=not args.no_vl, timeout=args.timeout):
+            received += 1
+            if area is None:
+                failed += 1
+                continue
+            rows = list(climb_rows(area, 0))
+            if rows:
+                writer.write(rows)
+        print(f"{received}/{len(areas)} areas collected, {failed} failed", file=sys.stderr)
+    except KeyboardInterrupt:
+        # Queued tasks stay in the broker; running the search again collects them
+        return 130
+    finally:
+        writer.close()
+        queue.close()
+    return 0
+
+
+def run_crawl(args) -> int:
+    """
+    Producer of a state crawl: list each state's areas with the browser and queue
+    them for workers. With --collect, finished areas are inserted into the database
+    (numbered from --start-aid) after each state and until the queue is drained.
+    """
+    from Controller.Scrapers.database_initialization import DatabaseInitializationScraper, STATES
+
+    queue = open_queue(args.broker)
+    scraper = DatabaseInitializationScraper(catalog=args.catalog)
+    next_aid = args.start_aid if args.start_aid is not None else scraper.db.next_free_aid()
+    try:
+        for state in args.states or STATES:
+            added = enqueue_crawl(queue, state, scraper.state_area_links(state))
+            logger.info("%s: %d areas queued", state, added)
+            if args.collect:
+                next_aid = collect_crawl(queue, scraper.db, next_aid, args.catalog)
+        if args.collect:
+            logger.info("Collecting until the workers are done (Ctrl+C to stop; run again to resume)")
+            while _unfinished(queue, CRAWL_TASK):
+                next_aid = collect_crawl(queue, scraper.db, next_aid, args.catalog)
+                time.sleep(RESULT_POLL_SECONDS)
+            next_aid = collect_crawl(queue, scraper.db, next_aid, args.catalog)
+            print(f"Next free AID: {next_aid}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print(f"Interrupted; next free AID: {next_aid}", file=sys.stderr)
+        return 130
+    finally:
+        scraper.close()
+        queue.close()
+    return 0
+
+
+def run_status(args) -> int:
+    """Print task counts per kind and status."""
+    queue = open_queue(args.broker)
+    try:
+        counts = queue.counts()
+        if args.retry_dead:
+            print(f"{queue.retry_dead()} dead tasks queued again", file=sys.stderr)
+            counts = queue.counts()
+    finally:
+        queue.close()
+    for (kind, status), count in sorted(counts.items()):
+        print(f"{kind:10} {status:8} {count}")
+    return 0
+
+
+def _add_archive_args(parser: argparse.ArgumentParser) -> None:
+    """--record/--replay for the roles that fetch pages themselves."""
+    archive = parser.add_argument_group("archive")
+    modes = archive.add_mutually_exclusive_group()
+    modes.add_argument("--record", action="store_true", help="save every HTTP response and browser page into the archive")
+    modes.add_argument("--replay", action="store_true", help="answer every request from the archive, without the network")
+    archive.add_argument("--archive", metavar="PATH", default=str(http_archive.ARCHIVE_PATH),
+                         help="archive file (default http_archive.sqlite)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run searches and state crawls through a shared work queue: producers queue areas, "
+                    "any number of worker processes on this host scrape them."
+    )
+    parser.add_argument("--broker", help="broker location: a SQLite file path or sqlite:///path "
+                                         "(default work_queue.sqlite, or $CLIMBING_WORK_QUEUE)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="only log warnings")
+    roles = parser.add_subparsers(dest="role", required=True)
+
+    worker = roles.add_parser("worker", help="lease and run tasks")
+    worker.add_argument("--kinds", nargs="+", choices=(AREA_TASK, CRAWL_TASK), help="task kinds to take (default all)")
+    worker.add_argument("--lease", type=float, default=LEASE_SECONDS, help="lease length in seconds")
+    worker.add_argument("--drain", action="store_true", help="exit once nothing is ready")
+    _add_archive_args(worker)
+    worker.set_defaults(run=run_worker)
+
+    search = roles.add_parser("search", help="queue a search's areas and write its climbs as JSON lines")
+    search.add_argument("--lat", type=float, required=True)
+    search.add_argument("--lon", type=float, required=True)
+    search.add_argument("--radius", type=float, default=60, help="miles around the point (default 60)")
+    search.add_argument("--type", choices=CLIMBING_TYPES, default="All")
+    search.add_argument("--rope-min", default=ROPE_LIMITS[0])
+    search.add_argument("--rope-max", default=ROPE_LIMITS[1])
+    search.add_argument("--boulder-min", default=BOULDER_LIMITS[0])
+    search.add_argument("--boulder-max", default=BOULDER_LIMITS[1])
+    search.add_argument("--no-vl", action="store_true", help="skip the Vertical-Life lookups")
+    search.add_argument("--route-table-only", action="store_true",
+                        help="scrape only area pages and route tables, not each climb's page")
+    search.add_argument("--no-wait", action="store_true", help="only queue the areas")
+    search.add_argument("--timeout", type=float, help="give up after this many seconds without a result")
+    search.add_argument("--output", "-o", help="output file (default stdout)")
+    search.set_defaults(run=run_search)
+
+    crawl = roles.add_parser("crawl", help="queue the areas of a state crawl (database initialization)")
+    crawl.add_argument("states", nargs="*", help="states to crawl, e.g. california new+york (default all)")
+    crawl.add_argument("--collect", action="store_true", help="insert finished areas into the database")
+    crawl.add_argument("--catalog", action="store_true", help="also store every route row")
+    crawl.add_argument("--start-aid", type=int,
+                       help="AID of the first inserted area (default one past the highest AID in the database)")
+    _add_archive_args(crawl)
+    crawl.set_defaults(run=run_crawl)
+
+    status = roles.add_parser("status", help="show task counts")
+    status.add_argument("--retry-dead", action="store_true", help="queue dead tasks again first")
+    status.set_defaults(run=run_status)
+
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s: %(message)s",
+        stream=sys.stderr
+    )
+    # Only workers (and the crawl's state listing) fetch pages; search and status never do
+    if getattr(args, "record", False):
+        http_archive.configure(http_archive.RECORD, args.archive)
+    elif getattr(args, "replay", False):
+        http_archive.configure(http_archive.REPLAY, args.archive)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())